@@ -1,19 +1,47 @@
 # backend/api.py
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 import datetime
-from pydantic import BaseModel
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from email.utils import format_datetime
+from pydantic import BaseModel, Field
 import uvicorn
-from storage.sqlite_storage import SQLiteCardStorage
+from storage.sqlite_storage import SQLiteCardStorage, DEFAULT_DECK_ID
+from interfaces.storage_interface import CardConflictError, CardNotFoundError
+from storage.shard_router import SQLiteShardRouter, DEFAULT_USER_ID
+from storage.idempotency_storage import SQLiteIdempotencyStore, CLAIMED, COMPLETED, MISMATCH
 from services.card_service import CardService
 from services.review_service import ReviewService
 from services.schedule_service import ScheduleService
 from services.llm_service import LLMService
-from hook.discord_notifier import start_scheduler, set_webhook_url, discord_webhook_url
+from services.llm_dispatcher import LLMOverloadedError
+from services.feedback_cache import SemanticFeedbackCache
+from services.concept_graph_service import ConceptGraphService
+from services.history_compactor import HistoryCompactor
+from storage.concept_graph_storage import SQLiteConceptGraph
+from storage.lease_storage import SQLiteLease
+from services.session_service import ReviewSessionService, masked_hint
+from hook.cluster import LeaderElector
+from hook.discord_notifier import (
+    start_background_jobs, stop_background_jobs, is_leader,
+    set_webhook_url, get_webhook_url, notify_card_changed, get_delivery_stats
+)
 
 from models.card import MemorizationCard
 from config.settings import SystemConfig
+from utils.validators import CardValidator
+from utils.metrics import registry, record_cache, HTTP_LATENCY, COALESCED_CALLS
+from utils.singleflight import SingleFlight
+from utils import tracing
+from utils.profiler import profiler
 
 app = FastAPI()
 
@@ -22,19 +50,132 @@ app.add_middleware(
     allow_origins=["http://localhost:3000"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag", "Last-Modified", "X-Next-Cursor", "X-Next-Offset", "X-Trace-Id", "Server-Timing",
+        "Idempotent-Replayed",
+    ],
 )
 
 config = SystemConfig.default()
-storage = SQLiteCardStorage(db_path="cards.db")
+tracing.configure(config.tracing.max_traces)
+
+@app.middleware("http")
+async def trace_and_profile(request: Request, call_next):
+    # 샘플링 또는 헤더로 요청 트레이싱 (꺼져 있으면 span은 no-op)
+    forced = request.headers.get(config.tracing.trace_header) == "1"
+    trace = None
+    if tracing.should_sample(config.tracing.sample_rate, forced):
+        trace = tracing.start_trace(f"{request.method} {request.url.path}")
+    profiled = profiler.request_started()
+    try:
+        response = await call_next(request)
+    finally:
+        if profiled:
+            # 샘플러 스레드 join을 이벤트 루프 밖에서 처리
+            await run_in_threadpool(profiler.request_finished)
+        if trace is not None:
+            tracing.finish_trace(trace)
+    if trace is not None:
+        response.headers["X-Trace-Id"] = trace.trace_id
+        response.headers["Server-Timing"] = trace.server_timing()
+    return response
+
+@app.middleware("http")
+async def record_http_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # 라우트 템플릿(/cards/{card_id}) 기준으로 라벨링해 카디널리티 제한
+    route = request.scope.get("route")
+    HTTP_LATENCY.observe(
+        time.perf_counter() - start,
+        request.method,
+        route.path if route is not None else "unmatched",
+        str(response.status_code),
+    )
+    return response
+
+shard_router = SQLiteShardRouter(config.storage)
+storage = shard_router.get_storage(DEFAULT_USER_ID, DEFAULT_DECK_ID)
 card_service = CardService(storage)
-schedule_service = ScheduleService()
-llm_service = LLMService()
-review_service = ReviewService(
-    llm_service,
-    card_service,
-    schedule_service,
-    config.review
+schedule_service = ScheduleService(config.schedule)
+llm_service = LLMService(config.llm)
+session_service = ReviewSessionService(card_service, llm_service, config.session)
+scope_validator = CardValidator()
+# 워커 전체에서 공유하는 오답 피드백 캐시 (요청마다 만드는 ReviewService에 주입)
+feedback_cache = SemanticFeedbackCache(
+    config.feedback_cache.max_distance,
+    config.feedback_cache.max_entries_per_card,
+    config.feedback_cache.max_cards,
+) if config.feedback_cache.enabled else None
+idempotency_store = SQLiteIdempotencyStore(
+    config.idempotency.db_path,
+    config.idempotency.ttl.total_seconds(),
+    config.idempotency.stale_after_sec,
+)
+# 연관 개념 / 심화 문제는 사용자 공통 개념 그래프에 저장해 재사용
+concept_graph = ConceptGraphService(
+    SQLiteConceptGraph(config.concept_graph.db_path), llm_service, config.concept_graph
 )
+# 같은 워커로 동시에 들어온 같은 키 요청은 DB 폴링 없이 바로 합친다
+review_flights = SingleFlight()
+# 오래된 복습 이력 압축 - 알림 스케줄러와 별도 임대로 리더 한 곳에서만 실행
+history_compactor = HistoryCompactor(shard_router, config.retention)
+compactor_elector = LeaderElector(
+    SQLiteLease(db_path=config.cluster.db_path),
+    "history_compactor",
+    config.cluster.lease_ttl_sec,
+    on_elected=history_compactor.start,
+    on_demoted=history_compactor.stop,
+)
+
+@dataclass
+class DeckScope:
+    """요청의 (사용자, 덱) 범위 서비스"""
+    user_id: str
+    deck_id: str
+    storage: SQLiteCardStorage
+    card_service: CardService
+    review_service: ReviewService
+
+    @property
+    def is_default(self) -> bool:
+        # 디스코드 알림은 기본 사용자/덱만 대상
+        return self.user_id == DEFAULT_USER_ID and self.deck_id == DEFAULT_DECK_ID
+
+def current_user_id(x_user_id: str = Header(DEFAULT_USER_ID)) -> str:
+    """
+    요청 사용자 식별 - 사용자 범위 엔드포인트는 모두 이 의존성 하나만 거친다
+    - X-User-Id는 인증 프록시가 덮어쓰는 배포(storage.trust_user_header)에서만 믿고, 아니면 기본 사용자
+    - 인증을 붙일 때는 app.dependency_overrides[current_user_id]를 토큰/세션 기반 함수로 교체
+    """
+    if not config.storage.trust_user_header:
+        return DEFAULT_USER_ID
+    try:
+        scope_validator.validate_scope_id(x_user_id, "사용자 ID")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return x_user_id
+
+def deck_scope(
+    user_id: str = Depends(current_user_id),
+    x_deck_id: str = Header(DEFAULT_DECK_ID),
+) -> DeckScope:
+    """요청 사용자 + X-Deck-Id 헤더로 샤드 저장소 선택 (없으면 기본 덱)"""
+    try:
+        scope_validator.validate_scope_id(x_deck_id, "덱 ID")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    deck_storage = shard_router.get_storage(user_id, x_deck_id)
+    deck_card_service = CardService(deck_storage)
+    return DeckScope(
+        user_id=user_id,
+        deck_id=x_deck_id,
+        storage=deck_storage,
+        card_service=deck_card_service,
+        review_service=ReviewService(
+            llm_service, deck_card_service, schedule_service, config.review, feedback_cache, concept_graph
+        ),
+    )
 
 class CardIn(BaseModel):
     concept: str
@@ -49,6 +190,7 @@ class CardOut(BaseModel):
     stage: int
     next_review: datetime.datetime = None
     success_rate: float
+    version: int | None = None
 
 class DueCardOut(BaseModel):
     card_id: str
@@ -69,34 +211,141 @@ class ReviewResponse(BaseModel):
     related_concepts: list[str] | None = None
     advanced_questions: list[str] | None = None
 
+class SessionIn(BaseModel):
+    limit: int | None = None
+    offset: int = Field(0, ge=0)    # 복습 대상 목록에서 건너뛸 카드 수 (다음 페이지 세션)
+    test: bool = False
+
+class SessionCardOut(DueCardOut):
+    hint_pending: bool = False
+
+class SessionOut(BaseModel):
+    session_id: str
+    total: int      # 전체 복습 대상 카드 수 (offset + len(cards) < total이면 다음 페이지가 있음)
+    cards: list[SessionCardOut]
+
 class ReviewIn(BaseModel):
     user_answer: str
 
 class WebhookIn(BaseModel):
     url: str
 
+class ConceptIn(BaseModel):
+    concept: str
+
+@app.exception_handler(LLMOverloadedError)
+def llm_overloaded(request: Request, exc: LLMOverloadedError):
+    # LLM 대기열 입장 거절 → 잠시 후 재시도하도록 503
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after_sec))},
+    )
+
+@app.exception_handler(CardConflictError)
+def card_conflict(request: Request, exc: CardConflictError):
+    # 읽은 뒤 다른 요청이 카드를 먼저 바꿈 → 다시 읽고 재시도하도록 409
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+@app.exception_handler(CardNotFoundError)
+def card_not_found(request: Request, exc: CardNotFoundError):
+    # 읽은 뒤 저장 전에 카드가 삭제됨 → 조회 단계의 없음과 같은 404
+    return JSONResponse(status_code=404, content={"detail": "Card not found"})
+
 @app.on_event("startup")
 def on_startup():
-    start_scheduler()
+    # 워커마다 호출되지만 스케줄러/웹훅 전송은 선출된 리더에서만 실행
+    start_background_jobs(storage)
+    if config.retention.enabled:
+        compactor_elector.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_background_jobs()
+    compactor_elector.stop()
+    llm_service.close()
+    shard_router.close()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+def _require_debug_token(token: str | None) -> None:
+    """디버그 엔드포인트 보호 - 토큰 미설정 시 엔드포인트 자체를 숨긴다"""
+    expected = config.tracing.debug_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+class ProfileIn(BaseModel):
+    requests: int = 20
+    interval_ms: float = 5.0
+
+@app.get("/debug/traces")
+def get_traces(limit: int = Query(50, ge=1, le=500), x_debug_token: str | None = Header(None)):
+    _require_debug_token(x_debug_token)
+    return tracing.recorder.recent(limit)
+
+@app.get("/debug/traces/{trace_id}")
+def get_trace(trace_id: str, x_debug_token: str | None = Header(None)):
+    _require_debug_token(x_debug_token)
+    trace = tracing.recorder.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
+@app.post("/debug/profile")
+def start_profile(profile_in: ProfileIn, x_debug_token: str | None = Header(None)):
+    _require_debug_token(x_debug_token)
+    if profile_in.requests < 1:
+        raise HTTPException(status_code=400, detail="requests must be >= 1")
+    if not profiler.arm(profile_in.requests, profile_in.interval_ms):
+        raise HTTPException(status_code=409, detail="Profile already running")
+    return profiler.status()
+
+@app.get("/debug/profile")
+def get_profile(x_debug_token: str | None = Header(None)):
+    """완료 시 folded stack 텍스트 (flamegraph.pl / speedscope 입력) 반환"""
+    _require_debug_token(x_debug_token)
+    result = profiler.result()
+    if result is None:
+        return Response(
+            content=str(profiler.status()), status_code=202, media_type="text/plain"
+        )
+    return PlainTextResponse(result)
 
 @app.get("/settings/webhook")
 def get_webhook():
-    return {"url": discord_webhook_url}
+    return {"url": get_webhook_url()}
 
 @app.post("/settings/webhook")
 def update_webhook(input: WebhookIn):
     set_webhook_url(input.url)
     return {"detail": "Webhook URL이 업데이트 되었습니다."}
 
+@app.get("/settings/webhook/stats")
+def get_webhook_stats():
+    return {**get_delivery_stats(), "leader": is_leader()}
+
+@app.get("/decks")
+def list_decks(user_id: str = Depends(current_user_id)):
+    """사용자의 덱 목록 (샤드가 없는 사용자는 빈 목록)"""
+    return {"user_id": user_id, "decks": shard_router.list_decks(user_id)}
+
 @app.post("/cards", response_model=CardOut)
-def create_card(card: CardIn):
+def create_card(card: CardIn, deck: DeckScope = Depends(deck_scope)):
     if not card.answer and card.card_type == "concept":
         generated_def = llm_service.generate_concept_definition(card.concept)
         card.answer = generated_def
-    new_card: MemorizationCard = card_service.create_card(card.concept, card.answer, card.card_type)
-    next_time = schedule_service.get_next_review_time(new_card.stage, new_card.card_type)
+    new_card: MemorizationCard = deck.card_service.create_card(card.concept, card.answer, card.card_type)
+    next_time = schedule_service.get_next_review_time(
+        new_card.stage, new_card.card_type, new_card.card_id, deck.card_service.count_due_by_bucket
+    )
     new_card.update_next_review(next_time)
-    storage.update_card(new_card)
+    deck.storage.update_card(new_card)
+    if deck.is_default:
+        notify_card_changed(new_card.next_review)
     return CardOut(
         card_id=new_card.card_id,
         concept=new_card.concept,
@@ -104,12 +353,80 @@ def create_card(card: CardIn):
         card_type=new_card.card_type,
         stage=new_card.stage,
         next_review=new_card.next_review,
-        success_rate=new_card.get_success_rate()
+        success_rate=new_card.get_success_rate(),
+        version=new_card.version
     )
 
+def _deck_etag(deck: DeckScope, time_sensitive: bool) -> str:
+    """덱 변경 카운터 기반 ETag (due 필터는 시간에 따라 바뀌므로 분 단위 버킷 포함)"""
+    tag = f"deck-{deck.user_id}-{deck.deck_id}-{deck.card_service.get_change_counter()}"
+    if time_sensitive:
+        tag += datetime.datetime.now().strftime("-%Y%m%d%H%M")
+    return f'W/"{tag}"'
+
 @app.get("/cards", response_model=list[CardOut])
-def get_cards():
-    cards = card_service.get_all_cards()
+def get_cards(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor: str | None = Query(None, description="이전 페이지 마지막 card_id"),
+    card_type: str | None = Query(None),
+    stage: int | None = Query(None, ge=1),
+    due: bool | None = Query(None),
+    prefix: str | None = Query(None, description="개념 접두어 검색"),
+    deck: DeckScope = Depends(deck_scope),
+):
+    etag = _deck_etag(deck, time_sensitive=due is not None)
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    last_modified = deck.storage.get_last_modified().astimezone(datetime.timezone.utc)
+    cache_headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    # 변경이 없으면 DB 조회 없이 304
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        record_cache("cards_etag", True)
+        return Response(status_code=304, headers=cache_headers)
+    record_cache("cards_etag", False)
+
+    try:
+        cards = deck.card_service.query_cards(card_type, stage, due, prefix, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers.update(cache_headers)
+    if limit is not None and len(cards) == limit:
+        response.headers["X-Next-Cursor"] = cards[-1].card_id
+    return [
+        CardOut(
+            card_id=c.card_id,
+            concept=c.concept,
+            answer=c.answer,
+            card_type=c.card_type,
+            stage=c.stage,
+            next_review=c.next_review,
+            success_rate=c.get_success_rate(),
+            version=c.version
+        )
+        for c in cards
+    ]
+
+@app.get("/cards/search", response_model=list[CardOut])
+def search_cards(
+    response: Response,
+    q: str = Query(..., description="검색어 (공백으로 나누면 모두 포함)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    deck: DeckScope = Depends(deck_scope),
+):
+    """개념/정답 전문 검색 (FTS5 색인) - 다음 페이지가 있으면 X-Next-Offset 헤더"""
+    try:
+        # 한 건 더 읽어 다음 페이지 여부 판단
+        cards = deck.card_service.search_cards(q, limit + 1, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(cards) > limit:
+        cards = cards[:limit]
+        response.headers["X-Next-Offset"] = str(offset + limit)
     return [
         CardOut(
             card_id=c.card_id,
@@ -118,23 +435,38 @@ def get_cards():
             card_type=c.card_type,
             stage=c.stage,
             next_review=c.next_review,
-            success_rate=c.get_success_rate()
+            success_rate=c.get_success_rate(),
+            version=c.version
         )
         for c in cards
     ]
 
+@app.get("/stats")
+def get_stats(days: int = Query(30, ge=1, le=365), deck: DeckScope = Depends(deck_scope)):
+    """덱 통계 (롤업 테이블 + 인덱스 집계)"""
+    return deck.card_service.get_stats(days)
+
+@app.get("/cards/forecast")
+def get_due_forecast(
+    days: int = Query(7, ge=1, le=90),
+    bucket: str = Query("day", description="hour 또는 day"),
+    deck: DeckScope = Depends(deck_scope),
+):
+    """앞으로 days일 동안의 복습 예정 카드 수 (SQL 집계 한 번)"""
+    try:
+        return deck.card_service.get_due_forecast(days, bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/cards/due", response_model=list[DueCardOut])
-def get_due_cards(test: bool = Query(False)):
+def get_due_cards(test: bool = Query(False), deck: DeckScope = Depends(deck_scope)):
     if test:
-        cards = card_service.get_all_cards()
+        cards = deck.card_service.get_all_cards()
     else:
-        cards = card_service.get_due_cards()
+        cards = deck.card_service.get_due_cards()
     result: list[DueCardOut] = []
     for c in cards:
-        hint = ""
-        if c.card_type == "word" and c.stage == 2:
-            answer = c.answer or ""
-            hint = answer[0] + "*" * (len(answer) - 1) if answer else ""
+        hint = masked_hint(c)
         result.append(
             DueCardOut(
                 card_id=c.card_id,
@@ -148,16 +480,82 @@ def get_due_cards(test: bool = Query(False)):
     return result
 
 @app.get("/cards/{card_id}/hint")
-def get_card_hint(card_id: str):
-    c = card_service.get_card(card_id)
+def get_card_hint(card_id: str, deck: DeckScope = Depends(deck_scope)):
+    c = deck.card_service.get_card(card_id)
     if not c:
         raise HTTPException(status_code=404, detail="Card not found")
     hint = llm_service.generate_hint(c.concept, c.answer, c.stage, c.card_type)
     return {"hint": hint}
 
+@app.post("/sessions", response_model=SessionOut)
+def create_session(session_in: SessionIn, deck: DeckScope = Depends(deck_scope)):
+    session = session_service.create_session(
+        session_in.limit,
+        include_all=session_in.test,
+        card_service=deck.card_service,
+        owner=deck.user_id,
+        offset=session_in.offset,
+    )
+    return SessionOut(
+        session_id=session["session_id"],
+        total=session["total"],
+        cards=[SessionCardOut(**c) for c in session["cards"]]
+    )
+
+@app.get("/sessions/{session_id}/hints/{card_id}")
+def get_session_hint(
+    session_id: str, card_id: str, wait: bool = Query(True), deck: DeckScope = Depends(deck_scope)
+):
+    hint = session_service.get_hint(session_id, card_id, wait, owner=deck.user_id)
+    if hint is None:
+        raise HTTPException(status_code=404, detail="Session or card not found")
+    return hint
+
+@app.delete("/sessions/{session_id}")
+def close_session(session_id: str, deck: DeckScope = Depends(deck_scope)):
+    if not session_service.close_session(session_id, owner=deck.user_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"detail": "Session closed"}
+
+@app.get("/cards/{card_id}/questions")
+def get_card_questions(card_id: str, deck: DeckScope = Depends(deck_scope)):
+    """4단계를 마친 카드의 저장된 심화 문제 (LLM 호출 없음)"""
+    stored = concept_graph.card_questions(deck.user_id, deck.deck_id, card_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="No stored questions for this card")
+    return stored
+
+@app.get("/concepts/graph")
+def get_concept_graph(
+    concept: str = Query(..., description="시작 개념"),
+    hops: int = Query(1, ge=1),
+    limit: int | None = Query(None, ge=1),
+):
+    """개념 그래프 k-hop 이웃 (프론트 개념 지도용, LLM 호출 없음)"""
+    try:
+        return concept_graph.neighbors(concept, hops, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/concepts/related")
+def get_related_concepts(concept: str = Query(...)):
+    """연관 개념 - 저장된 결과가 없거나 오래됐을 때만 생성"""
+    return {"concept": concept, "related_concepts": concept_graph.related_concepts(concept)}
+
+@app.post("/concepts/refresh")
+def refresh_concept(concept_in: ConceptIn):
+    """연관 개념 / 심화 문제 즉시 재생성"""
+    if not concept_in.concept.strip():
+        raise HTTPException(status_code=400, detail="concept must not be empty")
+    return {
+        "concept": concept_in.concept,
+        "related_concepts": concept_graph.related_concepts(concept_in.concept, refresh=True),
+        "advanced_questions": concept_graph.advanced_questions(concept_in.concept, refresh=True),
+    }
+
 @app.get("/cards/{card_id}", response_model=CardOut)
-def get_card(card_id: str):
-    c = card_service.get_card(card_id)
+def get_card(card_id: str, deck: DeckScope = Depends(deck_scope)):
+    c = deck.card_service.get_card(card_id)
     if not c:
         raise HTTPException(status_code=404, detail="Card not found")
     return CardOut(
@@ -167,20 +565,71 @@ def get_card(card_id: str):
         card_type=c.card_type,
         stage=c.stage,
         next_review=c.next_review,
-        success_rate=c.get_success_rate()
+        success_rate=c.get_success_rate(),
+        version=c.version
     )
 
+@app.get("/cards/{card_id}/history")
+def get_card_history(
+    card_id: str,
+    archived: bool = Query(False),
+    deck: DeckScope = Depends(deck_scope),
+):
+    """
+    복습 이력 NDJSON 스트림 (오래된 순, 한 줄에 기록 하나)
+    - 기본은 카드에 남아 있는 최근 기록만, archived=true면 보관된 기록부터 전체
+    """
+    records = deck.storage.iter_review_history(card_id, include_archived=archived)
+    if records is None:
+        raise HTTPException(status_code=404, detail="Card not found")
+
+    def lines():
+        for rec in records:
+            yield json.dumps({
+                "stage": rec.stage,
+                "user_answer": rec.user_answer,
+                "is_correct": bool(rec.is_correct),
+                "feedback": rec.feedback,
+                "timestamp": rec.timestamp.isoformat(),
+            }, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _parse_if_match(if_match: str) -> int:
+    """If-Match 헤더의 카드 버전 ("3", "W/\"3\"" 모두 허용)"""
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a card version")
+
 @app.put("/cards/{card_id}", response_model=CardOut)
-def update_card(card_id: str, card: CardIn):
-    existing = card_service.get_card(card_id)
+def update_card(
+    card_id: str,
+    card: CardIn,
+    deck: DeckScope = Depends(deck_scope),
+    if_match: str | None = Header(None),
+):
+    existing = deck.card_service.get_card(card_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Card not found")
+    if if_match is not None:
+        # 클라이언트가 읽었던 버전으로 비교 - 그 사이 복습/수정이 있었으면 저장 시 409
+        existing.version = _parse_if_match(if_match)
     existing.concept = card.concept
     existing.answer = card.answer
     existing.card_type = card.card_type
-    next_time = schedule_service.get_next_review_time(existing.stage, existing.card_type)
+    next_time = schedule_service.get_next_review_time(
+        existing.stage, existing.card_type, existing.card_id, deck.card_service.count_due_by_bucket
+    )
     existing.update_next_review(next_time)
-    storage.update_card(existing)
+    deck.storage.update_card(existing)
+    if feedback_cache is not None:
+        feedback_cache.invalidate(card_id)
+    if deck.is_default:
+        notify_card_changed(existing.next_review)
     return CardOut(
         card_id=existing.card_id,
         concept=existing.concept,
@@ -188,27 +637,29 @@ def update_card(card_id: str, card: CardIn):
         card_type=existing.card_type,
         stage=existing.stage,
         next_review=existing.next_review,
-        success_rate=existing.get_success_rate()
+        success_rate=existing.get_success_rate(),
+        version=existing.version
     )
 
 @app.delete("/cards/{card_id}")
-def delete_card(card_id: str):
-    success = storage.delete_card(card_id)
+def delete_card(card_id: str, deck: DeckScope = Depends(deck_scope)):
+    success = deck.storage.delete_card(card_id)
+    if success and feedback_cache is not None:
+        feedback_cache.invalidate(card_id)
     if not success:
         raise HTTPException(status_code=404, detail="Card not found")
     return {"detail": "Card deleted"}
 
-@app.post("/cards/{card_id}/review", response_model=ReviewResponse)
-def review_card(
-    card_id: str,
-    review: ReviewIn,
-    test: bool = Query(False),
-    retry: bool = Query(False)
-):
-    card = card_service.get_card(card_id)
+def _run_review(deck: DeckScope, card_id: str, user_answer: str, retry: bool) -> ReviewResponse:
+    card = deck.card_service.get_card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
-    result = review_service.process_review(card_id, review.user_answer, retry)
+    result = deck.review_service.process_review(card_id, user_answer, retry)
+    if deck.is_default:
+        notify_card_changed(result.get("next_review"))
+    if result.get("completed"):
+        # 카드의 심화 문제를 나중에 LLM 없이 다시 볼 수 있게 개념 그래프에 연결
+        concept_graph.link_card(deck.user_id, deck.deck_id, card_id, card.concept)
     return ReviewResponse(
         is_correct=result["is_correct"],
         feedback=result["feedback"],
@@ -221,5 +672,66 @@ def review_card(
         advanced_questions=result.get("advanced_questions")
     )
 
+def _idempotent_review(
+    deck: DeckScope, card_id: str, user_answer: str, retry: bool, scope: str, key: str, fingerprint: str
+) -> tuple[ReviewResponse, bool]:
+    """(응답, 재사용 여부) - 이미 처리된 키면 저장된 응답, 다른 워커가 처리 중이면 완료까지 대기"""
+    deadline = time.monotonic() + config.idempotency.wait_sec
+    while True:
+        claim = idempotency_store.claim(scope, key, fingerprint)
+        if claim.status == CLAIMED:
+            break
+        if claim.status == COMPLETED:
+            return ReviewResponse(**json.loads(claim.response)), True
+        if claim.status == MISMATCH:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        time.sleep(0.2)
+
+    try:
+        response = _run_review(deck, card_id, user_answer, retry)
+    except BaseException:
+        # 실패한 요청은 기록하지 않는다 (같은 키로 다시 시도 가능)
+        idempotency_store.release(scope, key)
+        raise
+    idempotency_store.complete(scope, key, json.dumps(jsonable_encoder(response), ensure_ascii=False))
+    return response, False
+
+@app.post("/cards/{card_id}/review", response_model=ReviewResponse)
+def review_card(
+    card_id: str,
+    review: ReviewIn,
+    response: Response,
+    test: bool = Query(False),
+    retry: bool = Query(False),
+    deck: DeckScope = Depends(deck_scope),
+    idempotency_key: str | None = Header(None),
+):
+    if idempotency_key is None:
+        return _run_review(deck, card_id, review.user_answer, retry)
+    if not 1 <= len(idempotency_key) <= 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be 1-255 characters")
+
+    # 같은 키라도 사용자/덱/카드가 다르면 별개 요청
+    scope = f"{deck.user_id}/{deck.deck_id}/{card_id}"
+    fingerprint = hashlib.sha256(
+        json.dumps([review.user_answer, retry], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    (result, replayed), shared = review_flights.do(
+        (scope, idempotency_key, fingerprint),
+        lambda: _idempotent_review(
+            deck, card_id, review.user_answer, retry, scope, idempotency_key, fingerprint
+        ),
+    )
+    if replayed or shared:
+        COALESCED_CALLS.inc("review")
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
 if __name__ == "__main__":
-    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True)
+    if config.cluster.workers > 1:
+        # 운영 모드: MEMORIZATION_WORKERS개 프로세스 (reload 미사용)
+        uvicorn.run("api:app", host="0.0.0.0", port=8000, workers=config.cluster.workers)
+    else:
+        uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True)
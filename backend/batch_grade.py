@@ -0,0 +1,198 @@
+"""
+오프라인 일괄 채점 도구 - 임베딩 유사도 임계값 보정 / 임베더 비교용
+
+입력 JSONL 한 줄 예:
+    {"card_id": "...", "user_answer": "...", "label": true}
+    {"answer": "정답", "user_answer": "...", "card_type": "concept", "label": false}
+
+사용 예:
+    python batch_grade.py answers.jsonl -o graded.jsonl --workers 4 --word-correct 0.93
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import LLMConfig
+from services.review_service import (
+    embedding_verdict, WORD_SIM_CORRECT, WORD_SIM_NEAR, CONCEPT_SIM_PASS
+)
+
+# 워커 프로세스마다 한 번만 로드
+_embedder = None
+_encode_batch_size = 64
+
+def _init_worker(embedder_name: str, encode_batch_size: int) -> None:
+    global _embedder, _encode_batch_size
+    from sentence_transformers import SentenceTransformer
+    _embedder = SentenceTransformer(embedder_name)
+    _encode_batch_size = encode_batch_size
+
+def _score_chunk(pairs: List[Tuple[str, str]]) -> List[float]:
+    """정답/사용자 답안을 각각 한 번에 인코딩해 행별 코사인 유사도 계산"""
+    answers = _embedder.encode(
+        [p[0] for p in pairs], batch_size=_encode_batch_size, normalize_embeddings=True
+    )
+    user_answers = _embedder.encode(
+        [p[1] for p in pairs], batch_size=_encode_batch_size, normalize_embeddings=True
+    )
+    return [round(float(s), 4) for s in (answers * user_answers).sum(axis=1)]
+
+class _CardResolver:
+    """card_id → (정답, 카드 유형) 조회 (같은 카드는 한 번만 읽는다)"""
+
+    def __init__(self, db_path: Optional[str], deck_id: str):
+        self._storage = None
+        if db_path and os.path.exists(db_path):
+            from storage.sqlite_storage import SQLiteCardStorage
+            self._storage = SQLiteCardStorage(db_path, deck_id=deck_id)
+        self._cache: Dict[str, Optional[tuple]] = {}
+
+    def resolve(self, card_id: str) -> Optional[tuple]:
+        if card_id not in self._cache:
+            card = self._storage.get_card(card_id) if self._storage else None
+            self._cache[card_id] = (card.answer, card.card_type) if card else None
+        return self._cache[card_id]
+
+def read_rows(lines, resolver: _CardResolver, errors) -> Iterator[Dict[str, Any]]:
+    """JSONL 스트리밍 파싱 - card_id는 정답/유형으로 풀어 쓴다 (문제 있는 줄은 errors로)"""
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+            if "answer" not in row:
+                resolved = resolver.resolve(row["card_id"])
+                if resolved is None:
+                    raise KeyError(f"card not found: {row['card_id']}")
+                row["answer"] = resolved[0]
+                row.setdefault("card_type", resolved[1])
+            row.setdefault("card_type", "word")
+            row["user_answer"] = str(row["user_answer"])
+        except (ValueError, KeyError, TypeError) as e:
+            errors.write(json.dumps({"line": line_no, "error": str(e)}, ensure_ascii=False) + "\n")
+            continue
+        row["line"] = line_no
+        yield row
+
+def _chunks(
+    rows: Iterator[Dict[str, Any]],
+    size: int,
+    slots: threading.Semaphore,
+    pending: Deque[List[Dict[str, Any]]]
+) -> Iterator[List[Tuple[str, str]]]:
+    """
+    size개씩 묶어 워커에는 (정답, 답안) 쌍만 보내고 원본 행은 pending에 순서대로 보관
+    - Pool.imap은 입력을 미리 끝까지 읽으므로 semaphore로 진행 중 청크 수를 제한 (메모리 상한)
+    """
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            slots.acquire()
+            pending.append(chunk)
+            yield [(r["answer"], r["user_answer"]) for r in chunk]
+            chunk = []
+    if chunk:
+        slots.acquire()
+        pending.append(chunk)
+        yield [(r["answer"], r["user_answer"]) for r in chunk]
+
+class LabelMetrics:
+    """라벨 대비 정밀도/재현율 (카드 유형별 + 전체)"""
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def add(self, card_type: str, predicted: bool, label: bool) -> None:
+        for key in (card_type, "all"):
+            c = self.counts.setdefault(key, {"tp": 0, "fp": 0, "fn": 0, "tn": 0})
+            c[("t" if predicted == label else "f") + ("p" if predicted else "n")] += 1
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for key, c in self.counts.items():
+            precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else 0.0
+            recall = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            result[key] = {
+                **c,
+                "precision": round(precision, 4),
+                "recall": round(recall, 4),
+                "f1": round(f1, 4),
+            }
+        return result
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    thresholds = {
+        "word_correct": args.word_correct,
+        "word_near": args.word_near,
+        "concept_pass": args.concept_pass,
+    }
+    resolver = _CardResolver(args.db, args.deck)
+    metrics = LabelMetrics()
+    total = 0
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    slots = threading.Semaphore(args.workers * 4)
+    try:
+        pending: Deque[List[Dict[str, Any]]] = deque()
+        chunks = _chunks(read_rows(source, resolver, sys.stderr), args.chunk_size, slots, pending)
+        with multiprocessing.Pool(
+            args.workers, initializer=_init_worker, initargs=(args.embedder, args.encode_batch_size)
+        ) as pool:
+            # imap은 순서를 유지하므로 결과와 pending 청크가 1:1로 대응 (입력 줄 순서대로 출력)
+            for scores in pool.imap(_score_chunk, chunks):
+                chunk = pending.popleft()
+                slots.release()
+                for row, score in zip(chunk, scores):
+                    verdict = embedding_verdict(row["card_type"], score, **thresholds)
+                    predicted = verdict in ("correct", "pass")
+                    out = {
+                        "line": row["line"],
+                        "card_id": row.get("card_id"),
+                        "card_type": row["card_type"],
+                        "score": score,
+                        "verdict": verdict,
+                        "predicted": predicted,
+                    }
+                    if "label" in row:
+                        out["label"] = bool(row["label"])
+                        metrics.add(row["card_type"], predicted, out["label"])
+                    output.write(json.dumps(out, ensure_ascii=False) + "\n")
+                    total += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    return {"graded": total, "thresholds": thresholds, "metrics": metrics.report()}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="JSONL 답안 일괄 임베딩 채점")
+    parser.add_argument("input", help="입력 JSONL 경로 (- 이면 stdin)")
+    parser.add_argument("-o", "--output", default="-", help="결과 JSONL 경로 (기본 stdout)")
+    parser.add_argument("--db", default="cards.db", help="card_id 조회용 SQLite DB (빈 값이면 조회 안 함)")
+    parser.add_argument("--deck", default="default", help="card_id 조회 덱")
+    parser.add_argument("--embedder", default=LLMConfig().embedder_name)
+    parser.add_argument("--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) - 1))
+    parser.add_argument("--chunk-size", type=int, default=512, help="워커 한 번에 보내는 행 수")
+    parser.add_argument("--encode-batch-size", type=int, default=64)
+    parser.add_argument("--word-correct", type=float, default=WORD_SIM_CORRECT)
+    parser.add_argument("--word-near", type=float, default=WORD_SIM_NEAR)
+    parser.add_argument("--concept-pass", type=float, default=CONCEPT_SIM_PASS)
+    args = parser.parse_args(argv)
+
+    summary = run(args)
+    # 요약은 stderr로 (stdout은 결과 JSONL)
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 # backend/config/settings.py
 import datetime
-from dataclasses import dataclass
-from typing import Dict
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 @dataclass
 class ScheduleConfig:
     stage_intervals: Dict[int, datetime.timedelta]
+    # 카드별 고정 지터: 간격의 ±fuzz_ratio 범위 (card_id 해시로 결정 → 재계산해도 같은 값)
+    fuzz_ratio: float = 0.05
+    # 하루 복습 상한 (None이면 비활성) - 넘치면 max_defer_days 안에서 덜 붐비는 날로 미룬다
+    daily_capacity: Optional[int] = None
+    max_defer_days: int = 3
 
     @classmethod
     def default(cls):
@@ -21,14 +27,176 @@ class ReviewConfig:
     """재시도 설정"""
     retry_count_immediate: int = 1
     retry_delay_sec: int = 30  # 기본 대기 30초 (변경 가능)
+    conflict_retries: int = 3  # 동시 수정으로 저장이 충돌했을 때 다시 읽어 재적용하는 횟수
+
+@dataclass
+class FeedbackCacheConfig:
+    """오답 피드백 의미 캐시 설정 (concept 카드)"""
+    enabled: bool = True
+    max_distance: float = 0.08          # 코사인 거리 이내의 오답이면 저장된 피드백 재사용
+    max_entries_per_card: int = 16
+    max_cards: int = 2048
+
+@dataclass
+class ConceptGraphConfig:
+    """연관 개념 / 심화 문제 개념 그래프 설정 (모든 사용자 공유)"""
+    db_path: str = "cards.db"
+    max_age: datetime.timedelta = datetime.timedelta(days=30)  # 이보다 오래된 결과는 다음 조회 때 재생성
+    related_k: int = 5              # 생성할 연관 개념 수
+    questions_n: int = 3            # 생성할 심화 문제 수
+    max_hops: int = 3               # 이웃 조회 최대 단계
+    max_nodes: int = 200            # 이웃 조회 최대 노드 수
+
+@dataclass
+class GenerationProfile:
+    """프롬프트 유형별 생성 파라미터 (Ollama options)"""
+    temperature: float = 0.7
+    num_predict: Optional[int] = None   # 최대 생성 토큰 수 (None이면 모델 기본값)
+    num_ctx: Optional[int] = None       # 컨텍스트 길이
+    stop: Optional[List[str]] = None    # 중단 시퀀스
+
+def default_generation_profiles() -> Dict[str, GenerationProfile]:
+    """프롬프트 유형별 기본 프로필 - 짧은 응답은 짧게 끊는다"""
+    return {
+        "verdict": GenerationProfile(temperature=0.0, num_predict=4, num_ctx=1024),
+        "hint": GenerationProfile(temperature=0.7, num_predict=96, num_ctx=1024),
+        "feedback": GenerationProfile(temperature=0.7, num_predict=160, num_ctx=1024),
+        "definition": GenerationProfile(temperature=0.3, num_predict=128, num_ctx=1024),
+        "related": GenerationProfile(temperature=0.5, num_predict=96, num_ctx=1024, stop=["\n\n"]),
+        "questions": GenerationProfile(temperature=0.8, num_predict=256, num_ctx=2048),
+    }
 
 @dataclass
 class LLMConfig:
     """LLM 설정"""
     model_name: str = "gemma3:4b-it-qat"
     temperature: float = 0.7
-    embedder_name: str = "nlpai-lab/KoE5"
+    # "stub"이면 모델 없이 해시 임베더 사용 (부하 테스트용)
+    embedder_name: str = field(default_factory=lambda: os.environ.get("MEMORIZATION_EMBEDDER", "nlpai-lab/KoE5"))
     similarity_threshold: float = 0.75
+    # 임베딩 사이드카 소켓 - 지정하면 워커마다 모델을 올리지 않고 사이드카(embedding_server.py)에 인코딩 요청
+    embedder_socket: str = field(default_factory=lambda: os.environ.get("MEMORIZATION_EMBEDDER_SOCKET", ""))
+    embedder_connections: int = 4       # 사이드카 연결 풀 크기 (연결마다 공유 메모리 결과 버퍼 하나)
+    embedder_buffer_bytes: int = 1 << 20
+    embedder_timeout_sec: float = 30.0
+    base_url: str = field(default_factory=lambda: os.environ.get("MEMORIZATION_OLLAMA_URL", "http://localhost:11434"))
+    keep_alive: str = "30m"             # 모델을 메모리에 상주시키는 시간
+    max_connections: int = 8            # Ollama HTTP 커넥션 풀 크기 (워커 전체 체인이 공유하는 풀 하나)
+    max_keepalive_connections: int = 8
+    request_timeout_sec: float = 120.0
+    coalesce_requests: bool = True      # 같은 입력으로 동시에 들어온 생성 요청은 한 번만 실행
+    # 동시 생성 수 - Ollama의 OLLAMA_NUM_PARALLEL과 맞춘다 (초과분은 우선순위 대기열)
+    max_parallel_generations: int = 2
+    # 입장 제어: 전체 대기 수가 이 값 이상이면 해당 우선순위 요청은 거절 (503)
+    grading_queue_limit: int = 32
+    hint_queue_limit: int = 16
+    enrichment_queue_limit: int = 4
+    queue_timeout_sec: float = 60.0     # 대기열에서 슬롯을 기다리는 최대 시간
+    profiles: Dict[str, GenerationProfile] = field(default_factory=default_generation_profiles)
+
+    def profile(self, name: str) -> GenerationProfile:
+        """프롬프트 유형별 프로필 조회 (없으면 기본 temperature 사용)"""
+        return self.profiles.get(name) or GenerationProfile(temperature=self.temperature)
+
+@dataclass
+class EmbeddingSidecarConfig:
+    """임베딩 사이드카 서버 설정 (모델 이름은 LLMConfig.embedder_name)"""
+    socket_path: str = "/tmp/memorization-embed.sock"
+    max_batch_texts: int = 128      # 한 번에 모아 인코딩할 최대 문장 수
+    max_wait_ms: float = 5.0        # 첫 요청 후 다른 요청을 기다리는 시간
+    encode_batch_size: int = 64
+
+@dataclass
+class SessionConfig:
+    """복습 세션 설정"""
+    max_cards: int = 20             # 세션당 최대 카드 수
+    hint_workers: int = 2           # 힌트 선생성 동시 작업 수
+    hint_wait_sec: float = 30.0     # 힌트 조회 시 생성 완료를 기다리는 최대 시간
+    ttl: datetime.timedelta = datetime.timedelta(hours=2)
+    max_sessions: int = 100
+
+@dataclass
+class NotifierConfig:
+    """디스코드 복습 알림 설정"""
+    quiet_period: datetime.timedelta = datetime.timedelta(hours=6)  # 같은 카드 재알림 최소 간격
+    max_message_length: int = 2000  # 디스코드 메시지 최대 길이
+    retry_delay: datetime.timedelta = datetime.timedelta(seconds=60)  # 전송 실패 시 재시도 간격
+    review_url: str = "http://localhost:3000/review"
+
+@dataclass
+class WebhookConfig:
+    """웹훅 아웃박스 전송 설정"""
+    outbox_db_path: str = "cards.db"
+    max_concurrency: int = 4        # 동시 전송 수
+    max_attempts: int = 5           # 최대 시도 횟수 (초과 시 failed)
+    backoff_base_sec: float = 1.0   # 지수 백오프 시작 간격
+    backoff_max_sec: float = 300.0
+    request_timeout_sec: float = 5.0
+    idle_poll_sec: float = 30.0     # 대기열이 비었을 때 최대 대기 시간
+    retention: datetime.timedelta = datetime.timedelta(days=7)  # delivered / failed 메시지 보관 기간
+    purge_interval_sec: float = 3600.0  # 보관 기간 지난 메시지 정리 주기
+
+@dataclass
+class TracingConfig:
+    """요청 트레이싱 / 디버그 프로파일링 설정"""
+    sample_rate: float = 0.0            # 0.0~1.0, 무작위 샘플링 비율
+    trace_header: str = "X-Trace"       # 이 헤더가 "1"이면 해당 요청 강제 트레이싱
+    max_traces: int = 200               # 보관할 최근 트레이스 수
+    # 디버그 엔드포인트 보호 토큰 (비어 있으면 디버그 엔드포인트 비활성화)
+    debug_token: str = field(default_factory=lambda: os.environ.get("MEMORIZATION_DEBUG_TOKEN", ""))
+
+@dataclass
+class StorageConfig:
+    """카드 저장소 샤딩 설정"""
+    default_db_path: str = "cards.db"   # 기본 사용자(default) 샤드
+    shard_dir: str = "data/users"       # 그 외 사용자별 샤드 파일 위치
+    max_open_shards: int = 64           # 동시에 열어 두는 샤드 연결 수 (LRU)
+    max_cached_decks: int = 256         # 캐시하는 (사용자, 덱) 저장소 수
+    # 여러 프로세스가 같은 DB를 쓰면 변경 카운터를 매번 DB에서 읽는다 (ETag 정합성)
+    shared_change_counter: bool = False
+    # X-User-Id 헤더를 사용자 식별로 믿을지 - 클라이언트가 마음대로 바꿀 수 있으므로
+    # 인증 프록시가 헤더를 덮어쓰는 배포에서만 켠다 (끄면 모든 요청이 기본 사용자)
+    trust_user_header: bool = field(
+        default_factory=lambda: os.environ.get("MEMORIZATION_TRUST_USER_HEADER", "0") == "1"
+    )
+
+@dataclass
+class RetentionConfig:
+    """복습 이력 보관 설정 - 오래된 기록은 압축 보관 테이블로 옮기고 카드에는 최근 기록만 남긴다"""
+    # 켜면 기존 DB의 이력도 보관 테이블로 옮겨지므로(카드 행이 바뀜) 명시적으로 켤 때만 실행
+    enabled: bool = field(
+        default_factory=lambda: os.environ.get("MEMORIZATION_HISTORY_RETENTION", "0") == "1"
+    )
+    keep_last: Optional[int] = 50       # 카드에 남길 최근 기록 수 (None이면 개수 제한 없음)
+    keep_days: Optional[int] = 90       # 이 기간 안의 기록은 남긴다 (None이면 기간 제한 없음)
+    min_records: int = 20               # 보관할 기록이 이보다 적으면 다음 실행으로 미룸 (작은 묶음 방지)
+    interval_sec: float = 3600.0        # 압축 작업 주기 (리더 워커에서만 실행)
+    batch_cards: int = 200              # 한 번에 읽는 카드 수
+
+@dataclass
+class IdempotencyConfig:
+    """복습 제출 멱등성 키(Idempotency-Key 헤더) 설정"""
+    db_path: str = "cards.db"
+    ttl: datetime.timedelta = datetime.timedelta(hours=24)  # 같은 키로 재요청 시 원래 결과를 돌려주는 기간
+    wait_sec: float = 30.0          # 같은 키의 원 요청이 처리 중일 때 완료를 기다리는 최대 시간
+    # 처리 중 표시가 이 시간 넘게 남아 있으면 원 요청 워커가 죽은 것으로 보고 다시 처리
+    stale_after_sec: float = 300.0
+
+@dataclass
+class SnapshotConfig:
+    """메모리 저장소(콘솔 모드) 바이너리 스냅샷 설정"""
+    path: str = "cards.snapshot"        # 시작 시 복원 / 주기적으로 덮어쓰는 파일
+    interval_sec: float = 60.0          # 변경이 있을 때만 저장하는 주기
+
+@dataclass
+class ClusterConfig:
+    """멀티 워커 배포 설정 - 백그라운드 작업(알림 스케줄러, 웹훅 전송)은 리더 한 곳에서만 실행"""
+    workers: int = field(default_factory=lambda: int(os.environ.get("MEMORIZATION_WORKERS", "1")))
+    db_path: str = "cards.db"           # 리더 임대 / 공유 설정 테이블 위치
+    lease_ttl_sec: float = 15.0         # 리더가 죽었을 때 다른 워커가 넘겨받기까지 최대 시간
+    # 다른 워커의 설정 / 카드 변경을 확인하는 폴백 폴링 주기
+    # (변경한 워커는 요청 처리 중에 직접 wake-up을 재계산하므로 짧을 필요 없음)
+    watch_interval_sec: float = 60.0
 
 @dataclass
 class SystemConfig:
@@ -36,11 +204,36 @@ class SystemConfig:
     schedule: ScheduleConfig
     llm: LLMConfig
     review: ReviewConfig
+    session: SessionConfig = field(default_factory=SessionConfig)
+    notifier: NotifierConfig = field(default_factory=NotifierConfig)
+    webhook: WebhookConfig = field(default_factory=WebhookConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    retention: RetentionConfig = field(default_factory=RetentionConfig)
+    cluster: ClusterConfig = field(default_factory=ClusterConfig)
+    snapshot: SnapshotConfig = field(default_factory=SnapshotConfig)
+    idempotency: IdempotencyConfig = field(default_factory=IdempotencyConfig)
+    feedback_cache: FeedbackCacheConfig = field(default_factory=FeedbackCacheConfig)
+    concept_graph: ConceptGraphConfig = field(default_factory=ConceptGraphConfig)
+    embedding_sidecar: EmbeddingSidecarConfig = field(default_factory=EmbeddingSidecarConfig)
 
     @classmethod
     def default(cls):
+        cluster = ClusterConfig()
         return cls(
             schedule=ScheduleConfig.default(),
             llm=LLMConfig(),
-            review=ReviewConfig()
+            review=ReviewConfig(),
+            session=SessionConfig(),
+            notifier=NotifierConfig(),
+            webhook=WebhookConfig(),
+            tracing=TracingConfig(),
+            storage=StorageConfig(shared_change_counter=cluster.workers > 1),
+            retention=RetentionConfig(),
+            cluster=cluster,
+            snapshot=SnapshotConfig(),
+            idempotency=IdempotencyConfig(),
+            feedback_cache=FeedbackCacheConfig(),
+            concept_graph=ConceptGraphConfig(),
+            embedding_sidecar=EmbeddingSidecarConfig()
         )
@@ -0,0 +1,46 @@
+"""
+임베딩 사이드카 실행 - 모델을 한 번만 올리고 API 워커들이 Unix 도메인 소켓으로 공유
+
+사용 예:
+    python embedding_server.py --socket /tmp/memorization-embed.sock
+    MEMORIZATION_EMBEDDER_SOCKET=/tmp/memorization-embed.sock MEMORIZATION_WORKERS=4 python api.py
+"""
+import argparse
+import signal
+import sys
+import threading
+
+from config.settings import EmbeddingSidecarConfig, LLMConfig
+from services.embedding_sidecar import EmbeddingSidecar, load_embedder
+
+def main(argv=None) -> int:
+    defaults = EmbeddingSidecarConfig()
+    parser = argparse.ArgumentParser(description="임베딩 사이드카 (Unix 도메인 소켓)")
+    parser.add_argument("--socket", default=defaults.socket_path, help="소켓 파일 경로")
+    parser.add_argument("--model", default=LLMConfig().embedder_name, help="SentenceTransformer 모델 (stub 가능)")
+    parser.add_argument("--max-batch", type=int, default=defaults.max_batch_texts, help="한 번에 인코딩할 최대 문장 수")
+    parser.add_argument("--max-wait-ms", type=float, default=defaults.max_wait_ms, help="요청을 모으는 최대 대기 시간")
+    parser.add_argument("--encode-batch-size", type=int, default=defaults.encode_batch_size)
+    args = parser.parse_args(argv)
+
+    embedder = load_embedder(args.model)
+    server = EmbeddingSidecar(
+        embedder, args.socket,
+        max_batch_texts=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        encode_batch_size=args.encode_batch_size,
+    )
+    # SIGTERM도 Ctrl-C처럼 정상 종료 (소켓 파일 정리)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"embedding sidecar ({args.model}) listening on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"served {server.stats}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
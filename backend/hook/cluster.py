@@ -0,0 +1,131 @@
+# backend/hook/cluster.py
+
+import os
+import socket
+import threading
+import time
+from typing import Callable, List, Tuple
+from uuid import uuid4
+
+from storage.lease_storage import SQLiteLease
+
+def make_instance_id() -> str:
+    """프로세스 식별자 (호스트:pid:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+class LeaderElector:
+    """
+    SQLite 임대 기반 리더 선출
+    - ttl/3 주기로 임대를 갱신하고, 획득 시 on_elected / 상실 시 on_demoted 호출
+    - 갱신이 ttl 안에 성공하지 못하면 다른 프로세스가 리더가 될 수 있으므로 스스로 물러난다
+    """
+
+    def __init__(
+        self,
+        lease: SQLiteLease,
+        name: str,
+        ttl_sec: float,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        instance_id: str | None = None
+    ):
+        self.lease = lease
+        self.name = name
+        self.ttl_sec = ttl_sec
+        self.instance_id = instance_id or make_instance_id()
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._is_leader = False
+        self._renewed_at = 0.0
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._tick()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """선출 중단 - 리더였다면 작업을 멈추고 임대를 반납"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._is_leader:
+            self._demote()
+            self.lease.release(self.name, self.instance_id)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.ttl_sec / 3):
+            self._tick()
+
+    def _tick(self) -> None:
+        try:
+            acquired = self.lease.try_acquire(self.name, self.instance_id, self.ttl_sec)
+        except Exception:
+            # DB 오류도 갱신 실패로 취급
+            acquired = False
+        now = time.monotonic()
+        if acquired:
+            self._renewed_at = now
+            if not self._is_leader:
+                self._is_leader = True
+                self._on_elected()
+        elif self._is_leader and now - self._renewed_at >= self.ttl_sec * 2 / 3:
+            # 임대가 곧 만료되거나 다른 프로세스가 가져감
+            self._demote()
+
+    def _demote(self) -> None:
+        self._is_leader = False
+        self._on_demoted()
+
+class ChangeWatcher:
+    """
+    version 값 폴링 기반 변경 알림
+    - SQLite에는 LISTEN/NOTIFY가 없어 가벼운 카운터 조회로 대신한다
+    """
+
+    def __init__(self, interval_sec: float):
+        self.interval_sec = interval_sec
+        self._watches: List[Tuple[Callable[[], int], Callable[[], None], List[int]]] = []
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, version_fn: Callable[[], int], callback: Callable[[], None]) -> None:
+        """version_fn 값이 바뀌면 callback 호출 (등록 시점 값이 기준)"""
+        self._watches.append((version_fn, callback, [version_fn()]))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="change-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> None:
+        for version_fn, callback, last in self._watches:
+            try:
+                version = version_fn()
+                if version != last[0]:
+                    last[0] = version
+                    callback()
+            except Exception:
+                # 다음 주기에 다시 확인
+                continue
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval_sec):
+            self.poll()
@@ -2,61 +2,246 @@
 
 import json
 import os
-import requests
+import threading
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
-from services.card_service import CardService
 from storage.sqlite_storage import SQLiteCardStorage
-from services.schedule_service import ScheduleService
+from storage.outbox_storage import SQLiteWebhookOutbox
+from storage.settings_storage import SQLiteSettingsStore
+from storage.lease_storage import SQLiteLease
+from hook.webhook_worker import WebhookDeliveryWorker
+from hook.cluster import LeaderElector, ChangeWatcher
+from config.settings import SystemConfig
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "webhook_config.json")
+WEBHOOK_URL_KEY = "discord_webhook_url"
 
 def load_webhook_url() -> str:
+    """기존 설정 파일의 웹훅 URL (DB 설정 마이그레이션용)"""
     if os.path.exists(CONFIG_PATH):
         with open(CONFIG_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
             return data.get("discord_webhook_url", "")
     return ""
 
-def save_webhook_url(url: str) -> None:
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump({"discord_webhook_url": url}, f)
+system_cfg = SystemConfig.default()
+notifier_cfg = system_cfg.notifier
+cluster_cfg = system_cfg.cluster
 
-discord_webhook_url = load_webhook_url()
+# 웹훅 URL은 모든 워커가 공유하도록 DB에 저장
+settings_store = SQLiteSettingsStore(db_path=cluster_cfg.db_path)
+_legacy_url = load_webhook_url()
+if _legacy_url:
+    settings_store.set_default(WEBHOOK_URL_KEY, _legacy_url)
+discord_webhook_url = settings_store.get(WEBHOOK_URL_KEY, "")
 
-storage = SQLiteCardStorage(db_path="cards.db")
-card_service = CardService(storage)
-schedule_service = ScheduleService()
+# 기본 덱 저장소 - API의 샤드 라우터가 만든 것을 start_background_jobs에서 주입
+# (같은 연결 / 변경 카운터를 공유해 워커 안의 변경은 폴링 없이 바로 보인다)
+storage: SQLiteCardStorage | None = None
+
+# 웹훅 메시지는 아웃박스에 기록 후 워커가 비동기로 전송
+outbox = SQLiteWebhookOutbox(db_path=system_cfg.webhook.outbox_db_path)
+delivery_worker = WebhookDeliveryWorker(outbox, system_cfg.webhook)
+
+# 다음 알림 시점에 한 번만 깨어나는 타이머 상태
+_scheduler: BackgroundScheduler | None = None
+_wakeup_lock = threading.Lock()
+_next_wakeup: datetime | None = None
+WAKEUP_JOB_ID = "due_notify_wakeup"
+
+# 리더 선출 / 공유 설정 변경 감지
+_elector: LeaderElector | None = None
+_watcher: ChangeWatcher | None = None
+LEADER_LEASE_NAME = "background_jobs"
+
+def get_webhook_url() -> str:
+    return discord_webhook_url
 
 def set_webhook_url(url: str):
     global discord_webhook_url
+    settings_store.set(WEBHOOK_URL_KEY, url)
     discord_webhook_url = url
-    save_webhook_url(url)
+    schedule_next_wakeup()
 
-def send_discord_alert(card):
+def _reload_settings() -> None:
+    """다른 워커가 바꾼 공유 설정 반영"""
+    global discord_webhook_url
+    discord_webhook_url = settings_store.get(WEBHOOK_URL_KEY, "")
+    schedule_next_wakeup()
+
+def build_digest_messages(cards, max_length: int = 2000) -> list[tuple[str, list[str]]]:
+    """
+    복습 대상 카드를 디스코드 메시지 길이 제한에 맞춰 다이제스트로 분할
+    - 전체 카드 수는 첫 메시지 머리글에만, 나머지는 "(2/3)"처럼 이어지는 메시지로 표시
+    반환: (메시지 내용, 포함된 카드 ID 목록) 리스트
+    """
+    title = "🕒 **복습 알림** 🕒"
+    first_header = f"{title} ({len(cards)}개 카드)\n"
+    footer = f"- 지금 복습하세요! {notifier_cfg.review_url}"
+    # 분할 수는 카드 수를 넘지 않으므로 가장 긴 이어짐 머리글 기준으로 자른다
+    widest = max(len(first_header), len(f"{title} ({len(cards)}/{len(cards)})\n"))
+    line_limit = max_length - widest - len(footer)
+    parts: list[tuple[str, list[str]]] = []
+    body = ""
+    card_ids: list[str] = []
+    for card in cards:
+        line = f"- **{card.concept}** (단계 {card.stage}) `{card.card_id}`\n"
+        if len(line) > line_limit:
+            line = line[:line_limit - 2] + "…\n"
+        if len(body) + len(line) > line_limit:
+            parts.append((body, card_ids))
+            body, card_ids = "", []
+        body += line
+        card_ids.append(card.card_id)
+    if body:
+        parts.append((body, card_ids))
+
+    messages: list[tuple[str, list[str]]] = []
+    for index, (body, card_ids) in enumerate(parts, start=1):
+        header = first_header if index == 1 else f"{title} ({index}/{len(parts)})\n"
+        messages.append((header + body + footer, card_ids))
+    return messages
+
+def send_discord_message(content: str) -> bool:
+    """메시지를 아웃박스에 적재 (실제 전송은 delivery_worker 담당)"""
     url = discord_webhook_url
     if not url:
-        return
-    content = (
-        f"🕒 **복습 알림** 🕒\n"
-        f"- 카드 ID: `{card.card_id}`\n"
-        f"- 개념/단어: **{card.concept}**\n"
-        f"- 현재 단계: {card.stage}\n"
-        f"- 지금 복습하세요!"
-        f"- http://localhost:3000/review"
-    )
-    payload = {"content": content}
-    try:
-        requests.post(url, json=payload, timeout=5)
-    except Exception:
-        pass
+        return False
+    delivery_worker.enqueue(url, {"content": content})
+    return True
+
+def get_delivery_stats() -> dict:
+    """웹훅 전송 현황 (delivered / failed / queued)"""
+    return delivery_worker.stats()
+
+def send_discord_alert(card):
+    """단일 카드 알림 (다이제스트 한 건으로 전송)"""
+    for message, _ in build_digest_messages([card], notifier_cfg.max_message_length):
+        send_discord_message(message)
 
 def check_due_and_notify():
-    due_cards = card_service.get_due_cards()
-    for card in due_cards:
-        send_discord_alert(card)
+    if storage is None or not discord_webhook_url:
+        return
+    cards = storage.get_cards_to_notify(notifier_cfg.quiet_period)
+    if not cards:
+        return
+    notified_at = datetime.now()
+    for message, card_ids in build_digest_messages(cards, notifier_cfg.max_message_length):
+        if not send_discord_message(message):
+            # 적재 실패한 카드는 기록하지 않아 다음 주기에 다시 시도
+            return
+        storage.mark_notified(card_ids, notified_at)
+
+def _schedule_wakeup_at(run_at: datetime | None) -> None:
+    """단발성 wake-up 작업 등록/교체 (run_at이 None이면 제거)"""
+    global _next_wakeup
+    with _wakeup_lock:
+        if _scheduler is None:
+            # 리더가 아닌 워커 - 리더가 변경 감지로 다시 계산한다
+            return
+        if run_at is None:
+            if _next_wakeup is not None and _scheduler.get_job(WAKEUP_JOB_ID):
+                _scheduler.remove_job(WAKEUP_JOB_ID)
+            _next_wakeup = None
+            return
+        _next_wakeup = run_at
+        _scheduler.add_job(
+            _wakeup,
+            "date",
+            run_date=run_at.astimezone(),  # 로컬 시각 기준으로 스케줄러 타임존과 무관하게 지정
+            id=WAKEUP_JOB_ID,
+            replace_existing=True,
+        )
+
+def schedule_next_wakeup() -> None:
+    """DB에서 다음 알림 시각을 조회해 wake-up 재설정"""
+    if _scheduler is None:
+        # 리더가 아니면 조회할 필요 없음
+        return
+    if storage is None or not discord_webhook_url:
+        _schedule_wakeup_at(None)
+        return
+    next_time = storage.get_next_notify_time(notifier_cfg.quiet_period)
+    if next_time is not None:
+        next_time = max(next_time, datetime.now())
+    _schedule_wakeup_at(next_time)
+
+def notify_card_changed(next_review: datetime | None) -> None:
+    """
+    카드 생성/복습/수정 시 호출
+    새 next_review가 현재 wake-up보다 이르면 wake-up을 앞당긴다
+    """
+    if next_review is None or not discord_webhook_url:
+        return
+    if _next_wakeup is None or next_review < _next_wakeup:
+        _schedule_wakeup_at(max(next_review, datetime.now()))
+
+def _wakeup():
+    global _next_wakeup
+    with _wakeup_lock:
+        _next_wakeup = None
+    check_due_and_notify()
+    next_time = storage.get_next_notify_time(notifier_cfg.quiet_period)
+    if next_time is not None and next_time <= datetime.now():
+        # 전송 실패로 남은 카드가 있으면 재시도 간격 후 다시 시도
+        next_time = datetime.now() + notifier_cfg.retry_delay
+    if discord_webhook_url and next_time is not None:
+        if _next_wakeup is None or next_time < _next_wakeup:
+            _schedule_wakeup_at(next_time)
 
 def start_scheduler():
+    """알림 스케줄러 + 웹훅 전송 워커 시작 (리더에서만 호출)"""
+    global _scheduler
     scheduler = BackgroundScheduler(timezone="Asia/Seoul")
-    scheduler.add_job(check_due_and_notify, "interval", minutes=1, next_run_time=datetime.now())
     scheduler.start()
+    with _wakeup_lock:
+        _scheduler = scheduler
+    delivery_worker.start()
+    schedule_next_wakeup()
+
+def stop_scheduler():
+    """리더 상실 / 종료 시 백그라운드 작업 중단"""
+    global _scheduler, _next_wakeup
+    with _wakeup_lock:
+        scheduler, _scheduler = _scheduler, None
+        _next_wakeup = None
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    delivery_worker.stop()
+
+def start_background_jobs(card_storage: SQLiteCardStorage):
+    """
+    워커 시작 시 호출
+    - 리더로 선출된 워커 하나만 start_scheduler 실행 (워커가 여러 개여도 알림 중복 없음)
+    - 같은 워커의 카드 변경은 notify_card_changed로 바로 반영
+    - 다른 워커의 설정 / 카드 변경은 느린 버전 폴링으로 감지해 wake-up 재계산
+    """
+    global _elector, _watcher, storage
+    if _elector is not None:
+        return
+    storage = card_storage
+    _watcher = ChangeWatcher(cluster_cfg.watch_interval_sec)
+    _watcher.watch(settings_store.get_version, _reload_settings)
+    # 다른 워커에서 생성/복습된 카드도 리더의 wake-up에 반영
+    _watcher.watch(storage.refresh_change_counter, schedule_next_wakeup)
+    _watcher.start()
+    _elector = LeaderElector(
+        SQLiteLease(db_path=cluster_cfg.db_path),
+        LEADER_LEASE_NAME,
+        cluster_cfg.lease_ttl_sec,
+        on_elected=start_scheduler,
+        on_demoted=stop_scheduler,
+    )
+    _elector.start()
+
+def stop_background_jobs():
+    global _elector, _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+    if _elector is not None:
+        _elector.stop()
+        _elector = None
+
+def is_leader() -> bool:
+    return _elector is not None and _elector.is_leader
@@ -0,0 +1,190 @@
+# backend/hook/webhook_worker.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from config.settings import WebhookConfig
+from storage.outbox_storage import SQLiteWebhookOutbox, OutboxMessage
+from utils.metrics import WEBHOOK_DELIVERIES, QUEUE_DEPTH, BACKGROUND_JOB_ERRORS
+
+class WebhookDeliveryWorker:
+    """
+    아웃박스 메시지 전송 워커
+    - 동시 전송 수 제한 (max_concurrency)
+    - 429 Retry-After / X-RateLimit-* 헤더 준수
+    - 실패 시 지수 백오프 후 재시도, max_attempts 초과 시 failed
+    """
+
+    def __init__(self, outbox: SQLiteWebhookOutbox, webhook_config: WebhookConfig | None = None):
+        self.outbox = outbox
+        self.cfg = webhook_config or WebhookConfig()
+        self._session = requests.Session()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._in_flight = 0
+        # url별 전송 재개 시각 (rate limit 버킷 소진 / 429)
+        self._paused_until: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._purged_at = 0.0
+        # 스크레이프마다 전체 GROUP BY를 돌지 않도록 대기 중인 메시지만 센다
+        QUEUE_DEPTH.set_function(lambda: {("webhook_outbox",): self.outbox.pending_count()}, source="webhook_outbox")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # 리더 교체로 다시 시작될 수 있으므로 정지 플래그 초기화
+        self._stopping.clear()
+        self.outbox.requeue_in_flight()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.cfg.max_concurrency, thread_name_prefix="webhook"
+        )
+        self._thread = threading.Thread(target=self._run, name="webhook-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def enqueue(self, url: str, payload: dict) -> int:
+        """메시지를 아웃박스에 기록하고 워커를 깨운다"""
+        message_id = self.outbox.enqueue(url, payload)
+        self._wakeup.set()
+        return message_id
+
+    def stats(self) -> dict:
+        """delivered / failed / queued 카운트"""
+        counts = self.outbox.counts()
+        return {
+            "delivered": counts["delivered"],
+            "failed": counts["failed"],
+            "queued": counts["queued"] + counts["sending"],
+        }
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            self._purge_if_due()
+            with self._lock:
+                free = self.cfg.max_concurrency - self._in_flight
+            if free <= 0:
+                # 슬롯이 비면 _deliver_and_release가 깨워준다
+                self._wakeup.wait(self.cfg.idle_poll_sec)
+                continue
+            for message in self.outbox.claim_ready(free):
+                with self._lock:
+                    self._in_flight += 1
+                self._executor.submit(self._deliver_and_release, message)
+            self._wakeup.wait(self._idle_timeout())
+
+    def _purge_if_due(self) -> None:
+        """보관 기간이 지난 delivered / failed 메시지를 purge_interval_sec마다 정리"""
+        now = time.monotonic()
+        if now - self._purged_at < self.cfg.purge_interval_sec:
+            return
+        self._purged_at = now
+        try:
+            self.outbox.purge_finished(datetime.now() - self.cfg.retention)
+        except Exception:
+            # DB 잠금 등은 다음 주기에 다시 시도
+            BACKGROUND_JOB_ERRORS.inc("webhook_outbox_purge")
+
+    def _idle_timeout(self) -> float:
+        next_time = self.outbox.next_attempt_time()
+        if next_time is None:
+            return self.cfg.idle_poll_sec
+        delay = (next_time - datetime.now()).total_seconds()
+        return min(max(delay, 0.05), self.cfg.idle_poll_sec)
+
+    def _deliver_and_release(self, message: OutboxMessage) -> None:
+        try:
+            self._deliver(message)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._wakeup.set()
+
+    def _deliver(self, message: OutboxMessage) -> None:
+        with self._lock:
+            paused_until = self._paused_until.get(message.url)
+        if paused_until and paused_until > datetime.now():
+            # 버킷 소진 상태: 시도 횟수 증가 없이 재개 시각으로 미룬다
+            self.outbox.mark_retry(message.message_id, paused_until, "rate limited", count_attempt=False)
+            WEBHOOK_DELIVERIES.inc("deferred")
+            return
+
+        try:
+            response = self._session.post(
+                message.url, json=message.payload, timeout=self.cfg.request_timeout_sec
+            )
+        except requests.RequestException as e:
+            self._retry_or_fail(message, f"{type(e).__name__}: {e}")
+            return
+
+        self._update_rate_limit(message.url, response)
+
+        if response.ok:
+            self.outbox.mark_delivered(message.message_id)
+            WEBHOOK_DELIVERIES.inc("delivered")
+        elif response.status_code == 429:
+            retry_after = self._retry_after_seconds(response)
+            resume_at = datetime.now() + timedelta(seconds=retry_after)
+            with self._lock:
+                self._paused_until[message.url] = resume_at
+            self.outbox.mark_retry(message.message_id, resume_at, "429 Too Many Requests", count_attempt=False)
+            WEBHOOK_DELIVERIES.inc("rate_limited")
+        elif response.status_code >= 500:
+            self._retry_or_fail(message, f"HTTP {response.status_code}")
+        else:
+            # 4xx는 재시도해도 결과가 같으므로 바로 실패 처리
+            self.outbox.mark_failed(message.message_id, f"HTTP {response.status_code}: {response.text[:200]}")
+            WEBHOOK_DELIVERIES.inc("failed")
+
+    def _retry_or_fail(self, message: OutboxMessage, error: str) -> None:
+        attempts = message.attempts + 1
+        if attempts >= self.cfg.max_attempts:
+            self.outbox.mark_failed(message.message_id, error)
+            WEBHOOK_DELIVERIES.inc("failed")
+            return
+        delay = min(self.cfg.backoff_base_sec * (2 ** (attempts - 1)), self.cfg.backoff_max_sec)
+        self.outbox.mark_retry(message.message_id, datetime.now() + timedelta(seconds=delay), error)
+        WEBHOOK_DELIVERIES.inc("retry")
+
+    def _update_rate_limit(self, url: str, response: requests.Response) -> None:
+        """X-RateLimit-Remaining이 0이면 Reset-After 동안 해당 url 전송 중지"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        try:
+            if int(remaining) > 0:
+                return
+            resume_at = datetime.now() + timedelta(seconds=float(reset_after))
+        except ValueError:
+            return
+        with self._lock:
+            self._paused_until[url] = resume_at
+
+    def _retry_after_seconds(self, response: requests.Response) -> float:
+        """Retry-After 헤더 또는 디스코드 응답 본문의 retry_after (초)"""
+        for value in (response.headers.get("Retry-After"), response.headers.get("X-RateLimit-Reset-After")):
+            if value:
+                try:
+                    return float(value)
+                except ValueError:
+                    pass
+        try:
+            return float(response.json().get("retry_after", self.cfg.backoff_base_sec))
+        except (ValueError, AttributeError):
+            return self.cfg.backoff_base_sec
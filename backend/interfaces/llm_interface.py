@@ -51,6 +51,11 @@ class ILLMService(ABC):
         """유사도 비교"""
         pass
 
+    @abstractmethod
+    def embed(self, text: str) -> List[float]:
+        """정규화된 임베딩 벡터"""
+        pass
+
     @abstractmethod
     def is_equivalent(self, correct_answer: str, user_answer: str) -> bool:
         """yes/no"""
@@ -1,14 +1,30 @@
 """저장소 인터페이스 - DIP(의존성 역전 원칙) 준수"""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 from models.card import MemorizationCard
+from models.review import ReviewEvent, ReviewRecord
+
+class CardConflictError(Exception):
+    """낙관적 잠금 충돌 - 읽은 뒤 다른 요청이 먼저 카드를 바꿨거나 삭제함"""
+
+    def __init__(self, card_id: str):
+        super().__init__(f"card {card_id} was modified concurrently")
+        self.card_id = card_id
+
+class CardNotFoundError(LookupError):
+    """읽은 뒤 갱신 전에 카드가 삭제됨 - 재시도해도 같은 결과이므로 충돌이 아닌 '없음'으로 처리"""
+
+    def __init__(self, card_id: str):
+        super().__init__(f"card {card_id} not found")
+        self.card_id = card_id
 
 class ICardStorage(ABC):
     """카드 저장소 인터페이스"""
     
     @abstractmethod
     def save_card(self, card: MemorizationCard) -> None:
-        """카드 저장"""
+        """카드 저장 (버전 확인 없이 덮어쓰기 - 생성용), card.version을 저장된 버전으로 갱신"""
         pass
     
     @abstractmethod
@@ -23,7 +39,10 @@ class ICardStorage(ABC):
     
     @abstractmethod
     def update_card(self, card: MemorizationCard) -> None:
-        """카드 업데이트"""
+        """
+        카드 업데이트 - 저장된 버전이 card.version과 다르면 CardConflictError,
+        카드가 삭제됐으면 CardNotFoundError (성공 시 버전 증가)
+        """
         pass
     
     @abstractmethod
@@ -35,3 +54,76 @@ class ICardStorage(ABC):
     def get_due_cards(self) -> List[MemorizationCard]:
         """복습 예정 카드 조회"""
         pass
+
+    @abstractmethod
+    def query_cards(
+        self,
+        card_type: Optional[str] = None,
+        stage: Optional[int] = None,
+        due: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor_id: Optional[str] = None,
+    ) -> List[MemorizationCard]:
+        """필터 + 커서 기반 페이지 조회 (card_id 오름차순)"""
+        pass
+
+    @abstractmethod
+    def search_cards(self, query: str, limit: int = 20, offset: int = 0) -> List[MemorizationCard]:
+        """concept/answer 검색 (관련도순, 개념이 검색어로 시작하는 카드 우선)"""
+        pass
+
+    @abstractmethod
+    def save_review(self, card: MemorizationCard, event: ReviewEvent) -> None:
+        """복습 결과 저장 (카드 + 통계 롤업을 함께 갱신) - 예외는 update_card와 같음"""
+        pass
+
+    @abstractmethod
+    def get_stats(self, days: int = 30) -> Dict[str, Any]:
+        """덱 통계 (카드 수, 정답률, 최근 days일 일별 복습 수 등)"""
+        pass
+
+    @abstractmethod
+    def count_due_by_bucket(
+        self,
+        start: datetime,
+        end: datetime,
+        bucket: str = "day",
+        include_overdue: bool = False,
+    ) -> Dict[str, int]:
+        """
+        [start, end) 구간 복습 예정 카드 수를 시간(hour)/일(day) 버킷별로 집계
+        - include_overdue면 start 이전 카드는 "overdue" 키로 합산
+        """
+        pass
+
+    @abstractmethod
+    def iter_review_history(self, card_id: str, include_archived: bool = True) -> Optional[Iterator[ReviewRecord]]:
+        """
+        카드 복습 이력을 오래된 순으로 순회 (카드가 없으면 None)
+        - include_archived면 보관소로 옮겨진 기록부터 묶음 단위로 읽어 흘려보낸다
+        """
+        pass
+
+    @abstractmethod
+    def get_change_counter(self) -> int:
+        """덱 변경 카운터 (카드 저장/삭제 시 증가)"""
+        pass
+
+    @abstractmethod
+    def get_last_modified(self) -> datetime:
+        """덱 마지막 변경 시각 (Last-Modified 헤더용)"""
+        pass
+
+class ICardStorageProvider(ABC):
+    """사용자/덱 단위 저장소 제공자 인터페이스"""
+
+    @abstractmethod
+    def get_storage(self, user_id: str, deck_id: str) -> ICardStorage:
+        """(사용자, 덱) 범위의 카드 저장소 조회"""
+        pass
+
+    @abstractmethod
+    def list_decks(self, user_id: str) -> List[str]:
+        """사용자의 덱 목록"""
+        pass
@@ -0,0 +1,194 @@
+"""
+부하 테스트 도구 - 실제 Ollama / KoE5 없이 API 용량을 측정
+
+Ollama 대역 서버(토큰 지연 / 오류 주입)를 띄우고 API를 같은 프로세스(uvicorn 스레드) 또는
+uvicorn 하위 프로세스로 실행한 뒤, 가상 사용자 시나리오를 목표 초당 요청 수로 보낸다.
+
+사용 예:
+    python load_test.py --rate 20 --duration 60 --users 50 --stub-embedder
+    python load_test.py --mode uvicorn --workers 4 --rate 50 --token-ms 30 --error-rate 0.02
+    python load_test.py --target http://localhost:8000 --no-fake-ollama --rate 5   # 이미 떠 있는 서버
+        (대상 서버가 MEMORIZATION_TRUST_USER_HEADER=1이 아니면 모든 가상 사용자가 기본 사용자 샤드를 공유)
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from loadtest.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+from loadtest.scenarios import DEFAULT_MIX, LoadScenario, format_report, run_load
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_ready(base_url: str, timeout_sec: float, process: Optional[subprocess.Popen] = None) -> None:
+    deadline = time.monotonic() + timeout_sec
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"API process exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API did not become ready within {timeout_sec}s")
+
+class _InProcessAPI:
+    """같은 프로세스의 스레드에서 uvicorn 실행 (api 모듈은 환경 변수 설정 후 import)"""
+
+    def __init__(self, port: int):
+        import uvicorn
+        import api
+        self.server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, name="api", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+class _SubprocessAPI:
+    """uvicorn 하위 프로세스 (workers > 1이면 멀티 워커 배포와 같은 구성)"""
+
+    def __init__(self, port: int, workers: int, workdir: str):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+        env["MEMORIZATION_WORKERS"] = str(workers)
+        self.args = [
+            sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ]
+        self.env = env
+        self.workdir = workdir
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(self.args, cwd=self.workdir, env=self.env)
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+def _parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """"review=4,hint=2" → 비중 (지정하지 않은 종류는 기본값)"""
+    mix = dict(DEFAULT_MIX)
+    if spec:
+        for part in spec.split(","):
+            name, _, weight = part.partition("=")
+            if name.strip() not in mix:
+                raise argparse.ArgumentTypeError(f"unknown request type: {name}")
+            mix[name.strip()] = float(weight)
+    return mix
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API 부하 테스트 (Ollama 대역 서버 사용)")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--target", help="이미 실행 중인 API 주소 (지정하면 API를 띄우지 않음)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 모드 워커 수")
+    parser.add_argument("--workdir", help="API 작업 디렉터리 (DB 파일 위치, 기본: 임시 디렉터리)")
+    parser.add_argument("--stub-embedder", action="store_true", help="KoE5 대신 해시 임베더 사용")
+    parser.add_argument("--no-fake-ollama", action="store_true", help="대역 서버 없이 실제 Ollama 사용")
+    # 시나리오
+    parser.add_argument("--rate", type=float, default=10.0, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="집계에서 제외할 시작 구간(초)")
+    parser.add_argument("--users", type=int, default=20, help="가상 사용자 수")
+    parser.add_argument("--seed-cards", type=int, default=5, help="측정 전 사용자별 생성 카드 수")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 진행 요청 수 상한")
+    parser.add_argument("--mix", help="요청 비중 (예: review=4,hint=2,create=1,list_due=2,retry=1)")
+    parser.add_argument("--correct-ratio", type=float, default=0.6)
+    parser.add_argument("--fixed-interval", action="store_true", help="포아송 대신 고정 간격 도착")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃(초)")
+    # Ollama 대역
+    parser.add_argument("--first-token-ms", type=float, default=150.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--reply-tokens", type=int, default=24)
+    parser.add_argument("--ollama-parallel", type=int, default=2, help="대역 서버 동시 생성 수")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버 오류 응답 비율")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args(argv)
+    mix = _parse_mix(args.mix)
+    # 인프로세스 모드는 작업 디렉터리를 옮기므로 먼저 절대 경로로
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+
+    fake = None
+    if not args.no_fake_ollama:
+        fake = FakeOllamaServer(FakeOllamaConfig(
+            first_token_ms=args.first_token_ms,
+            token_ms=args.token_ms,
+            reply_tokens=args.reply_tokens,
+            parallel=args.ollama_parallel,
+            error_rate=args.error_rate,
+        )).start()
+        os.environ["MEMORIZATION_OLLAMA_URL"] = fake.url
+    if args.stub_embedder:
+        os.environ["MEMORIZATION_EMBEDDER"] = "stub"
+
+    api_runner = None
+    base_url = args.target
+    if base_url is None:
+        # 가상 사용자마다 X-User-Id 샤드를 쓰므로 직접 띄우는 API는 헤더를 믿도록 설정
+        os.environ["MEMORIZATION_TRUST_USER_HEADER"] = "1"
+        workdir = args.workdir or tempfile.mkdtemp(prefix="memorization-load-")
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        if args.mode == "uvicorn":
+            api_runner = _SubprocessAPI(port, args.workers, workdir)
+        else:
+            # 상대 경로 DB(cards.db 등)가 작업 디렉터리에 생긴다
+            os.chdir(workdir)
+            api_runner = _InProcessAPI(port)
+        print(f"API {args.mode} at {base_url} (workdir {workdir})", file=sys.stderr)
+        api_runner.start()
+
+    try:
+        _wait_ready(base_url, 120.0, getattr(api_runner, "process", None))
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        with httpx.Client(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            scenario = LoadScenario(client, args.users, mix, correct_ratio=args.correct_ratio)
+            if args.seed_cards:
+                print(f"seeding {args.seed_cards} cards x {args.users} users", file=sys.stderr)
+                scenario.seed_cards(args.seed_cards)
+            print(f"running {args.rate} req/s for {args.duration}s (+{args.warmup}s warmup)", file=sys.stderr)
+            result = run_load(
+                scenario, args.rate, args.duration, args.concurrency,
+                warmup_sec=args.warmup, poisson=not args.fixed_interval,
+            )
+    finally:
+        if api_runner is not None:
+            api_runner.stop()
+        if fake is not None:
+            fake.stop()
+
+    print(format_report(result))
+    report = {"config": vars(args), "endpoints": result.endpoints, "scheduled": result.scheduled,
+              "late_starts": result.late_starts}
+    if fake is not None:
+        report["fake_ollama"] = fake.stats.snapshot()
+        print(f"fake ollama: {json.dumps(report['fake_ollama'], ensure_ascii=False)}")
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
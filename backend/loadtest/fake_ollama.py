@@ -0,0 +1,219 @@
+# backend/loadtest/fake_ollama.py
+"""
+부하 테스트용 Ollama 대역 HTTP 서버
+- /api/chat, /api/generate를 Ollama와 같은 형식(NDJSON 스트리밍 / 단일 JSON)으로 응답
+- 첫 토큰 지연 + 토큰당 지연으로 생성 시간을 흉내내고, 동시 생성 수는 OLLAMA_NUM_PARALLEL처럼 제한
+- error_rate 비율로 오류 응답을 주입
+"""
+import datetime
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+FILLER_WORDS = ["핵심", "개념을", "떠올려", "보세요.", "정의의", "앞부분은", "이미", "알고", "있습니다.", "조금만", "더"]
+
+@dataclass
+class FakeOllamaConfig:
+    """대역 서버 설정 (지연은 밀리초)"""
+    first_token_ms: float = 150.0   # 프롬프트 처리 시간
+    token_ms: float = 20.0          # 토큰당 생성 시간
+    reply_tokens: int = 24          # num_predict가 없을 때 자유 응답 토큰 수
+    parallel: int = 2               # 동시 생성 수 (초과분은 서버 안에서 대기)
+    error_rate: float = 0.0         # 0.0~1.0, 오류 응답 비율
+    error_status: int = 500
+    yes_ratio: float = 0.7          # 동등성 판정 프롬프트에 YES로 답하는 비율
+    seed: int = 0
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+        self.tokens = 0
+
+    def record(self, path: str, tokens: int = 0, error: bool = False) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.tokens += tokens
+            self.errors += int(error)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {"requests": dict(self.requests), "errors": self.errors, "tokens": self.tokens}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # httpx 커넥션 재사용
+    server: "FakeOllamaServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else {}
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            model = {"name": self.server.model_name, "model": self.server.model_name, "size": 0}
+            self._send_json(200, {"models": [model]})
+        elif self.path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-fake"})
+        elif self.path == "/":
+            self._send_json(200, {"status": "Ollama is running"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            body = self._read_json()
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+        if self.path == "/api/show":
+            self._send_json(200, {
+                "modelfile": "", "parameters": "", "template": "",
+                "details": {"family": "fake"}, "model_info": {}, "capabilities": ["completion"],
+            })
+        elif self.path in ("/api/chat", "/api/generate"):
+            self._generate(body, chat=self.path == "/api/chat")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _generate(self, body: dict, chat: bool) -> None:
+        server = self.server
+        if chat:
+            prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages") or [])
+        else:
+            prompt = str(body.get("prompt", ""))
+        limit = (body.get("options") or {}).get("num_predict")
+        failed, tokens = server.plan_reply(prompt, limit)
+        if failed:
+            server.stats.record(self.path, error=True)
+            self._send_json(server.cfg.error_status, {"error": "injected failure"})
+            return
+
+        model = body.get("model") or server.model_name
+        # Ollama처럼 생성 슬롯이 없으면 요청이 서버 안에서 기다린다
+        with server.slots:
+            time.sleep(server.cfg.first_token_ms / 1000)
+            if body.get("stream", True):
+                self._stream(model, tokens, chat)
+            else:
+                time.sleep(server.cfg.token_ms * len(tokens) / 1000)
+                self._send_json(
+                    200, self._chunk(model, "".join(tokens), chat, done=True) | self._usage(len(tokens))
+                )
+        server.stats.record(self.path, tokens=len(tokens))
+
+    def _usage(self, eval_count: int) -> dict:
+        """마지막 응답의 사용량 필드 (langchain이 usage_metadata로 옮긴다)"""
+        cfg = self.server.cfg
+        prompt_ns = int(cfg.first_token_ms * 1e6)
+        eval_ns = int(cfg.token_ms * eval_count * 1e6)
+        return {
+            "done_reason": "stop",
+            "total_duration": prompt_ns + eval_ns,
+            "load_duration": 0,
+            "prompt_eval_count": 32,
+            "prompt_eval_duration": prompt_ns,
+            "eval_count": eval_count,
+            "eval_duration": eval_ns,
+        }
+
+    def _chunk(self, model: str, content: str, chat: bool, done: bool) -> dict:
+        chunk: Dict[str, object] = {
+            "model": model,
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "done": done,
+        }
+        if chat:
+            chunk["message"] = {"role": "assistant", "content": content}
+        else:
+            chunk["response"] = content
+        return chunk
+
+    def _write_chunk(self, payload: dict) -> None:
+        data = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, model: str, tokens: List[str], chat: bool) -> None:
+        cfg = self.server.cfg
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                time.sleep(cfg.token_ms / 1000)
+                self._write_chunk(self._chunk(model, token, chat, done=False))
+            self._write_chunk(self._chunk(model, "", chat, done=True) | self._usage(len(tokens)))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 타임아웃으로 끊음
+            self.close_connection = True
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """백그라운드 스레드에서 도는 Ollama 대역 (port=0이면 빈 포트 자동 선택)"""
+    daemon_threads = True
+
+    def __init__(self, config: FakeOllamaConfig | None = None, host: str = "127.0.0.1", port: int = 0,
+                 model_name: str = "fake"):
+        super().__init__((host, port), _Handler)
+        self.cfg = config or FakeOllamaConfig()
+        self.model_name = model_name
+        self.slots = threading.BoundedSemaphore(max(self.cfg.parallel, 1))
+        self.stats = _Stats()
+        self._rng = random.Random(self.cfg.seed)
+        self._rng_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def plan_reply(self, prompt: str, limit: Optional[int]) -> Tuple[bool, List[str]]:
+        """(오류 주입 여부, 응답 토큰) - 프롬프트 종류에 맞는 모양의 응답을 만든다"""
+        with self._rng_lock:
+            if self._rng.random() < self.cfg.error_rate:
+                return True, []
+            yes = self._rng.random() < self.cfg.yes_ratio
+            offset = self._rng.randrange(len(FILLER_WORDS))
+        if "YES or NO" in prompt:
+            tokens = ["YES" if yes else "NO"]
+        elif "개념1, 개념2" in prompt:
+            tokens = [f"연관개념{i + 1}, " for i in range(5)]
+        elif "문제1, 문제2" in prompt:
+            tokens = [f"심화 문제 {i + 1}, " for i in range(3)]
+        else:
+            tokens = [
+                FILLER_WORDS[(offset + i) % len(FILLER_WORDS)] + " " for i in range(self.cfg.reply_tokens)
+            ]
+        if limit:
+            tokens = tokens[:int(limit)]
+        return False, tokens
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
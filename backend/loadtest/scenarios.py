@@ -0,0 +1,263 @@
+# backend/loadtest/scenarios.py
+"""
+부하 시나리오 - 가상 사용자들이 카드 생성 / 복습 목록 / 힌트 / 복습 제출 / 재시도를 섞어 요청
+- 열린 루프: 응답을 기다리지 않고 목표 초당 요청 수에 맞춰 요청을 시작한다
+- 지연 시간은 예정 시각부터 잰다 (클라이언트가 밀려 늦게 보낸 시간도 지연에 포함)
+"""
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+# 요청 종류별 기본 비중
+DEFAULT_MIX = {"create": 1.0, "list_due": 2.0, "hint": 2.0, "review": 4.0, "retry": 1.0}
+# 결과 표의 엔드포인트 라벨
+ENDPOINTS = {
+    "create": "POST /cards",
+    "list_due": "GET /cards/due",
+    "hint": "GET /cards/{id}/hint",
+    "review": "POST /cards/{id}/review",
+    "retry": "POST /cards/{id}/review?retry",
+}
+
+WORD_CARDS = [("사과", "apple"), ("고양이", "cat"), ("바다", "ocean"), ("학교", "school"), ("시간", "time")]
+CONCEPT_CARDS = [
+    ("광합성", "식물이 빛 에너지로 이산화탄소와 물에서 포도당을 만드는 과정"),
+    ("관성", "물체가 외부 힘이 없으면 현재 운동 상태를 유지하려는 성질"),
+    ("삼투", "반투과성 막을 사이에 두고 농도가 낮은 쪽에서 높은 쪽으로 물이 이동하는 현상"),
+]
+
+@dataclass
+class _CardRef:
+    card_id: str
+    answer: str
+    card_type: str
+
+@dataclass
+class VirtualUser:
+    """사용자 한 명의 카드 / 재시도 대기 상태 (X-User-Id 샤드 하나)"""
+    user_id: str
+    cards: List[_CardRef] = field(default_factory=list)
+    retries: List[_CardRef] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"X-User-Id": self.user_id}
+
+class EndpointStats:
+    """엔드포인트별 지연 시간(초) / 상태 코드 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, latency: float, status: str) -> None:
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(latency)
+            counts = self.statuses.setdefault(endpoint, {})
+            counts[status] = counts.get(status, 0) + 1
+
+    def summary(self, duration_sec: float) -> Dict[str, Dict[str, object]]:
+        """엔드포인트별 처리량 / 오류율 / 지연 백분위 (ms)"""
+        with self._lock:
+            items = [(name, sorted(values), dict(self.statuses[name])) for name, values in self.latencies.items()]
+        result = {}
+        for name, values, statuses in sorted(items):
+            errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+            result[name] = {
+                "count": len(values),
+                "rps": round(len(values) / duration_sec, 2) if duration_sec > 0 else 0.0,
+                "error_rate": round(errors / len(values), 4),
+                "p50_ms": _percentile_ms(values, 50),
+                "p90_ms": _percentile_ms(values, 90),
+                "p99_ms": _percentile_ms(values, 99),
+                "max_ms": round(values[-1] * 1000, 1),
+                "statuses": statuses,
+            }
+        return result
+
+def _percentile_ms(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 백분위"""
+    rank = max(int(-(-len(sorted_values) * pct // 100)), 1)
+    return round(sorted_values[rank - 1] * 1000, 1)
+
+class LoadScenario:
+    """
+    가상 사용자 요청 생성기
+    - correct_ratio: 복습 제출 시 정답을 보내는 비율 (나머지는 오답 → 재시도 대기열)
+    - 카드가 없는 사용자는 먼저 카드를 만들고, 재시도할 카드가 없으면 일반 복습으로 대신한다
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        users: int,
+        mix: Optional[Dict[str, float]] = None,
+        correct_ratio: float = 0.6,
+        concept_ratio: float = 0.3,
+        seed: int = 0,
+    ):
+        self.client = client
+        self.mix = mix or DEFAULT_MIX
+        self.correct_ratio = correct_ratio
+        self.concept_ratio = concept_ratio
+        self.users = [VirtualUser(f"load-{i:04d}") for i in range(users)]
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._actions: Dict[str, Callable[[VirtualUser, random.Random], Tuple[str, httpx.Response]]] = {
+            "create": self._create,
+            "list_due": self._list_due,
+            "hint": self._hint,
+            "review": self._review,
+            "retry": self._retry,
+        }
+
+    def next_request(self) -> Tuple[VirtualUser, str, random.Random]:
+        """(사용자, 요청 종류, 요청 전용 난수) - 스케줄러 스레드에서만 호출"""
+        with self._rng_lock:
+            user = self._rng.choice(self.users)
+            names = list(self.mix)
+            action = self._rng.choices(names, weights=[self.mix[n] for n in names])[0]
+            return user, action, random.Random(self._rng.getrandbits(64))
+
+    def run(self, user: VirtualUser, action: str, rng: random.Random) -> Tuple[str, httpx.Response]:
+        """요청 하나 실행 → (엔드포인트 라벨, 응답)"""
+        with user.lock:
+            has_cards = bool(user.cards)
+        if not has_cards:
+            action = "create"
+        return self._actions[action](user, rng)
+
+    def seed_cards(self, per_user: int) -> None:
+        """측정 전에 사용자마다 카드 미리 생성"""
+        for user in self.users:
+            rng = random.Random(user.user_id)
+            for _ in range(per_user):
+                self._create(user, rng)
+
+    def _pick(self, user: VirtualUser, rng: random.Random) -> _CardRef:
+        with user.lock:
+            return rng.choice(user.cards)
+
+    def _create(self, user: VirtualUser, rng: random.Random) -> Tuple[str, httpx.Response]:
+        if rng.random() < self.concept_ratio:
+            concept, answer = rng.choice(CONCEPT_CARDS)
+            card_type = "concept"
+        else:
+            concept, answer = rng.choice(WORD_CARDS)
+            card_type = "word"
+        response = self.client.post(
+            "/cards",
+            json={"concept": f"{concept}-{uuid.uuid4().hex[:6]}", "answer": answer, "card_type": card_type},
+            headers=user.headers,
+        )
+        if response.status_code == 200:
+            with user.lock:
+                user.cards.append(_CardRef(response.json()["card_id"], answer, card_type))
+        return ENDPOINTS["create"], response
+
+    def _list_due(self, user: VirtualUser, rng: random.Random) -> Tuple[str, httpx.Response]:
+        return ENDPOINTS["list_due"], self.client.get("/cards/due", params={"test": "true"}, headers=user.headers)
+
+    def _hint(self, user: VirtualUser, rng: random.Random) -> Tuple[str, httpx.Response]:
+        card = self._pick(user, rng)
+        return ENDPOINTS["hint"], self.client.get(f"/cards/{card.card_id}/hint", headers=user.headers)
+
+    def _submit(self, user: VirtualUser, card: _CardRef, rng: random.Random, retry: bool) -> httpx.Response:
+        answer = card.answer if rng.random() < self.correct_ratio else f"모르겠음 {rng.randrange(1000)}"
+        response = self.client.post(
+            f"/cards/{card.card_id}/review",
+            params={"retry": "true"} if retry else None,
+            json={"user_answer": answer},
+            headers=user.headers | {"Idempotency-Key": uuid.uuid4().hex},
+        )
+        if response.status_code == 200 and response.json().get("retry_allowed"):
+            with user.lock:
+                user.retries.append(card)
+        return response
+
+    def _review(self, user: VirtualUser, rng: random.Random) -> Tuple[str, httpx.Response]:
+        return ENDPOINTS["review"], self._submit(user, self._pick(user, rng), rng, retry=False)
+
+    def _retry(self, user: VirtualUser, rng: random.Random) -> Tuple[str, httpx.Response]:
+        with user.lock:
+            card = user.retries.pop(0) if user.retries else None
+        if card is None:
+            return self._review(user, rng)
+        return ENDPOINTS["retry"], self._submit(user, card, rng, retry=True)
+
+@dataclass
+class LoadResult:
+    duration_sec: float
+    endpoints: Dict[str, Dict[str, object]]
+    scheduled: int
+    late_starts: int    # 예정 시각보다 100ms 넘게 늦게 시작한 요청 (클라이언트 포화)
+
+def run_load(scenario: LoadScenario, rate: float, duration_sec: float, concurrency: int,
+             warmup_sec: float = 0.0, poisson: bool = True) -> LoadResult:
+    """
+    rate(초당 요청 수)로 duration_sec 동안 요청 시작 - warmup_sec 동안의 요청은 집계에서 뺀다
+    - concurrency: 동시에 진행할 수 있는 요청 수 (모자라면 시작이 늦어지고 그만큼 지연에 반영)
+    """
+    stats = EndpointStats()
+    arrivals = random.Random(1)
+    late = [0]
+    late_lock = threading.Lock()
+    start = time.perf_counter()
+    measure_from = start + warmup_sec
+    end = measure_from + duration_sec
+
+    def execute(scheduled_at: float, user: VirtualUser, action: str, rng: random.Random) -> None:
+        began = time.perf_counter()
+        try:
+            endpoint, response = scenario.run(user, action, rng)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            endpoint, status = ENDPOINTS[action], type(e).__name__
+        finished = time.perf_counter()
+        if scheduled_at < measure_from:
+            return
+        if began - scheduled_at > 0.1:
+            with late_lock:
+                late[0] += 1
+        stats.record(endpoint, finished - scheduled_at, status)
+
+    scheduled = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as pool:
+        next_at = start
+        while next_at < end:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            user, action, rng = scenario.next_request()
+            pool.submit(execute, next_at, user, action, rng)
+            if next_at >= measure_from:
+                scheduled += 1
+            next_at += arrivals.expovariate(rate) if poisson else 1.0 / rate
+    return LoadResult(duration_sec, stats.summary(duration_sec), scheduled, late[0])
+
+def format_report(result: LoadResult) -> str:
+    """엔드포인트별 결과 표"""
+    header = f"{'endpoint':<32}{'count':>7}{'rps':>8}{'err%':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  statuses"
+    lines = [header, "-" * len(header)]
+    total = 0
+    for name, row in result.endpoints.items():
+        total += row["count"]
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(row["statuses"].items()))
+        lines.append(
+            f"{name:<32}{row['count']:>7}{row['rps']:>8}{row['error_rate'] * 100:>6.1f}%"
+            f"{row['p50_ms']:>9}{row['p90_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}  {statuses}"
+        )
+    lines.append("-" * len(header))
+    lines.append(
+        f"total {total} requests in {result.duration_sec:.0f}s ({total / result.duration_sec:.2f} req/s), "
+        f"scheduled {result.scheduled}, late starts {result.late_starts} (latency in ms from scheduled start)"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,38 @@
+# backend/loadtest/stub_embedder.py
+import zlib
+from typing import List, Union
+
+import numpy as np
+
+class StubEmbedder:
+    """
+    부하 테스트용 해시 임베더 - SentenceTransformer.encode와 같은 모양의 결과를 모델 없이 반환
+    - 글자 1-gram / 2-gram을 해시해 고정 차원 벡터에 더한다 (같은 글자가 많을수록 유사도가 높다)
+    - 채점 품질은 의미 없지만 같은 문장은 항상 같은 벡터라 정답/오답 흐름은 재현된다
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        text = " ".join(text.split())
+        grams = list(text) + [text[i:i + 2] for i in range(len(text) - 1)]
+        for gram in grams:
+            vec[zlib.crc32(gram.encode("utf-8")) % self.dim] += 1.0
+        if not grams:
+            vec[0] = 1.0
+        return vec
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        matrix = np.stack([self._vector(s) for s in ([sentences] if single else sentences)])
+        if normalize_embeddings:
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix[0] if single else matrix
@@ -1,4 +1,5 @@
 """메인 실행 파일"""
+import os
 import time
 from typing import Dict, Any
 
@@ -8,23 +9,43 @@ from services.card_service import CardService
 from services.review_service import ReviewService
 from services.schedule_service import ScheduleService
 from storage.memory_storage import MemoryCardStorage
+from storage.snapshot import SnapshotError, SnapshotScheduler
 from ui.console_ui import ConsoleUI
-from utils.validators import InputValidator
+from utils.validators import CardValidator
 
 class MemorizationSystemApp:
     """암기 시스템 메인 애플리케이션 - 의존성 주입을 통한 DIP 준수"""
     
     def __init__(self):
+        self.config = SystemConfig.default()
         self.storage = MemoryCardStorage()
+        self._restore_snapshot()
+        self.snapshots = SnapshotScheduler(
+            self.storage, self.config.snapshot.path, self.config.snapshot.interval_sec
+        )
         self.card_service = CardService(self.storage)
-        self.review_service = ReviewService(self.card_service, ScheduleService())
-        self.llm_service = LLMService()
+        self.llm_service = LLMService(self.config.llm)
+        self.review_service = ReviewService(
+            self.llm_service, self.card_service, ScheduleService(self.config.schedule), self.config.review
+        )
         self.ui = ConsoleUI(self.card_service, self.review_service, self.llm_service)
-        self.validator = InputValidator()
+        self.validator = CardValidator()
+
+    def _restore_snapshot(self) -> None:
+        """이전 실행의 스냅샷이 있으면 복원"""
+        path = self.config.snapshot.path
+        if not os.path.exists(path):
+            return
+        try:
+            count = self.storage.load_snapshot(path)
+            print(f"💾 스냅샷에서 카드 {count}개를 복원했습니다.")
+        except (SnapshotError, OSError) as e:
+            print(f"⚠️ 스냅샷을 불러오지 못했습니다: {e}")
 
     def run(self) -> None:
         """애플리케이션 실행"""
         self.ui.show_welcome_message()
+        self.snapshots.start()
         while True:
             choice = self.ui.prompt_main_menu()
             if choice == "1":
@@ -34,21 +55,28 @@ class MemorizationSystemApp:
             elif choice == "3":
                 self.ui.handle_view_stats()
             elif choice == "4":
-                self._exit_system()
+                if self._exit_system():
+                    break
             else:
                 self.ui.show_message("잘못된 선택입니다. 다시 시도해주세요.")
 
-    def _exit_system(self) -> None:
-        """시스템 종료"""
+    def _exit_system(self) -> bool:
+        """시스템 종료 (종료 전 마지막 스냅샷 저장)"""
         if self.ui.confirm_action("정말 종료하시겠습니까?"):
+            self.snapshots.stop()
+            self.llm_service.close()
             self.ui.show_message("🙏 암기 시스템을 이용해주셔서 감사합니다!")
-        else:
-            return
+            return True
+        return False
 
 def main():
     """메인 함수"""
     app = MemorizationSystemApp()
-    app.run()
+    try:
+        app.run()
+    except KeyboardInterrupt:
+        app.snapshots.stop()
+        app.llm_service.close()
 
 if __name__ == "__main__":
     main()
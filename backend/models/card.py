@@ -1,12 +1,14 @@
 """암기 카드 모델"""
 import datetime
+from collections.abc import MutableSequence
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Optional
 from uuid import uuid4
 
 from .review import ReviewRecord
+from .review_history import ReviewHistory
 
-@dataclass
+@dataclass(slots=True)
 class MemorizationCard:
     """암기 카드 모델 - SRP(단일 책임 원칙) 준수"""
     concept: str
@@ -15,7 +17,13 @@ class MemorizationCard:
     card_id: str = field(default_factory=lambda: str(uuid4()))
     stage: int = 1
     next_review: datetime.datetime = field(default_factory=lambda: datetime.datetime.now())
-    review_history: List[ReviewRecord] = field(default_factory=list)
+    # 기본은 배열 기반 ReviewHistory, 일반 list를 넣어도 동작
+    review_history: MutableSequence[ReviewRecord] = field(default_factory=ReviewHistory)
+    # 낙관적 잠금 버전 (저장소가 저장할 때마다 증가, 0이면 아직 저장 안 됨)
+    version: int = 0
+    # 보관소로 옮겨진 오래된 복습 기록 수 / 그중 정답 수 (review_history에는 최근 기록만 남는다)
+    archived_reviews: int = 0
+    archived_correct: int = 0
 
     def promote_stage(self) -> bool:
         """단계 진급 (4단계 초과시 False 반환)"""
@@ -37,8 +45,12 @@ class MemorizationCard:
         return datetime.datetime.now() >= self.next_review
     
     def get_success_rate(self) -> float:
-        """성공률 계산"""
-        if not self.review_history:
+        """성공률 계산 (보관된 기록 포함)"""
+        total = self.archived_reviews + len(self.review_history)
+        if not total:
             return 0.0
-        correct_count = sum(1 for record in self.review_history if record.is_correct)
-        return correct_count / len(self.review_history) * 100
+        if isinstance(self.review_history, ReviewHistory):
+            correct_count = self.review_history.correct_count()
+        else:
+            correct_count = sum(1 for record in self.review_history if record.is_correct)
+        return (self.archived_correct + correct_count) / total * 100
@@ -1,21 +1,34 @@
 """리뷰 기록 모델"""
 import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ReviewRecord:
-    """리뷰 기록 모델 - SRP(단일 책임 원칙) 준수"""
+    """
+    리뷰 기록 모델 - SRP(단일 책임 원칙) 준수
+    불변 값 객체: 이력의 기록을 고치려면 dataclasses.replace로 새 기록을 만들어 history[i]에 대입
+    """
     stage: int
     user_answer: str
     is_correct: bool
     feedback: str = ""
-    timestamp: datetime.datetime = datetime.datetime.now()
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
     
     def __str__(self) -> str:
         result = "정답" if self.is_correct else "오답"
         return f"[{self.timestamp.strftime('%Y-%m-%d %H:%M')}] 단계{self.stage}: {result}"
 
-@dataclass
+@dataclass(slots=True)
+class ReviewEvent:
+    """복습 한 건 요약 - 통계 롤업 갱신용"""
+    card_type: str
+    stage: int              # 채점 시점 단계
+    is_correct: bool
+    promoted: bool = False
+    reset: bool = False
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+
+@dataclass(slots=True)
 class ReviewQuestion:
     """복습 문제 모델"""
     concept: str
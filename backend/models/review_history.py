@@ -0,0 +1,146 @@
+"""컬럼형 복습 이력 - 기록마다 객체를 두지 않고 배열에 나눠 저장"""
+import datetime
+from array import array
+from collections.abc import MutableSequence
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .review import ReviewRecord
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+def to_epoch_us(moment: datetime.datetime) -> int:
+    """naive 로컬 시각 기준 epoch 마이크로초 (fromtimestamp와 달리 DST에도 정확히 왕복)"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - _EPOCH) // _MICROSECOND
+
+def from_epoch_us(value: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+class ReviewHistory(MutableSequence):
+    """
+    list[ReviewRecord]처럼 쓰는 배열 기반 이력
+    - timestamp: int64 epoch 마이크로초, stage: int8, is_correct: 비트셋
+    - 피드백 문자열은 중복이 많아 같은 값은 한 객체만 보관
+    - 인덱싱/순회 시 ReviewRecord(불변)를 그때그때 만들어 반환 - 기록 수정은 __setitem__으로만
+    """
+
+    __slots__ = ("_timestamps", "_stages", "_correct", "_answers", "_feedbacks", "_feedback_pool")
+
+    def __init__(self, records: Iterable[ReviewRecord] = ()):
+        self._timestamps = array("q")
+        self._stages = array("b")
+        self._correct = bytearray()
+        self._answers: List[str] = []
+        self._feedbacks: List[str] = []
+        self._feedback_pool: Dict[str, str] = {}
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def _record(self, i: int) -> ReviewRecord:
+        return ReviewRecord(
+            stage=self._stages[i],
+            user_answer=self._answers[i],
+            is_correct=bool(self._correct[i >> 3] & (1 << (i & 7))),
+            feedback=self._feedbacks[i],
+            timestamp=from_epoch_us(self._timestamps[i]),
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("review history index out of range")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[ReviewRecord]:
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def append(self, record: ReviewRecord) -> None:
+        i = len(self)
+        self._timestamps.append(to_epoch_us(record.timestamp))
+        self._stages.append(record.stage)
+        if i & 7 == 0:
+            self._correct.append(0)
+        if record.is_correct:
+            self._correct[i >> 3] |= 1 << (i & 7)
+        self._answers.append(record.user_answer)
+        feedback = record.feedback or ""
+        self._feedbacks.append(self._feedback_pool.setdefault(feedback, feedback))
+
+    def _rebuild(self, records: List[ReviewRecord]) -> None:
+        self.__init__(records)
+
+    def __setitem__(self, index, value) -> None:
+        records = list(self)
+        records[index] = value
+        self._rebuild(records)
+
+    def __delitem__(self, index) -> None:
+        records = list(self)
+        del records[index]
+        self._rebuild(records)
+
+    def insert(self, index: int, record: ReviewRecord) -> None:
+        if index >= len(self):
+            self.append(record)
+            return
+        records = list(self)
+        records.insert(index, record)
+        self._rebuild(records)
+
+    def clear(self) -> None:
+        self._rebuild([])
+
+    def to_columns(self) -> Tuple[array, array, bytearray, List[str], List[str]]:
+        """내부 컬럼 (timestamps, stages, correct 비트셋, answers, feedbacks) - 스냅샷 저장용, 복사하지 않음"""
+        return self._timestamps, self._stages, self._correct, self._answers, self._feedbacks
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamps: array,
+        stages: array,
+        correct: bytearray,
+        answers: List[str],
+        feedbacks: List[str]
+    ) -> "ReviewHistory":
+        """to_columns 결과로 복원 (레코드 객체를 만들지 않는다)"""
+        if not len(timestamps) == len(stages) == len(answers) == len(feedbacks):
+            raise ValueError("review history columns must have the same length")
+        history = cls()
+        history._timestamps = timestamps
+        history._stages = stages
+        history._correct = correct
+        history._answers = answers
+        history._feedbacks = [history._feedback_pool.setdefault(f, f) for f in feedbacks]
+        return history
+
+    def copy(self) -> "ReviewHistory":
+        """독립된 복사본 (컬럼 배열만 복사, 레코드 객체를 만들지 않는다)"""
+        return ReviewHistory.from_columns(
+            array("q", self._timestamps),
+            array("b", self._stages),
+            bytearray(self._correct),
+            list(self._answers),
+            self._feedbacks,
+        )
+
+    def correct_count(self) -> int:
+        """정답 수 (비트셋 popcount)"""
+        return sum(bin(byte).count("1") for byte in self._correct)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ReviewHistory, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ReviewHistory({list(self)!r})"
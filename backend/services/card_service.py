@@ -1,7 +1,10 @@
 """카드 관리 서비스"""
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 from interfaces.storage_interface import ICardStorage
 from models.card import MemorizationCard
+from models.review import ReviewEvent
+from services.schedule_service import bucket_key
 from utils.validators import CardValidator
 
 class CardService:
@@ -43,19 +46,67 @@ class CardService:
         """복습 예정 카드 조회"""
         return self.storage.get_due_cards()
 
-    def get_stats(self) -> dict:
-        """통계 조회"""
-        cards = self.get_all_cards()
-        stage_counts = {}
-        total_success_rate = 0
-        
-        for card in cards:
-            stage_counts[card.stage] = stage_counts.get(card.stage, 0) + 1
-            total_success_rate += card.get_success_rate()
-        
-        return {
-            "total": len(cards),
-            "by_stage": stage_counts,
-            "average_success_rate": total_success_rate / len(cards) if cards else 0,
-            "due_count": len(self.get_due_cards())
-        }
+    def query_cards(
+        self,
+        card_type: Optional[str] = None,
+        stage: Optional[int] = None,
+        due: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor_id: Optional[str] = None,
+    ) -> List[MemorizationCard]:
+        """필터 + 커서 기반 카드 목록 조회"""
+        if card_type is not None:
+            self.validator.validate_card_type(card_type)
+        return self.storage.query_cards(card_type, stage, due, prefix, limit, cursor_id)
+
+    def search_cards(self, query: str, limit: int = 20, offset: int = 0) -> List[MemorizationCard]:
+        """카드 검색 (concept/answer)"""
+        query = query.strip()
+        if not query:
+            raise ValueError("검색어는 비어있을 수 없습니다.")
+        if len(query) > 100:
+            raise ValueError("검색어는 100자 이내여야 합니다.")
+        return self.storage.search_cards(query, limit, offset)
+
+    def count_due_by_bucket(self, start: datetime, end: datetime, bucket: str = "day") -> Dict[str, int]:
+        """구간 복습 예정 카드 수 (스케줄 부하 분산용)"""
+        return self.storage.count_due_by_bucket(start, end, bucket)
+
+    def get_due_forecast(self, days: int, bucket: str = "day") -> dict:
+        """
+        앞으로 days일 동안 버킷(hour/day)별 복습 예정 카드 수
+        - 이미 지난 카드는 overdue로 따로 집계, 빈 버킷은 0으로 채운다
+        """
+        if bucket not in ("hour", "day"):
+            raise ValueError("bucket은 'hour' 또는 'day'이어야 합니다.")
+        now = datetime.now()
+        step = timedelta(hours=1) if bucket == "hour" else timedelta(days=1)
+        start = now.replace(minute=0, second=0, microsecond=0)
+        if bucket == "day":
+            start = start.replace(hour=0)
+        end = now + timedelta(days=days)
+        counts = self.storage.count_due_by_bucket(now, end, bucket, include_overdue=True)
+
+        buckets = []
+        moment = start
+        while moment < end:
+            buckets.append({"start": moment, "count": counts.get(bucket_key(moment, bucket), 0)})
+            moment += step
+        return {"bucket": bucket, "overdue": counts.get("overdue", 0), "buckets": buckets}
+
+    def get_change_counter(self) -> int:
+        """덱 변경 카운터"""
+        return self.storage.get_change_counter()
+
+    def record_review(self, card: MemorizationCard, event: ReviewEvent) -> None:
+        """복습 결과 저장 (카드 + 통계 롤업)"""
+        self.validator.validate_concept(card.concept)
+        self.validator.validate_answer(card.answer)
+        self.storage.save_review(card, event)
+
+    def get_stats(self, days: int = 30) -> dict:
+        """통계 조회 - 저장소 집계/롤업 사용 (카드 이력을 전부 읽지 않음)"""
+        if days < 1:
+            raise ValueError("days는 1 이상이어야 합니다.")
+        return self.storage.get_stats(days)
@@ -0,0 +1,91 @@
+# backend/services/concept_graph_service.py
+import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import ConceptGraphConfig
+from interfaces.llm_interface import ILLMService
+from services.llm_dispatcher import LLMOverloadedError
+from storage.concept_graph_storage import SQLiteConceptGraph, concept_key
+from utils.metrics import record_cache
+from utils.singleflight import SingleFlight
+
+class ConceptGraphService:
+    """
+    연관 개념 / 심화 문제를 개념 그래프에 저장해 재사용
+    - 저장된 결과가 max_age보다 오래됐거나 refresh 요청 시에만 LLM으로 다시 생성
+    - 같은 개념을 동시에 생성하는 요청은 하나로 합친다
+    - 재생성이 LLM 과부하로 거절되면 오래된 결과라도 반환
+    """
+
+    def __init__(self, graph: SQLiteConceptGraph, llm_service: ILLMService, config: ConceptGraphConfig | None = None):
+        self.graph = graph
+        self.llm_service = llm_service
+        self.cfg = config or ConceptGraphConfig()
+        self._flights = SingleFlight()
+
+    def _is_fresh(self, generated_at: Optional[datetime.datetime]) -> bool:
+        return generated_at is not None and datetime.datetime.now() - generated_at < self.cfg.max_age
+
+    def _cached(
+        self,
+        kind: str,
+        concept: str,
+        refresh: bool,
+        load: Callable[[str], Tuple[List[str], Optional[datetime.datetime]]],
+        generate: Callable[[str], List[str]],
+        store: Callable[[str, List[str]], None],
+    ) -> List[str]:
+        stored, generated_at = load(concept)
+        fresh = not refresh and self._is_fresh(generated_at)
+        record_cache(f"concept_{kind}", fresh)
+        if fresh:
+            return stored
+
+        def regenerate() -> List[str]:
+            values = generate(concept)
+            store(concept, values)
+            return values
+
+        try:
+            values, _ = self._flights.do((kind, concept_key(concept)), regenerate)
+        except LLMOverloadedError:
+            if generated_at is None:
+                raise
+            return stored
+        return values
+
+    def related_concepts(self, concept: str, refresh: bool = False) -> List[str]:
+        return self._cached(
+            "related", concept, refresh,
+            self.graph.get_related,
+            lambda c: self.llm_service.generate_related_concepts(c, self.cfg.related_k),
+            self.graph.set_related,
+        )
+
+    def advanced_questions(self, concept: str, refresh: bool = False) -> List[str]:
+        return self._cached(
+            "questions", concept, refresh,
+            self.graph.get_questions,
+            lambda c: self.llm_service.generate_advanced_questions(c, self.cfg.questions_n),
+            self.graph.set_questions,
+        )
+
+    def link_card(self, user_id: str, deck_id: str, card_id: str, concept: str) -> None:
+        self.graph.link_card(user_id, deck_id, card_id, concept)
+
+    def card_questions(self, user_id: str, deck_id: str, card_id: str) -> Optional[Dict[str, object]]:
+        """카드에 연결된 개념의 저장된 심화 문제 (LLM 호출 없음, 연결 없으면 None)"""
+        concept = self.graph.get_card_concept(user_id, deck_id, card_id)
+        if concept is None:
+            return None
+        questions, generated_at = self.graph.get_questions(concept)
+        return {"concept": concept, "questions": questions, "generated_at": generated_at}
+
+    def neighbors(self, concept: str, hops: int = 1, limit: int | None = None) -> Dict[str, list]:
+        """k-hop 이웃 그래프 (저장된 간선만 사용)"""
+        if not concept.strip():
+            raise ValueError("개념은 비어있을 수 없습니다.")
+        if not 1 <= hops <= self.cfg.max_hops:
+            raise ValueError(f"hops는 1~{self.cfg.max_hops} 사이여야 합니다.")
+        limit = min(limit or self.cfg.max_nodes, self.cfg.max_nodes)
+        return self.graph.neighbors(concept, hops, limit)
@@ -0,0 +1,360 @@
+# backend/services/embedding_sidecar.py
+"""
+임베딩 사이드카 - 모델 한 벌을 여러 API 워커가 Unix 도메인 소켓으로 공유
+
+프레임 (리틀 엔디언)
+  요청: MAGIC "EMBQ" | op u8 | flags u8 | reserved u16 | payload_len u32 | payload
+        ATTACH  payload = 공유 메모리 이름 (utf-8) - 연결마다 한 번, 결과 버퍼 등록
+        ENCODE  payload = count u32 | (len u32 | utf-8)*count, flags bit0 = 정규화
+  응답: MAGIC "EMBR" | status u8 | where u8 | reserved u16 | rows u32 | dim u32 | payload_len u32 | payload
+        where = SHARED면 결과(float32 rows x dim)는 클라이언트 공유 메모리 앞부분에 있고 payload는 비어 있음
+        버퍼보다 큰 결과는 INLINE(payload에 그대로), 오류는 status = ERROR, payload = 메시지
+
+공유 메모리 버퍼는 클라이언트가 만들고 지운다 (서버는 붙기만 함)
+"""
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+STUB_EMBEDDER = "stub"
+
+MAGIC_REQUEST = b"EMBQ"
+MAGIC_RESPONSE = b"EMBR"
+_REQUEST = struct.Struct("<4sBBHI")
+_RESPONSE = struct.Struct("<4sBBHIII")
+_U32 = struct.Struct("<I")
+
+OP_ATTACH = 1
+OP_ENCODE = 2
+FLAG_NORMALIZE = 1
+STATUS_OK = 0
+STATUS_ERROR = 1
+WHERE_SHARED = 0
+WHERE_INLINE = 1
+
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+class EmbeddingSidecarError(RuntimeError):
+    """사이드카 연결 실패 / 오류 응답"""
+
+def load_embedder(name: str):
+    """임베더 생성 - STUB_EMBEDDER면 채점 품질 대신 속도만 재현하는 해시 임베더"""
+    if name == STUB_EMBEDDER:
+        from loadtest.stub_embedder import StubEmbedder
+        return StubEmbedder()
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("embedding sidecar connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def _attach_shared(name: str) -> shared_memory.SharedMemory:
+    """클라이언트가 만든 공유 메모리에 붙기 - 서버 종료 시 resource_tracker가 지우지 않도록 추적 해제"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+def _encode_texts(texts: List[str]) -> bytes:
+    parts = [_U32.pack(len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_U32.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+def _decode_texts(payload: bytes) -> List[str]:
+    (count,) = _U32.unpack_from(payload, 0)
+    offset = _U32.size
+    texts = []
+    for _ in range(count):
+        (size,) = _U32.unpack_from(payload, offset)
+        offset += _U32.size
+        texts.append(payload[offset:offset + size].decode("utf-8"))
+        offset += size
+    return texts
+
+class _Job:
+    __slots__ = ("texts", "normalize", "done", "result", "error")
+
+    def __init__(self, texts: List[str], normalize: bool):
+        self.texts = texts
+        self.normalize = normalize
+        self.done = threading.Event()
+        self.result: Optional[np.ndarray] = None
+        self.error: Optional[str] = None
+
+class _SidecarHandler(socketserver.BaseRequestHandler):
+    server: "EmbeddingSidecar"
+
+    def handle(self):
+        sock: socket.socket = self.request
+        shm: Optional[shared_memory.SharedMemory] = None
+        try:
+            while True:
+                try:
+                    magic, op, flags, _, length = _REQUEST.unpack(_recv_exact(sock, _REQUEST.size))
+                except ConnectionError:
+                    return
+                if magic != MAGIC_REQUEST or length > MAX_PAYLOAD:
+                    return
+                payload = _recv_exact(sock, length)
+                if op == OP_ATTACH:
+                    if shm is not None:
+                        shm.close()
+                    shm = _attach_shared(payload.decode("utf-8"))
+                    sock.sendall(_RESPONSE.pack(MAGIC_RESPONSE, STATUS_OK, WHERE_INLINE, 0, 0, 0, 0))
+                elif op == OP_ENCODE:
+                    self._encode(sock, shm, _decode_texts(payload), bool(flags & FLAG_NORMALIZE))
+                else:
+                    self._send_error(sock, f"unknown op {op}")
+        finally:
+            if shm is not None:
+                shm.close()
+
+    def _send_error(self, sock: socket.socket, message: str) -> None:
+        data = message.encode("utf-8")
+        sock.sendall(_RESPONSE.pack(MAGIC_RESPONSE, STATUS_ERROR, WHERE_INLINE, 0, 0, 0, len(data)) + data)
+
+    def _encode(self, sock: socket.socket, shm, texts: List[str], normalize: bool) -> None:
+        job = _Job(texts, normalize)
+        self.server.submit(job)
+        job.done.wait()
+        if job.error is not None:
+            self._send_error(sock, job.error)
+            return
+        matrix = np.ascontiguousarray(job.result, dtype=np.float32)
+        rows, dim = matrix.shape
+        if shm is not None and matrix.nbytes <= shm.size:
+            shm.buf[:matrix.nbytes] = matrix.tobytes()
+            sock.sendall(_RESPONSE.pack(MAGIC_RESPONSE, STATUS_OK, WHERE_SHARED, 0, rows, dim, 0))
+        else:
+            data = matrix.tobytes()
+            sock.sendall(_RESPONSE.pack(MAGIC_RESPONSE, STATUS_OK, WHERE_INLINE, 0, rows, dim, len(data)) + data)
+
+class EmbeddingSidecar(socketserver.ThreadingUnixStreamServer):
+    """
+    임베딩 사이드카 서버
+    - 연결마다 스레드 하나가 요청을 읽고, 인코딩 스레드 하나가 여러 연결의 요청을 모아 한 번에 encode
+    - 모으기: 첫 요청 후 max_wait_ms 동안 또는 max_batch_texts개까지 (같은 문장은 한 번만 인코딩)
+    """
+    daemon_threads = True
+
+    def __init__(self, embedder, socket_path: str, max_batch_texts: int = 128, max_wait_ms: float = 5.0,
+                 encode_batch_size: int = 64):
+        self.embedder = embedder
+        self.socket_path = socket_path
+        self.max_batch_texts = max_batch_texts
+        self.max_wait_sec = max_wait_ms / 1000
+        self.encode_batch_size = encode_batch_size
+        self.stats: Dict[str, int] = {"requests": 0, "batches": 0, "texts": 0, "encoded": 0}
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._remove_stale_socket(socket_path)
+        super().__init__(socket_path, _SidecarHandler)
+        os.chmod(socket_path, 0o660)
+        self._encoder = threading.Thread(target=self._encode_loop, name="embed-batcher", daemon=True)
+        self._encoder.start()
+
+    @staticmethod
+    def _remove_stale_socket(path: str) -> None:
+        """이전 실행이 남긴 소켓 파일 정리 (다른 사이드카가 살아 있으면 오류)"""
+        if not os.path.exists(path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+        finally:
+            probe.close()
+        raise EmbeddingSidecarError(f"embedding sidecar already running at {path}")
+
+    def submit(self, job: _Job) -> None:
+        self._jobs.put(job)
+
+    def _collect(self) -> List[_Job]:
+        job = self._jobs.get()
+        if job is None:
+            return []
+        jobs, count = [job], len(job.texts)
+        deadline = time.monotonic() + self.max_wait_sec
+        while count < self.max_batch_texts:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._jobs.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                self._jobs.put(None)
+                break
+            jobs.append(job)
+            count += len(job.texts)
+        return jobs
+
+    def _encode_loop(self) -> None:
+        while True:
+            jobs = self._collect()
+            if not jobs:
+                return
+            unique = list(dict.fromkeys(text for job in jobs for text in job.texts))
+            try:
+                matrix = np.asarray(
+                    self.embedder.encode(unique, batch_size=self.encode_batch_size), dtype=np.float32
+                ) if unique else None
+            except Exception as e:
+                for job in jobs:
+                    job.error = f"encode failed: {e}"
+                    job.done.set()
+                continue
+            index = {text: i for i, text in enumerate(unique)}
+            for job in jobs:
+                if matrix is None or not job.texts:
+                    job.result = np.zeros((0, matrix.shape[1] if matrix is not None else 0), dtype=np.float32)
+                else:
+                    rows = matrix[[index[text] for text in job.texts]]
+                    if job.normalize:
+                        rows = rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-12)
+                    job.result = rows
+                job.done.set()
+            self.stats["requests"] += len(jobs)
+            self.stats["batches"] += 1
+            self.stats["texts"] += sum(len(job.texts) for job in jobs)
+            self.stats["encoded"] += len(unique)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._jobs.put(None)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+class _Connection:
+    """사이드카 연결 하나 + 결과를 받을 공유 메모리 버퍼"""
+
+    def __init__(self, socket_path: str, buffer_bytes: int, timeout_sec: float):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout_sec)
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        try:
+            self.sock.connect(socket_path)
+            self.shm = shared_memory.SharedMemory(create=True, size=buffer_bytes)
+            self._request(OP_ATTACH, 0, self.shm.name.encode("utf-8"))
+        except BaseException:
+            self.close()
+            raise
+
+    def _request(self, op: int, flags: int, payload: bytes):
+        self.sock.sendall(_REQUEST.pack(MAGIC_REQUEST, op, flags, 0, len(payload)) + payload)
+        magic, status, where, _, rows, dim, length = _RESPONSE.unpack(_recv_exact(self.sock, _RESPONSE.size))
+        if magic != MAGIC_RESPONSE:
+            raise ConnectionError("invalid embedding sidecar response")
+        data = _recv_exact(self.sock, length) if length else b""
+        if status != STATUS_OK:
+            raise EmbeddingSidecarError(data.decode("utf-8", "replace"))
+        return where, rows, dim, data
+
+    def encode(self, texts: List[str], normalize: bool) -> np.ndarray:
+        where, rows, dim, data = self._request(
+            OP_ENCODE, FLAG_NORMALIZE if normalize else 0, _encode_texts(texts)
+        )
+        if where == WHERE_SHARED:
+            # 버퍼는 다음 요청에 덮어쓰이므로 복사해서 반환
+            return np.frombuffer(self.shm.buf, dtype=np.float32, count=rows * dim).reshape(rows, dim).copy()
+        return np.frombuffer(data, dtype=np.float32).reshape(rows, dim)
+
+    def close(self) -> None:
+        self.sock.close()
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+class EmbeddingClient:
+    """
+    사이드카 클라이언트 - SentenceTransformer.encode와 같은 모양으로 호출
+    - 스레드끼리 연결을 나눠 쓰는 풀 (연결마다 공유 메모리 버퍼)
+    - 연결이 끊기면(사이드카 재시작) 새 연결로 한 번 재시도
+    """
+
+    def __init__(self, socket_path: str, max_connections: int = 4, buffer_bytes: int = 1 << 20,
+                 timeout_sec: float = 30.0):
+        self.socket_path = socket_path
+        self.buffer_bytes = buffer_bytes
+        self.timeout_sec = timeout_sec
+        self._idle: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _connect(self) -> _Connection:
+        try:
+            return _Connection(self.socket_path, self.buffer_bytes, self.timeout_sec)
+        except OSError as e:
+            raise EmbeddingSidecarError(f"cannot connect to embedding sidecar at {self.socket_path}: {e}") from e
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else [str(s) for s in sentences]
+        with self._slots:
+            for attempt in range(2):
+                conn = self._checkout(fresh=attempt > 0)
+                try:
+                    matrix = conn.encode(texts, normalize_embeddings)
+                except EmbeddingSidecarError:
+                    # 오류 응답 후에도 연결은 정상
+                    self._idle.put(conn)
+                    raise
+                except TimeoutError as e:
+                    conn.close()
+                    raise EmbeddingSidecarError(f"embedding sidecar timed out after {self.timeout_sec}s") from e
+                except (OSError, ConnectionError) as e:
+                    # 사이드카가 재시작됐으면 쉬고 있던 연결도 모두 끊긴 상태
+                    conn.close()
+                    self.close()
+                    if attempt:
+                        raise EmbeddingSidecarError(f"embedding sidecar request failed: {e}") from e
+                    continue
+                except BaseException:
+                    conn.close()
+                    raise
+                self._idle.put(conn)
+                return matrix[0] if single else matrix
+
+    def _checkout(self, fresh: bool) -> _Connection:
+        if not fresh:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+        return self._connect()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,76 @@
+# backend/services/feedback_cache.py
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from utils.metrics import record_cache
+
+class _CardFeedback:
+    """카드 한 장의 오답 피드백 목록 (앞쪽이 오래 안 쓰인 것)"""
+    __slots__ = ("answer", "vectors", "feedbacks")
+
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.vectors: List[np.ndarray] = []
+        self.feedbacks: List[str] = []
+
+class SemanticFeedbackCache:
+    """
+    카드별 오답 피드백 의미 캐시 - 비슷한 오답(임베딩 코사인 거리 max_distance 이내)에는 저장된 피드백 재사용
+    - 벡터는 정규화된 임베딩 (거리 = 1 - 내적)
+    - 카드 수 / 카드당 항목 수 모두 LRU로 제한
+    - 항목은 만들 때의 정답 텍스트와 묶여 있어 카드 정답이 바뀌면 자동으로 버려진다
+    """
+
+    def __init__(self, max_distance: float, max_entries_per_card: int, max_cards: int):
+        self.max_distance = max_distance
+        self.max_entries_per_card = max_entries_per_card
+        self.max_cards = max_cards
+        self._cards: "OrderedDict[str, _CardFeedback]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, card_id: str, answer: str, vector) -> Optional[str]:
+        """가장 가까운 저장 오답이 임계 거리 이내면 그 피드백 반환"""
+        vector = np.asarray(vector, dtype=np.float32)
+        feedback = None
+        with self._lock:
+            entry = self._cards.get(card_id)
+            if entry is not None and entry.answer != answer:
+                del self._cards[card_id]
+                entry = None
+            if entry is not None and entry.vectors:
+                self._cards.move_to_end(card_id)
+                similarities = np.stack(entry.vectors) @ vector
+                best = int(np.argmax(similarities))
+                if 1.0 - float(similarities[best]) <= self.max_distance:
+                    # 적중 항목은 LRU 맨 뒤로
+                    entry.vectors.append(entry.vectors.pop(best))
+                    entry.feedbacks.append(entry.feedbacks.pop(best))
+                    feedback = entry.feedbacks[-1]
+        record_cache("wrong_feedback", feedback is not None)
+        return feedback
+
+    def store(self, card_id: str, answer: str, vector, feedback: str) -> None:
+        with self._lock:
+            entry = self._cards.get(card_id)
+            if entry is None or entry.answer != answer:
+                entry = self._cards[card_id] = _CardFeedback(answer)
+            self._cards.move_to_end(card_id)
+            entry.vectors.append(np.asarray(vector, dtype=np.float32))
+            entry.feedbacks.append(feedback)
+            if len(entry.vectors) > self.max_entries_per_card:
+                del entry.vectors[0]
+                del entry.feedbacks[0]
+            while len(self._cards) > self.max_cards:
+                self._cards.popitem(last=False)
+
+    def invalidate(self, card_id: str) -> None:
+        """카드 수정/삭제 시 호출"""
+        with self._lock:
+            self._cards.pop(card_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entry.vectors) for entry in self._cards.values())
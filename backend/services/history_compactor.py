@@ -0,0 +1,66 @@
+# backend/services/history_compactor.py
+import datetime
+import threading
+from typing import Optional
+
+from config.settings import RetentionConfig
+from storage.shard_router import SQLiteShardRouter
+from utils.metrics import HISTORY_ARCHIVED, BACKGROUND_JOB_ERRORS
+
+class HistoryCompactor:
+    """
+    복습 이력 압축 작업 - 주기적으로 모든 사용자 샤드 / 덱을 돌며 오래된 기록을 보관 테이블로 옮긴다
+    - 카드 단위 짧은 트랜잭션 + 버전 CAS라 서비스 중에 실행해도 복습 저장과 충돌하지 않는다
+    - 멀티 워커 배포에서는 리더 워커에서만 start (on_elected / on_demoted)
+    """
+
+    def __init__(self, router: SQLiteShardRouter, retention_config: RetentionConfig | None = None):
+        self.router = router
+        self.cfg = retention_config or RetentionConfig()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None or not self.cfg.enabled:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="history-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _keep_before(self) -> Optional[datetime.datetime]:
+        if self.cfg.keep_days is None:
+            return None
+        return datetime.datetime.now() - datetime.timedelta(days=self.cfg.keep_days)
+
+    def run_once(self) -> int:
+        """모든 사용자 / 덱 한 바퀴 압축 - 옮긴 기록 수 반환 (stop 요청 시 덱 단위로 중단)"""
+        archived = 0
+        keep_before = self._keep_before()
+        for user_id in self.router.list_users():
+            for deck_id in self.router.list_decks(user_id):
+                if self._stopping.is_set():
+                    return archived
+                moved = self.router.get_storage(user_id, deck_id).compact_history(
+                    keep_last=self.cfg.keep_last,
+                    keep_before=keep_before,
+                    min_records=self.cfg.min_records,
+                    batch_size=self.cfg.batch_cards,
+                )
+                HISTORY_ARCHIVED.inc(amount=moved)
+                archived += moved
+        return archived
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # DB 오류 등은 다음 주기에 다시 시도 (실패 횟수는 메트릭으로 노출)
+                BACKGROUND_JOB_ERRORS.inc("history_compaction")
+            self._stopping.wait(self.cfg.interval_sec)
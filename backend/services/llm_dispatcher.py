@@ -0,0 +1,88 @@
+# backend/services/llm_dispatcher.py
+import heapq
+import itertools
+import threading
+from typing import Dict, List, Tuple
+
+# 우선순위 (작을수록 먼저) - 학생이 기다리는 채점 > 힌트 > 연관 개념/심화 문제/정의 생성
+GRADING = 0
+HINT = 1
+ENRICHMENT = 2
+PRIORITY_NAMES = {GRADING: "grading", HINT: "hint", ENRICHMENT: "enrichment"}
+RETRY_AFTER_SEC = 5     # 거절 시 클라이언트에 권하는 재시도 간격
+
+class LLMOverloadedError(RuntimeError):
+    """대기열이 가득 찼거나 대기 시간이 초과되어 LLM 호출을 거절"""
+
+    def __init__(self, priority: int, reason: str, retry_after_sec: float):
+        super().__init__(f"LLM is overloaded ({PRIORITY_NAMES.get(priority, priority)}: {reason})")
+        self.priority = priority
+        self.reason = reason
+        self.retry_after_sec = retry_after_sec
+
+class _Waiter:
+    __slots__ = ("priority", "event", "cancelled")
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.event = threading.Event()
+        self.cancelled = False
+
+class LLMDispatcher:
+    """
+    Ollama 동시 생성 수 제한 + 우선순위 대기열
+    - 빈 슬롯이 없으면 우선순위 순(같으면 도착 순)으로 대기, 슬롯이 비면 가장 급한 대기자에게 바로 넘긴다
+    - 입장 제어: 전체 대기 수가 우선순위별 상한 이상이면 즉시 거절 (낮은 우선순위일수록 상한이 작아 먼저 밀려난다)
+    """
+
+    def __init__(self, max_concurrency: int, queue_limits: Dict[int, int], wait_timeout_sec: float):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.queue_limits = queue_limits
+        self.wait_timeout_sec = wait_timeout_sec
+        self._active = 0
+        self._queue: List[Tuple[int, int, _Waiter]] = []
+        self._waiting: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: int) -> None:
+        """슬롯 획득 (대기 포함) - 거절/시간 초과 시 LLMOverloadedError"""
+        with self._lock:
+            if self._active < self.max_concurrency and not self._queue:
+                self._active += 1
+                return
+            depth = sum(self._waiting.values())
+            if depth >= self.queue_limits.get(priority, 0):
+                raise LLMOverloadedError(priority, "queue full", RETRY_AFTER_SEC)
+            waiter = _Waiter(priority)
+            heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+            self._waiting[priority] += 1
+
+        if waiter.event.wait(self.wait_timeout_sec):
+            return
+        with self._lock:
+            # 시간 초과 직후 슬롯을 넘겨받았을 수도 있다
+            if waiter.event.is_set():
+                return
+            waiter.cancelled = True
+            self._waiting[priority] -= 1
+        raise LLMOverloadedError(priority, "queue timeout", RETRY_AFTER_SEC)
+
+    def release(self) -> None:
+        """슬롯 반납 - 대기자가 있으면 슬롯을 그대로 넘긴다"""
+        with self._lock:
+            while self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                if waiter.cancelled:
+                    continue
+                self._waiting[waiter.priority] -= 1
+                waiter.event.set()
+                return
+            self._active -= 1
+
+    def queued(self) -> Dict[str, int]:
+        """우선순위별 대기 수"""
+        with self._lock:
+            return {name: self._waiting[priority] for priority, name in PRIORITY_NAMES.items()}
@@ -1,33 +1,243 @@
 # backend/services/llm_service.py
 from interfaces.llm_interface import ILLMService
+from dataclasses import dataclass
+
 from config.settings import LLMConfig
+from utils.metrics import track, COALESCED_CALLS, QUEUE_DEPTH, LLM_REJECTED
+from utils.tracing import span, current_trace
+from utils.singleflight import SingleFlight
+from services.llm_dispatcher import (
+    LLMDispatcher, LLMOverloadedError, GRADING, HINT, ENRICHMENT, PRIORITY_NAMES
+)
+from services.embedding_sidecar import EmbeddingClient, load_embedder
 
+import httpx
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import Runnable
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+# 프롬프트 템플릿 (체인은 __init__에서 한 번만 컴파일)
+HINT_TEMPLATES = {
+    ("word", 3): (
+        "학생이 단어를 떠올릴 수 있도록, "
+        "정답 단어를 노출하지 않고 한두 문장으로 짧은 힌트를 제공해주세요.\n"
+        "정답: {answer}"
+    ),
+    ("word", 4): (
+        "학생이 단어를 확실히 기억할 수 있도록, "
+        "정답 단어를 노출하지 않고 최대 두 문장 이내로 구체적인 힌트를 제공해주세요.\n"
+        "정답: {answer}"
+    ),
+    ("concept", 2): (
+        "학생이 개념을 떠올릴 수 있도록, "
+        "정의(정답)를 노출하지 않고 한두 문장으로 짧은 힌트를 제공해주세요.\n"
+        "개념: {concept}\n"
+        "정의: {answer}"
+    ),
+    ("concept", 4): (
+        "학생이 개념을 정확히 떠올릴 수 있도록, "
+        "정의(정답)를 노출하지 않고 한두 문장으로 구체적인 힌트를 제공해주세요.\n"
+        "개념: {concept}\n"
+        "정의: {answer}"
+    ),
+}
+# concept 카드는 2, 3단계가 같은 힌트를 사용
+HINT_TEMPLATES[("concept", 3)] = HINT_TEMPLATES[("concept", 2)]
+
+FEEDBACK_CORRECT_TEMPLATE = (
+    "학생이 정답을 맞혔습니다.\n"
+    "정답: {correct_answer}\n"
+    "간단히 칭찬해 주세요."
+)
+
+FEEDBACK_WRONG_TEMPLATE = (
+    "학생이 오답을 입력했습니다.\n"
+    "정답: {correct_answer}\n"
+    "사용자 답안: {user_answer}\n"
+    "정답을 직접 말하지 말고, 학생이 스스로 떠올릴 수 있도록 한두 문장으로 힌트를 제공해주세요."
+)
+
+RELATED_TEMPLATE = """
+다음 개념과 밀접하게 연관된 한국어 개념 {k}개를 ‘개념1, 개념2, ...’ 형태로 한 줄에 제시하세요.
+개념: {concept}
+"""
+
+DEFINITION_TEMPLATE = """
+아래 개념을 한국어로 한두 문장으로 간결 · 정확하게 요약하세요.
+개념: {concept}
+"""
+
+QUESTIONS_TEMPLATE = """
+주어진 개념과 관련된 심화 문제 {n}개를 한 줄에 하나씩 생성하세요.
+개념: {concept}
+출력 형식: 문제1, 문제2, ...
+"""
+
+VERDICT_TEMPLATE = """
+Determine whether the user's answer means exactly the same as the correct answer.
+
+Correct Answer: {correct_answer}
+User Answer: {user_answer}
+
+If their meanings are not completely identical, respond NO.
+Respond with one word only: YES or NO (uppercase).
+"""
+
+# 프롬프트 유형별 디스패치 우선순위 (오답 피드백은 채점 응답에 포함되므로 채점과 같은 급)
+CHAIN_PRIORITIES = {
+    "verdict": GRADING,
+    "feedback": GRADING,
+    "hint": HINT,
+    "related": ENRICHMENT,
+    "definition": ENRICHMENT,
+    "questions": ENRICHMENT,
+}
+
+@dataclass(frozen=True)
+class PromptChain:
+    """컴파일된 프롬프트 체인 (operation은 메트릭/트레이스 이름)"""
+    operation: str
+    prompt: PromptTemplate
+    runnable: Runnable
+    priority: int = ENRICHMENT
+
 class LLMService(ILLMService):
     """LLM 기반 힌트/피드백 및 관련 개념/정의/심화 문제 생성 서비스"""
 
-    def __init__(self):
-        cfg: LLMConfig = LLMConfig()
-        self.model = ChatOllama(
+    def __init__(self, llm_config: LLMConfig | None = None):
+        cfg: LLMConfig = llm_config or LLMConfig()
+        self.cfg = cfg
+        # 워커 전체가 쓰는 ChatOllama 하나 (HTTP 커넥션 풀 하나) - 프로필은 체인마다 options로 바인딩
+        self.model = self._build_model()
+        self.embedder = self._build_embedder(cfg)
+        self.similarity_threshold = cfg.similarity_threshold
+        # 더블클릭/재전송으로 겹친 동일 생성 요청 합치기
+        self._flights = SingleFlight()
+        # Ollama 호출 동시성 제한 + 우선순위 대기열
+        self._dispatcher = LLMDispatcher(
+            cfg.max_parallel_generations,
+            {
+                GRADING: cfg.grading_queue_limit,
+                HINT: cfg.hint_queue_limit,
+                ENRICHMENT: cfg.enrichment_queue_limit,
+            },
+            cfg.queue_timeout_sec,
+        )
+        QUEUE_DEPTH.set_function(
+            lambda: {(f"llm_{name}",): count for name, count in self._dispatcher.queued().items()},
+            source="llm_dispatcher",
+        )
+
+        # 프롬프트 유형별 체인 (재사용)
+        self._hint_chains: dict[tuple[str, int], PromptChain] = {
+            key: self._build_chain(template, "hint")
+            for key, template in HINT_TEMPLATES.items()
+        }
+        self._feedback_correct_chain = self._build_chain(FEEDBACK_CORRECT_TEMPLATE, "feedback")
+        self._feedback_wrong_chain = self._build_chain(FEEDBACK_WRONG_TEMPLATE, "feedback")
+        self._related_chain = self._build_chain(RELATED_TEMPLATE, "related")
+        self._definition_chain = self._build_chain(DEFINITION_TEMPLATE, "definition")
+        self._questions_chain = self._build_chain(QUESTIONS_TEMPLATE, "questions")
+        self._verdict_chain = self._build_chain(VERDICT_TEMPLATE, "verdict")
+
+    @staticmethod
+    def _build_embedder(cfg: LLMConfig):
+        """임베더 생성 - 사이드카 소켓이 설정되면 워커에 모델을 올리지 않고 사이드카 클라이언트 사용"""
+        if cfg.embedder_socket:
+            return EmbeddingClient(
+                cfg.embedder_socket,
+                cfg.embedder_connections,
+                cfg.embedder_buffer_bytes,
+                cfg.embedder_timeout_sec,
+            )
+        return load_embedder(cfg.embedder_name)
+
+    def close(self) -> None:
+        """워커 종료 시 호출 - 사이드카 클라이언트면 연결과 공유 메모리(/dev/shm) 버퍼 반납"""
+        close = getattr(self.embedder, "close", None)
+        if close is not None:
+            close()
+
+    def _build_model(self) -> ChatOllama:
+        """공유 ChatOllama 생성 - keep_alive + 크기가 제한된 HTTP 커넥션 풀 하나"""
+        cfg = self.cfg
+        return ChatOllama(
             model=cfg.model_name,
+            base_url=cfg.base_url,
+            keep_alive=cfg.keep_alive,
             temperature=cfg.temperature,
+            client_kwargs={
+                "timeout": cfg.request_timeout_sec,
+                "limits": httpx.Limits(
+                    max_connections=cfg.max_connections,
+                    max_keepalive_connections=cfg.max_keepalive_connections,
+                ),
+            },
+        )
+
+    def _profile_options(self, profile_name: str) -> dict:
+        """프로필 → Ollama options (None인 값은 모델 기본값을 쓰도록 뺀다)"""
+        profile = self.cfg.profile(profile_name)
+        options = {
+            "temperature": profile.temperature,
+            "num_predict": profile.num_predict,
+            "num_ctx": profile.num_ctx,
+            "stop": profile.stop,
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
+    def _build_chain(self, template: str, profile_name: str) -> PromptChain:
+        prompt = PromptTemplate.from_template(template)
+        return PromptChain(
+            operation=f"llm_{profile_name}",
+            prompt=prompt,
+            # 같은 모델(같은 커넥션 풀)에 호출 시 options만 바꿔 보낸다
+            runnable=prompt | self.model.bind(options=self._profile_options(profile_name)),
+            priority=CHAIN_PRIORITIES.get(profile_name, ENRICHMENT),
         )
-        self.embedder = SentenceTransformer(cfg.embedder_name)
-        self.similarity_threshold = cfg.similarity_threshold
+
+    def _generate(self, chain: PromptChain, inputs: dict, card_type: str | None = None) -> str:
+        """체인 실행 - 같은 체인/입력으로 진행 중인 생성이 있으면 그 결과를 함께 받는다"""
+        if not self.cfg.coalesce_requests:
+            return self._invoke(chain, inputs, card_type)
+        key = (id(chain), tuple(sorted((k, str(v)) for k, v in inputs.items())))
+        content, shared = self._flights.do(key, lambda: self._invoke(chain, inputs, card_type))
+        if shared:
+            COALESCED_CALLS.inc(chain.operation)
+        return content
+
+    def _invoke(self, chain: PromptChain, inputs: dict, card_type: str | None = None) -> str:
+        """디스패치 슬롯을 얻어 체인 실행 + 메트릭/트레이스 기록 (대기 시간, 프롬프트 길이, 생성 토큰 수)"""
+        queue_name = f"llm_queue_{PRIORITY_NAMES[chain.priority]}"
+        try:
+            with track(queue_name, card_type), span(queue_name):
+                self._dispatcher.acquire(chain.priority)
+        except LLMOverloadedError as e:
+            LLM_REJECTED.inc(PRIORITY_NAMES[chain.priority], e.reason)
+            raise
+        try:
+            with track(chain.operation, card_type), span(chain.operation) as sp:
+                message = chain.runnable.invoke(inputs)
+                if current_trace() is not None:
+                    usage = getattr(message, "usage_metadata", None) or {}
+                    sp.set(
+                        prompt_chars=len(chain.prompt.format(**inputs)),
+                        prompt_tokens=usage.get("input_tokens"),
+                        output_tokens=usage.get("output_tokens"),
+                    )
+        finally:
+            self._dispatcher.release()
+        return message.content
 
     def generate_question(self, card: dict) -> dict:
         return {"question": f"'{card['concept']}'에 대해 설명해보세요."}
 
     def evaluate_answer(self, card: dict, user_answer: str) -> bool:
         correct_answer = card["answer"]
-        vec_correct = self.embedder.encode([correct_answer])
-        vec_user = self.embedder.encode([user_answer])
+        with track("embed"), span("embed"):
+            vec_correct = self.embedder.encode([correct_answer])
+            vec_user = self.embedder.encode([user_answer])
         sim_score = cosine_similarity(vec_correct, vec_user)[0][0]
         return bool(sim_score >= self.similarity_threshold)
 
@@ -35,147 +245,57 @@ class LLMService(ILLMService):
         """
         단계별, 카드 타입별로 힌트를 생성
         """
-        if card_type == "word":
-            if stage == 3:
-                template = PromptTemplate(
-                    input_variables=["answer"],
-                    template=(
-                        "학생이 단어를 떠올릴 수 있도록, "
-                        "정답 단어를 노출하지 않고 한두 문장으로 짧은 힌트를 제공해주세요.\n"
-                        "정답: {answer}"
-                    )
-                )
-            elif stage == 4:
-                template = PromptTemplate(
-                    input_variables=["answer"],
-                    template=(
-                        "학생이 단어를 확실히 기억할 수 있도록, "
-                        "정답 단어를 노출하지 않고 최대 두 문장 이내로 구체적인 힌트를 제공해주세요.\n"
-                        "정답: {answer}"
-                    )
-                )
-            else:
-                return ""
-            chain: Runnable = template | self.model | StrOutputParser()
-            return chain.invoke({"answer": answer}).strip()
-
-        else:  # card_type == "concept"
-            if stage in [2, 3]:
-                template = PromptTemplate(
-                    input_variables=["concept", "answer"],
-                    template=(
-                        "학생이 개념을 떠올릴 수 있도록, "
-                        "정의(정답)를 노출하지 않고 한두 문장으로 짧은 힌트를 제공해주세요.\n"
-                        "개념: {concept}\n"
-                        "정의: {answer}"
-                    )
-                )
-            elif stage == 4:
-                template = PromptTemplate(
-                    input_variables=["concept", "answer"],
-                    template=(
-                        "학생이 개념을 정확히 떠올릴 수 있도록, "
-                        "정의(정답)를 노출하지 않고 한두 문장으로 구체적인 힌트를 제공해주세요.\n"
-                        "개념: {concept}\n"
-                        "정의: {answer}"
-                    )
-                )
-            else:
-                return ""
-            chain: Runnable = template | self.model | StrOutputParser()
-            return chain.invoke({"concept": concept, "answer": answer}).strip()
+        hint_type = "word" if card_type == "word" else "concept"
+        chain = self._hint_chains.get((hint_type, stage))
+        if chain is None:
+            return ""
+        return self._generate(chain, {"concept": concept, "answer": answer}, card_type).strip()
 
     def generate_feedback(self, card: dict, user_answer: str, is_correct: bool) -> str:
         correct_answer = card["answer"]
         if is_correct:
-            feedback_prompt = PromptTemplate(
-                input_variables=["correct_answer"],
-                template=(
-                    "학생이 정답을 맞혔습니다.\n"
-                    "정답: {correct_answer}\n"
-                    "간단히 칭찬해 주세요."
-                )
-            )
-            chain_feedback: Runnable = feedback_prompt | self.model | StrOutputParser()
-            return chain_feedback.invoke({"correct_answer": correct_answer}).strip()
+            return self._generate(self._feedback_correct_chain, {"correct_answer": correct_answer}).strip()
         else:
-            feedback_prompt = PromptTemplate(
-                input_variables=["correct_answer", "user_answer"],
-                template=(
-                    "학생이 오답을 입력했습니다.\n"
-                    "정답: {correct_answer}\n"
-                    "사용자 답안: {user_answer}\n"
-                    "정답을 직접 말하지 말고, 학생이 스스로 떠올릴 수 있도록 한두 문장으로 힌트를 제공해주세요."
-                )
-            )
-            chain_feedback: Runnable = feedback_prompt | self.model | StrOutputParser()
-            return chain_feedback.invoke({
+            return self._generate(self._feedback_wrong_chain, {
                 "correct_answer": correct_answer,
                 "user_answer": user_answer
             }).strip()
 
     def generate_related_concepts(self, concept: str, k: int = 5) -> list[str]:
-        prompt = PromptTemplate.from_template(
-            """
-다음 개념과 밀접하게 연관된 한국어 개념 {k}개를 ‘개념1, 개념2, ...’ 형태로 한 줄에 제시하세요.
-개념: {concept}
-"""
-        )
-        chain = prompt | self.model | StrOutputParser()
-        raw = chain.invoke({"concept": concept, "k": k})
+        raw = self._generate(self._related_chain, {"concept": concept, "k": k})
         return [c.strip() for c in raw.split(",") if c.strip()]
 
     def generate_concept_definition(self, concept: str) -> str:
-        prompt = PromptTemplate.from_template(
-            """
-아래 개념을 한국어로 한두 문장으로 간결 · 정확하게 요약하세요.
-개념: {concept}
-"""
-        )
-        chain: Runnable = prompt | self.model | StrOutputParser()
-        return chain.invoke({"concept": concept}).strip()
+        return self._generate(self._definition_chain, {"concept": concept}, "concept").strip()
 
     def generate_advanced_questions(self, concept: str, n: int = 3) -> list[str]:
         """
         주어진 개념에 대해 심화 문제 n개를 한 줄에 하나씩 생성하여 리스트로 반환
         """
-        prompt = PromptTemplate.from_template(
-            """
-주어진 개념과 관련된 심화 문제 {n}개를 한 줄에 하나씩 생성하세요.
-개념: {concept}
-출력 형식: 문제1, 문제2, ...
-"""
-        )
-        chain: Runnable = prompt | self.model | StrOutputParser()
-        raw = chain.invoke({"concept": concept, "n": n})
+        raw = self._generate(self._questions_chain, {"concept": concept, "n": n})
         return [q.strip() for q in raw.split(",") if q.strip()]
-    
-    
+
+
     def _calculate_similarity(self, text1: str, text2: str) -> float:
             """
             두 문자열을 임베딩한 뒤 코사인 유사도를 반환한다.
             반환값은 0.0~1.0 사이 실수.
             """
-            embeddings = self.embedder.encode([text1, text2])
+            with track("embed"), span("embed"):
+                embeddings = self.embedder.encode([text1, text2])
             score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
 
             return round(float(score), 4)
-    
-    # NEW : 의미 동등성 YES/NO 판정
-    def is_equivalent(self, correct_answer: str, user_answer: str) -> bool:
-        yesno_prompt = PromptTemplate.from_template(
-            """
-Determine whether the user's answer means exactly the same as the correct answer.
 
-Correct Answer: {correct_answer}
-User Answer: {user_answer}
+    def embed(self, text: str):
+        """정규화된 임베딩 벡터 (오답 피드백 캐시 키)"""
+        with track("embed"), span("embed"):
+            return self.embedder.encode([text], normalize_embeddings=True)[0]
 
-If their meanings are not completely identical, respond NO.
-Respond with one word only: YES or NO (uppercase).
-"""
-        )
-        chain: Runnable = yesno_prompt | self.model | StrOutputParser()
-        result = chain.invoke(
+    # NEW : 의미 동등성 YES/NO 판정
+    def is_equivalent(self, correct_answer: str, user_answer: str) -> bool:
+        result = self._generate(
+            self._verdict_chain,
             {"correct_answer": correct_answer, "user_answer": user_answer}
         ).strip().upper()
-        return result == "YES"
\ No newline at end of file
+        return result == "YES"
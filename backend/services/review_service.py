@@ -3,8 +3,14 @@ from typing import Dict, Any, List
 from interfaces.llm_interface import ILLMService
 from services.card_service import CardService
 from services.schedule_service import ScheduleService
-from models.review import ReviewRecord
+from services.llm_dispatcher import LLMOverloadedError
+from services.feedback_cache import SemanticFeedbackCache
+from services.concept_graph_service import ConceptGraphService
+from interfaces.storage_interface import CardConflictError, CardNotFoundError
+from models.review import ReviewRecord, ReviewEvent
 from config.settings import ReviewConfig
+from utils.metrics import track, current_card_type, REVIEW_RESULTS, REVIEW_CONFLICTS
+from utils.tracing import span
 from datetime import datetime, timedelta
 
 # embedding 유사도 통과 설정 
@@ -13,6 +19,26 @@ WORD_SIM_CORRECT = 0.95
 WORD_SIM_NEAR    = 0.72
 CONCEPT_SIM_PASS = 0.75
 
+def embedding_verdict(
+    card_type: str,
+    similarity: float,
+    word_correct: float = WORD_SIM_CORRECT,
+    word_near: float = WORD_SIM_NEAR,
+    concept_pass: float = CONCEPT_SIM_PASS,
+) -> str:
+    """
+    유사도 기반 1차 판정
+    - word: "correct" / "near"(오타 의심) / "wrong"
+    - concept: "pass"(LLM 동등성 판정 대상) / "fail"
+    """
+    if card_type == "concept":
+        return "pass" if similarity >= concept_pass else "fail"
+    if similarity >= word_correct:
+        return "correct"
+    if similarity >= word_near:
+        return "near"
+    return "wrong"
+
 class ReviewService:
     """복습 서비스 - LLM 힌트/피드백 + 4단계 통과 시 관련 개념 추천"""
 
@@ -21,12 +47,16 @@ class ReviewService:
         llm_service: ILLMService,
         card_service: CardService,
         schedule_service: ScheduleService,
-        review_config: ReviewConfig | None = None
+        review_config: ReviewConfig | None = None,
+        feedback_cache: SemanticFeedbackCache | None = None,
+        concept_graph: ConceptGraphService | None = None
     ):
         self.llm_service = llm_service
         self.card_service = card_service
         self.schedule_service = schedule_service
         self.review_cfg = review_config or ReviewConfig()
+        self.feedback_cache = feedback_cache
+        self.concept_graph = concept_graph
 
     def process_review(self, card_id: str, user_answer: str, retry: bool = False) -> Dict[str, Any]:
         """
@@ -36,44 +66,52 @@ class ReviewService:
            → concept 카드인 경우 심화 문제도 반환
         4) is_correct 아닌 경우 기존 재시도/스케줄 로직
         """
-        card = self.card_service.get_card(card_id)
+        with span("review.load_card"):
+            card = self.card_service.get_card(card_id)
         if not card:
             return {"error": "Card not found"}
 
-        if card.card_type == "concept":
-            similarity = self.llm_service._calculate_similarity(card.answer, user_answer)
-
-            if similarity < CONCEPT_SIM_PASS:
-                # ❌ 1차 컷 탈락 → 즉시 오답
-                is_correct = False
-                feedback   = f"유사도 {similarity:.2f}로 정답과 핵심이 크게 다릅니다."
-
-            else:
+        # 이후 하위 작업 메트릭에 card_type 라벨을 붙인다
+        token = current_card_type.set(card.card_type)
+        try:
+            with track("review"), span("review", card_type=card.card_type, stage=card.stage) as sp:
+                result = self._process_review(card, user_answer, retry)
+                sp.set(is_correct=result["is_correct"])
+                return result
+        finally:
+            current_card_type.reset(token)
+
+    def _process_review(self, card, user_answer: str, retry: bool) -> Dict[str, Any]:
+        with span("review.grade"):
+            is_correct, feedback = self._grade(card, user_answer)
+
+        # 다른 요청이 먼저 카드를 바꿨으면 다시 읽어 전이만 재적용 (채점은 정답이 바뀐 경우에만 다시)
+        attempts = 0
+        while True:
+            graded_answer = card.answer
+            try:
+                result = self._apply_review(card, user_answer, retry, is_correct, feedback)
+                break
+            except CardConflictError:
+                REVIEW_CONFLICTS.inc(card.card_type)
+                attempts += 1
+                if attempts > self.review_cfg.conflict_retries:
+                    raise
+                card_id = card.card_id
+                with span("review.reload_card"):
+                    card = self.card_service.get_card(card_id)
+                if card is None:
+                    # 그 사이 삭제됨 - 재시도 대상이 아니라 '없음'
+                    raise CardNotFoundError(card_id)
+                if card.answer != graded_answer:
+                    with span("review.grade"):
+                        is_correct, feedback = self._grade(card, user_answer)
+
+        REVIEW_RESULTS.inc(card.card_type, "correct" if is_correct else "wrong")
+        return result
 
-                if self.llm_service.is_equivalent(card.answer, user_answer):
-                    is_correct = True
-                    feedback   = ""  # 정답이므로 별도 피드백 없음
-                else:
-                    is_correct = False
-                    feedback = self.llm_service.generate_feedback(
-                    {"concept": card.concept, "answer": card.answer},  # correct_answer 그대로 dict
-                    user_answer,                                       # user_answer
-                    False                                              # is_correct flag
-                )
-
-
-            
-        else:  # word
-            sim = self.llm_service._calculate_similarity(card.answer, user_answer)
-            if sim >= WORD_SIM_CORRECT:
-                is_correct = True
-                feedback   = ""
-            elif sim >= WORD_SIM_NEAR:
-                is_correct = False
-                feedback   = "오타가 없는지 확인해주세요."
-            else:
-                is_correct = False
-                feedback   = f"유사도 {sim:.2f}로 정답과 다릅니다."
+    def _apply_review(self, card, user_answer: str, retry: bool, is_correct: bool, feedback: str) -> Dict[str, Any]:
+        """채점 결과로 단계/다음 복습 시각 전이 후 저장 (버전 충돌 시 CardConflictError)"""
         # 리뷰 기록
         record = ReviewRecord(
             stage=card.stage,
@@ -100,18 +138,21 @@ class ReviewService:
         if is_correct and card.stage == 4:
             result["completed"] = True
 
-            # concept 카드만 심화문제 생성
-            if card.card_type == "concept":
-                adv_qs = self.llm_service.generate_advanced_questions(card.concept)
-                result["advanced_questions"] = adv_qs
+            with span("review.stage4_extras"):
+                # 부가 생성은 가장 낮은 우선순위 - LLM이 밀려 거절되면 채점 결과만 반환
+                try:
+                    # concept 카드만 심화문제 생성
+                    if card.card_type == "concept":
+                        result["advanced_questions"] = self._advanced_questions(card.concept)
 
-            # 연관 개념 추천
-            related = self.llm_service.generate_related_concepts(card.concept)
-            result["related_concepts"] = related
+                    # 연관 개념 추천
+                    result["related_concepts"] = self._related_concepts(card.concept)
+                except LLMOverloadedError:
+                    pass
 
             # 단계 진급 및 next_review 설정
             advanced = card.promote_stage()
-            next_time = self.schedule_service.get_next_review_time(card.stage, card.card_type)
+            next_time = self._next_review_time(card)
             card.update_next_review(next_time)
             result["next_review"] = next_time
             result["advanced"] = advanced
@@ -121,7 +162,7 @@ class ReviewService:
             # 4단계가 아니거나 틀린 경우: 기존 로직
             if is_correct:
                 advanced = card.promote_stage()
-                next_time = self.schedule_service.get_next_review_time(card.stage, card.card_type)
+                next_time = self._next_review_time(card)
                 card.update_next_review(next_time)
                 result["next_review"] = next_time
                 result["advanced"] = advanced
@@ -138,5 +179,76 @@ class ReviewService:
                     result["advanced"] = False
                     result["stage"] = card.stage
 
-        self.card_service.update_card(card)
+        event = ReviewEvent(
+            card_type=card.card_type,
+            stage=record.stage,
+            is_correct=is_correct,
+            promoted=bool(result["advanced"]),
+            reset=retry and not is_correct,
+            timestamp=record.timestamp
+        )
+        with span("review.save_card"):
+            self.card_service.record_review(card, event)
         return result
+
+    def _grade(self, card, user_answer: str) -> tuple[bool, str]:
+        """유사도 1차 컷 + (concept) LLM 동등성 판정으로 채점"""
+        similarity = self.llm_service._calculate_similarity(card.answer, user_answer)
+        verdict = embedding_verdict(card.card_type, similarity)
+
+        if verdict == "fail":
+            # ❌ 1차 컷 탈락 → 즉시 오답
+            is_correct = False
+            feedback   = f"유사도 {similarity:.2f}로 정답과 핵심이 크게 다릅니다."
+        elif verdict == "pass":
+            if self.llm_service.is_equivalent(card.answer, user_answer):
+                is_correct = True
+                feedback   = ""  # 정답이므로 별도 피드백 없음
+            else:
+                is_correct = False
+                feedback = self._wrong_answer_feedback(card, user_answer)
+        elif verdict == "correct":  # word
+            is_correct = True
+            feedback   = ""
+        elif verdict == "near":
+            is_correct = False
+            feedback   = "오타가 없는지 확인해주세요."
+        else:
+            is_correct = False
+            feedback   = f"유사도 {similarity:.2f}로 정답과 다릅니다."
+        return is_correct, feedback
+
+    def _advanced_questions(self, concept: str) -> List[str]:
+        """개념 그래프가 있으면 저장된 심화 문제 재사용"""
+        if self.concept_graph is not None:
+            return self.concept_graph.advanced_questions(concept)
+        return self.llm_service.generate_advanced_questions(concept)
+
+    def _related_concepts(self, concept: str) -> List[str]:
+        if self.concept_graph is not None:
+            return self.concept_graph.related_concepts(concept)
+        return self.llm_service.generate_related_concepts(concept)
+
+    def _wrong_answer_feedback(self, card, user_answer: str) -> str:
+        """오답 피드백 - 같은 카드에 비슷한 오답이 있었으면 저장된 피드백 재사용"""
+        if self.feedback_cache is None:
+            return self._generate_wrong_feedback(card, user_answer)
+        vector = self.llm_service.embed(user_answer)
+        feedback = self.feedback_cache.lookup(card.card_id, card.answer, vector)
+        if feedback is None:
+            feedback = self._generate_wrong_feedback(card, user_answer)
+            self.feedback_cache.store(card.card_id, card.answer, vector, feedback)
+        return feedback
+
+    def _generate_wrong_feedback(self, card, user_answer: str) -> str:
+        return self.llm_service.generate_feedback(
+            {"concept": card.concept, "answer": card.answer},  # correct_answer 그대로 dict
+            user_answer,                                       # user_answer
+            False                                              # is_correct flag
+        )
+
+    def _next_review_time(self, card) -> datetime:
+        """카드별 지터 + 덱 일일 상한을 반영한 다음 복습 시각"""
+        return self.schedule_service.get_next_review_time(
+            card.stage, card.card_type, card.card_id, self.card_service.count_due_by_bucket
+        )
@@ -1,15 +1,59 @@
 """스케줄 관리 서비스"""
+import hashlib
 from datetime import datetime, timedelta
-from config.settings import SystemConfig
+from typing import Callable, Dict, Optional
+from config.settings import SystemConfig, ScheduleConfig
+
+# (시작, 끝, 버킷 단위) → {버킷 키: 복습 예정 카드 수}
+DueCounter = Callable[[datetime, datetime, str], Dict[str, int]]
+
+def bucket_key(moment: datetime, bucket: str) -> str:
+    """저장소 집계와 같은 버킷 키 (day: YYYY-MM-DD, hour: YYYY-MM-DDTHH)"""
+    return moment.isoformat()[:13 if bucket == "hour" else 10]
 
 class ScheduleService:
-    """스케줄 서비스 - 다음 복습 시간 계산"""
-    
-    def __init__(self):
-        config = SystemConfig.default()
-        self.stage_intervals = config.schedule.stage_intervals
-
-    def get_next_review_time(self, stage: int, card_type: str) -> datetime:
-        """다음 복습 시간 계산"""
-        interval: timedelta = self.stage_intervals.get(stage, timedelta(days=1))
-        return datetime.now() + interval
+    """스케줄 서비스 - 다음 복습 시간 계산 (카드별 지터 + 일일 상한 분산)"""
+
+    def __init__(self, schedule_config: ScheduleConfig | None = None):
+        self.cfg = schedule_config or SystemConfig.default().schedule
+        self.stage_intervals = self.cfg.stage_intervals
+
+    def get_next_review_time(
+        self,
+        stage: int,
+        card_type: str,
+        card_id: Optional[str] = None,
+        due_counter: Optional[DueCounter] = None
+    ) -> datetime:
+        """
+        다음 복습 시간 계산
+        - card_id가 있으면 간격에 카드별 고정 지터 적용 (한꺼번에 만든 카드가 같은 분에 몰리지 않게)
+        - due_counter가 있고 daily_capacity가 설정되면 꽉 찬 날을 피해 뒤로 분산
+        """
+        base_interval: timedelta = self.stage_intervals.get(stage, timedelta(days=1))
+        interval = base_interval
+        if card_id is not None and self.cfg.fuzz_ratio > 0:
+            interval *= 1 + self.cfg.fuzz_ratio * self._jitter(card_id, stage)
+        next_time = datetime.now() + interval
+        # 분산 대상은 지터 전 간격으로 판단 (24시간 카드가 지터로 하루 미만이 돼도 상한 적용)
+        if due_counter is not None and self.cfg.daily_capacity and base_interval >= timedelta(days=1):
+            next_time = self._smooth_daily_load(next_time, due_counter)
+        return next_time
+
+    @staticmethod
+    def _jitter(card_id: str, stage: int) -> float:
+        """card_id/stage로 결정되는 [-1, 1) 값"""
+        digest = hashlib.blake2b(f"{card_id}:{stage}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 63 - 1
+
+    def _smooth_daily_load(self, target: datetime, due_counter: DueCounter) -> datetime:
+        """목표일이 상한에 닿았으면 max_defer_days 안에서 여유 있는 첫 날 (없으면 가장 한가한 날)"""
+        day_start = target.replace(hour=0, minute=0, second=0, microsecond=0)
+        window_end = day_start + timedelta(days=self.cfg.max_defer_days + 1)
+        counts = due_counter(day_start, window_end, "day")
+
+        candidates = [target + timedelta(days=offset) for offset in range(self.cfg.max_defer_days + 1)]
+        for candidate in candidates:
+            if counts.get(bucket_key(candidate, "day"), 0) < self.cfg.daily_capacity:
+                return candidate
+        return min(candidates, key=lambda c: counts.get(bucket_key(c, "day"), 0))
@@ -0,0 +1,170 @@
+"""복습 세션 서비스 - 다음 N개 복습 카드 선택 + 힌트 미리 생성"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from config.settings import SessionConfig
+from interfaces.llm_interface import ILLMService
+from models.card import MemorizationCard
+from services.card_service import CardService
+from utils.metrics import record_cache, QUEUE_DEPTH
+
+def needs_llm_hint(card_type: str, stage: int) -> bool:
+    """LLM 힌트가 필요한 단계인지 (word: 3~4단계, concept: 2~4단계)"""
+    if card_type == "word":
+        return stage in (3, 4)
+    return stage in (2, 3, 4)
+
+def masked_hint(card: MemorizationCard) -> str:
+    """word 카드 2단계용 마스킹 힌트 (첫 글자 + '*')"""
+    if card.card_type == "word" and card.stage == 2:
+        answer = card.answer or ""
+        return answer[0] + "*" * (len(answer) - 1) if answer else ""
+    return ""
+
+@dataclass
+class ReviewSession:
+    """복습 세션 - 카드 목록과 선생성 중인 힌트"""
+    session_id: str
+    card_ids: List[str]
+    owner: str = ""     # 세션을 만든 사용자 (다른 사용자의 힌트 조회 차단)
+    hints: Dict[str, Future] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.now)
+
+class ReviewSessionService:
+    """복습 세션 서비스 - 세션 생성 시 다음 카드들의 힌트를 백그라운드에서 생성"""
+
+    def __init__(
+        self,
+        card_service: CardService,
+        llm_service: ILLMService,
+        session_config: SessionConfig | None = None
+    ):
+        self.card_service = card_service
+        self.llm_service = llm_service
+        self.cfg = session_config or SessionConfig()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.cfg.hint_workers, thread_name_prefix="hint-prefetch"
+        )
+        self._sessions: Dict[str, ReviewSession] = {}
+        self._lock = threading.Lock()
+        # 제출했지만 아직 끝나지 않은(대기 + 생성 중) 힌트 작업 수
+        # cancel()은 lock 안(_evict_expired)에서도 완료 콜백을 부르므로 별도 잠금
+        self._pending_hints = 0
+        self._pending_lock = threading.Lock()
+        QUEUE_DEPTH.set_function(lambda: {("hint_prefetch",): self._pending_hints}, source="hint_prefetch")
+
+    def create_session(
+        self,
+        limit: Optional[int] = None,
+        include_all: bool = False,
+        card_service: CardService | None = None,
+        owner: str = "",
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        복습 세션 생성
+        - next_review 순으로 offset부터 최대 limit개 카드 선택 (include_all이면 전체 카드 대상 = 테스트 모드)
+        - total은 전체 대상 카드 수 - 남은 카드는 offset을 늘려 다음 세션으로 받는다
+        - LLM 힌트가 필요한 카드는 순서대로 백그라운드 생성 시작
+        - card_service: 사용자/덱 범위 카드 서비스 (없으면 기본 덱)
+        """
+        card_service = card_service or self.card_service
+        limit = min(limit or self.cfg.max_cards, self.cfg.max_cards)
+        cards = card_service.get_all_cards() if include_all else card_service.get_due_cards()
+        cards.sort(key=lambda c: (c.next_review or datetime.min, c.card_id))
+        total = len(cards)
+        cards = cards[offset:offset + limit]
+
+        session = ReviewSession(session_id=str(uuid4()), card_ids=[c.card_id for c in cards], owner=owner)
+        for card in cards:
+            if needs_llm_hint(card.card_type, card.stage):
+                session.hints[card.card_id] = self._submit_hint(card)
+
+        with self._lock:
+            self._evict_expired()
+            self._sessions[session.session_id] = session
+
+        return {
+            "session_id": session.session_id,
+            "total": total,
+            "cards": [
+                {
+                    "card_id": c.card_id,
+                    "concept": c.concept,
+                    "card_type": c.card_type,
+                    "stage": c.stage,
+                    "next_review": c.next_review,
+                    "hint": masked_hint(c),
+                    "hint_pending": c.card_id in session.hints,
+                }
+                for c in cards
+            ],
+        }
+
+    def _submit_hint(self, card: MemorizationCard) -> Future:
+        """힌트 생성 작업 제출 - 완료/실패/취소 시 대기 수 감소"""
+        with self._pending_lock:
+            self._pending_hints += 1
+        future = self._executor.submit(
+            self.llm_service.generate_hint, card.concept, card.answer, card.stage, card.card_type
+        )
+        future.add_done_callback(self._hint_finished)
+        return future
+
+    def _hint_finished(self, future: Future) -> None:
+        with self._pending_lock:
+            self._pending_hints -= 1
+
+    def get_hint(self, session_id: str, card_id: str, wait: bool = True, owner: str = "") -> Optional[Dict[str, Any]]:
+        """
+        세션 카드의 힌트 조회 (세션/카드가 없으면 None)
+        - 생성 중이면 최대 hint_wait_sec 동안 기다린다 (wait=False면 즉시 반환)
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None or session.owner != owner or card_id not in session.card_ids:
+            return None
+
+        future = session.hints.get(card_id)
+        if future is None:
+            return {"hint": "", "ready": True}
+        # 조회 시점에 이미 생성되어 있으면 선생성 적중
+        record_cache("session_hint", future.done())
+        try:
+            hint = future.result(timeout=self.cfg.hint_wait_sec if wait else 0)
+        except FutureTimeoutError:
+            return {"hint": "", "ready": False}
+        except Exception:
+            # 힌트 생성 실패는 빈 힌트로 처리
+            hint = ""
+        return {"hint": hint, "ready": True}
+
+    def close_session(self, session_id: str, owner: str = "") -> bool:
+        """세션 종료 - 아직 시작되지 않은 힌트 생성은 취소"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.owner != owner:
+                return False
+            del self._sessions[session_id]
+        for future in session.hints.values():
+            future.cancel()
+        return True
+
+    def _evict_expired(self) -> None:
+        """TTL이 지났거나 개수 제한을 넘는 오래된 세션 제거 (lock 보유 상태에서 호출)"""
+        now = datetime.now()
+        expired = [
+            sid for sid, s in self._sessions.items()
+            if now - s.created_at > self.cfg.ttl
+        ]
+        oldest = sorted(self._sessions.values(), key=lambda s: s.created_at)
+        overflow = len(self._sessions) - len(expired) - self.cfg.max_sessions + 1
+        if overflow > 0:
+            expired += [s.session_id for s in oldest if s.session_id not in expired][:overflow]
+        for sid in expired:
+            for future in self._sessions.pop(sid).hints.values():
+                future.cancel()
@@ -0,0 +1,224 @@
+# backend/storage/concept_graph_storage.py
+import sqlite3
+import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+def concept_key(concept: str) -> str:
+    """같은 개념 판단용 키 (공백 정리 + 대소문자 무시)"""
+    return " ".join(concept.split()).casefold()
+
+class SQLiteConceptGraph:
+    """
+    개념 그래프 - LLM이 만든 연관 개념(간선)과 심화 문제를 모든 사용자가 공유
+    - concept_nodes: 개념 + 연관 개념/심화 문제 생성 시각 (NULL이면 아직 생성 안 됨)
+    - concept_edges: 개념 → 연관 개념 (rank는 LLM 응답 순서)
+    - concept_questions: 개념별 심화 문제
+    - card_concepts: 카드 ↔ 개념 연결 (카드의 심화 문제 조회용)
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._ensure_tables()
+
+    def _get_conn(self):
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_tables(self):
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS concept_nodes (
+                concept_key TEXT PRIMARY KEY,
+                concept TEXT NOT NULL,
+                related_generated_at TEXT,
+                questions_generated_at TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS concept_edges (
+                source_key TEXT NOT NULL,
+                target_key TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (source_key, target_key)
+            )
+        """)
+        # 역방향 이웃 조회 (그래프는 방향 없이 탐색)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_concept_edges_target ON concept_edges (target_key)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS concept_questions (
+                concept_key TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                PRIMARY KEY (concept_key, position)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS card_concepts (
+                user_id TEXT NOT NULL,
+                deck_id TEXT NOT NULL,
+                card_id TEXT NOT NULL,
+                concept_key TEXT NOT NULL,
+                linked_at TEXT NOT NULL,
+                PRIMARY KEY (user_id, deck_id, card_id)
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _upsert_node(cursor, concept: str) -> str:
+        key = concept_key(concept)
+        cursor.execute(
+            "INSERT OR IGNORE INTO concept_nodes (concept_key, concept) VALUES (?, ?)",
+            (key, " ".join(concept.split()))
+        )
+        return key
+
+    def get_related(self, concept: str) -> Tuple[List[str], Optional[datetime.datetime]]:
+        """(연관 개념 목록, 생성 시각) - 생성된 적 없으면 ([], None)"""
+        key = concept_key(concept)
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT related_generated_at FROM concept_nodes WHERE concept_key = ?", (key,))
+        row = cursor.fetchone()
+        cursor.execute("""
+            SELECT n.concept FROM concept_edges e JOIN concept_nodes n ON n.concept_key = e.target_key
+            WHERE e.source_key = ? ORDER BY e.rank
+        """, (key,))
+        related = [r[0] for r in cursor.fetchall()]
+        conn.close()
+        if row is None or row[0] is None:
+            return [], None
+        return related, datetime.datetime.fromisoformat(row[0])
+
+    def set_related(self, concept: str, related: List[str]) -> None:
+        """연관 개념 교체 (이전 간선 삭제 후 새로 저장)"""
+        now = datetime.datetime.now().isoformat()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        key = self._upsert_node(cursor, concept)
+        cursor.execute("DELETE FROM concept_edges WHERE source_key = ?", (key,))
+        seen: Set[str] = {key}
+        for name in related:
+            target = self._upsert_node(cursor, name)
+            if target in seen:
+                continue
+            seen.add(target)
+            cursor.execute(
+                "INSERT INTO concept_edges (source_key, target_key, rank) VALUES (?, ?, ?)",
+                (key, target, len(seen) - 1)
+            )
+        cursor.execute(
+            "UPDATE concept_nodes SET related_generated_at = ? WHERE concept_key = ?", (now, key)
+        )
+        conn.commit()
+        conn.close()
+
+    def get_questions(self, concept: str) -> Tuple[List[str], Optional[datetime.datetime]]:
+        """(심화 문제 목록, 생성 시각) - 생성된 적 없으면 ([], None)"""
+        key = concept_key(concept)
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT questions_generated_at FROM concept_nodes WHERE concept_key = ?", (key,))
+        row = cursor.fetchone()
+        cursor.execute(
+            "SELECT question FROM concept_questions WHERE concept_key = ? ORDER BY position", (key,)
+        )
+        questions = [r[0] for r in cursor.fetchall()]
+        conn.close()
+        if row is None or row[0] is None:
+            return [], None
+        return questions, datetime.datetime.fromisoformat(row[0])
+
+    def set_questions(self, concept: str, questions: List[str]) -> None:
+        now = datetime.datetime.now().isoformat()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        key = self._upsert_node(cursor, concept)
+        cursor.execute("DELETE FROM concept_questions WHERE concept_key = ?", (key,))
+        cursor.executemany(
+            "INSERT INTO concept_questions (concept_key, position, question) VALUES (?, ?, ?)",
+            [(key, i, q) for i, q in enumerate(questions)]
+        )
+        cursor.execute(
+            "UPDATE concept_nodes SET questions_generated_at = ? WHERE concept_key = ?", (now, key)
+        )
+        conn.commit()
+        conn.close()
+
+    def link_card(self, user_id: str, deck_id: str, card_id: str, concept: str) -> None:
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        key = self._upsert_node(cursor, concept)
+        cursor.execute("""
+            INSERT INTO card_concepts (user_id, deck_id, card_id, concept_key, linked_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, deck_id, card_id) DO UPDATE SET
+                concept_key = excluded.concept_key, linked_at = excluded.linked_at
+        """, (user_id, deck_id, card_id, key, datetime.datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+
+    def get_card_concept(self, user_id: str, deck_id: str, card_id: str) -> Optional[str]:
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT n.concept FROM card_concepts c JOIN concept_nodes n ON n.concept_key = c.concept_key
+            WHERE c.user_id = ? AND c.deck_id = ? AND c.card_id = ?
+        """, (user_id, deck_id, card_id))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def neighbors(self, concept: str, hops: int, limit: int) -> Dict[str, list]:
+        """
+        k-hop 이웃 (방향 무시 BFS, 단계마다 인덱스 조회 한 번) - LLM 호출 없음
+        반환: {"nodes": [{"concept", "depth"}], "edges": [{"source", "target", "rank"}]}
+        """
+        start = concept_key(concept)
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        depths: Dict[str, int] = {}
+        cursor.execute("SELECT 1 FROM concept_nodes WHERE concept_key = ?", (start,))
+        if cursor.fetchone() is not None:
+            depths[start] = 0
+        frontier = list(depths)
+        for depth in range(1, hops + 1):
+            if not frontier or len(depths) >= limit:
+                break
+            marks = ",".join("?" * len(frontier))
+            cursor.execute(f"""
+                SELECT target_key FROM concept_edges WHERE source_key IN ({marks})
+                UNION
+                SELECT source_key FROM concept_edges WHERE target_key IN ({marks})
+            """, frontier + frontier)
+            next_frontier = []
+            for (key,) in cursor.fetchall():
+                if key not in depths and len(depths) < limit:
+                    depths[key] = depth
+                    next_frontier.append(key)
+            frontier = sorted(next_frontier)
+
+        nodes, edges = [], []
+        if depths:
+            keys = list(depths)
+            marks = ",".join("?" * len(keys))
+            cursor.execute(
+                f"SELECT concept_key, concept FROM concept_nodes WHERE concept_key IN ({marks})", keys
+            )
+            names = dict(cursor.fetchall())
+            nodes = [
+                {"concept": names[key], "depth": depth}
+                for key, depth in sorted(depths.items(), key=lambda item: (item[1], names[item[0]]))
+            ]
+            cursor.execute(f"""
+                SELECT source_key, target_key, rank FROM concept_edges
+                WHERE source_key IN ({marks}) AND target_key IN ({marks})
+                ORDER BY source_key, rank
+            """, keys + keys)
+            edges = [
+                {"source": names[source], "target": names[target], "rank": rank}
+                for source, target, rank in cursor.fetchall()
+            ]
+        conn.close()
+        return {"nodes": nodes, "edges": edges}
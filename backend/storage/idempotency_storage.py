@@ -0,0 +1,105 @@
+# backend/storage/idempotency_storage.py
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# claim 결과
+CLAIMED = "claimed"         # 처음 보는 키 → 호출자가 처리 후 complete/release
+COMPLETED = "completed"     # 이미 처리된 키 → response 재사용
+PENDING = "pending"         # 다른 요청이 처리 중
+MISMATCH = "mismatch"       # 같은 키를 다른 요청 내용에 재사용
+
+@dataclass
+class IdempotencyClaim:
+    status: str
+    response: Optional[str] = None
+
+class SQLiteIdempotencyStore:
+    """
+    멱등성 키 저장소 - 재전송된 요청에 원래 응답(JSON)을 돌려주기 위함
+    - 워커 간 공유를 위해 SQLite에 보관, 시각은 epoch 초
+    - fingerprint로 같은 키가 다른 요청 본문에 재사용되는 것을 막는다
+    """
+
+    def __init__(self, db_path: str, ttl_sec: float, stale_after_sec: float):
+        self.db_path = db_path
+        self.ttl_sec = ttl_sec
+        self.stale_after_sec = stale_after_sec
+        self._ensure_table()
+
+    def _get_conn(self):
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_table(self):
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                response TEXT,
+                started_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (scope, key)
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_idempotency_expires ON idempotency_keys(expires_at)"
+        )
+        conn.commit()
+        conn.close()
+
+    def claim(self, scope: str, key: str, fingerprint: str) -> IdempotencyClaim:
+        """키 선점 시도 - 만료된 키와 오래 방치된 처리 중 표시는 새로 선점할 수 있다"""
+        now = time.time()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+        cursor.execute(
+            "SELECT fingerprint, response, started_at FROM idempotency_keys WHERE scope = ? AND key = ?",
+            (scope, key),
+        )
+        row = cursor.fetchone()
+        if row is None or (row[1] is None and row[0] == fingerprint and row[2] <= now - self.stale_after_sec):
+            cursor.execute("""
+                INSERT INTO idempotency_keys (scope, key, fingerprint, response, started_at, expires_at)
+                VALUES (?, ?, ?, NULL, ?, ?)
+                ON CONFLICT(scope, key) DO UPDATE SET
+                    started_at = excluded.started_at, expires_at = excluded.expires_at
+            """, (scope, key, fingerprint, now, now + self.ttl_sec))
+            claim = IdempotencyClaim(CLAIMED)
+        elif row[0] != fingerprint:
+            claim = IdempotencyClaim(MISMATCH)
+        elif row[1] is None:
+            claim = IdempotencyClaim(PENDING)
+        else:
+            claim = IdempotencyClaim(COMPLETED, row[1])
+        conn.commit()
+        conn.close()
+        return claim
+
+    def complete(self, scope: str, key: str, response: str) -> None:
+        """처리 결과 저장 (만료 시각은 완료 시점부터 ttl)"""
+        now = time.time()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE idempotency_keys SET response = ?, expires_at = ? WHERE scope = ? AND key = ?",
+            (response, now + self.ttl_sec, scope, key),
+        )
+        conn.commit()
+        conn.close()
+
+    def release(self, scope: str, key: str) -> None:
+        """처리 실패 시 선점 해제 - 같은 키로 다시 시도할 수 있게"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "DELETE FROM idempotency_keys WHERE scope = ? AND key = ? AND response IS NULL",
+            (scope, key),
+        )
+        conn.commit()
+        conn.close()
@@ -0,0 +1,68 @@
+# backend/storage/lease_storage.py
+import sqlite3
+import time
+from typing import Optional
+
+class SQLiteLease:
+    """
+    리더 임대(lease) - 이름별로 한 holder만 만료 시각까지 보유
+    - 보유자가 죽어 갱신이 끊기면 만료 후 다른 프로세스가 가져간다
+    - 프로세스 간 비교를 위해 만료 시각은 epoch 초로 저장
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._ensure_table()
+
+    def _get_conn(self):
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_table(self):
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS leader_lease (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def try_acquire(self, name: str, holder: str, ttl_sec: float) -> bool:
+        """비어 있거나 만료됐거나 이미 보유 중이면 (재)획득 후 True"""
+        now = time.time()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT holder, expires_at FROM leader_lease WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        acquired = row is None or row[0] == holder or row[1] <= now
+        if acquired:
+            cursor.execute("""
+                INSERT INTO leader_lease (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            """, (name, holder, now + ttl_sec))
+        conn.commit()
+        conn.close()
+        return acquired
+
+    def release(self, name: str, holder: str) -> None:
+        """보유 중일 때만 반납 (다음 후보가 만료를 기다리지 않도록)"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM leader_lease WHERE name = ? AND holder = ?", (name, holder))
+        conn.commit()
+        conn.close()
+
+    def get_holder(self, name: str) -> Optional[str]:
+        """현재 유효한 보유자 (없으면 None)"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT holder FROM leader_lease WHERE name = ? AND expires_at > ?", (name, time.time())
+        )
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
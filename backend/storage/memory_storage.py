@@ -1,42 +1,265 @@
 """메모리 기반 저장소 구현"""
-from typing import Dict, List, Optional
-from interfaces.storage_interface import ICardStorage
+import dataclasses
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from interfaces.storage_interface import ICardStorage, CardConflictError, CardNotFoundError
 from models.card import MemorizationCard
+from models.review_history import ReviewHistory
+from models.review import ReviewEvent, ReviewRecord
+from storage.snapshot import encode_card, read_snapshot, write_snapshot
+
+# SQLite LIKE와 같은 비교: ASCII 문자만 대소문자 무시 (한글/기타 문자는 그대로)
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def _ascii_lower(text: str) -> str:
+    return text.translate(_ASCII_LOWER)
+
+def _copy_card(card: MemorizationCard) -> MemorizationCard:
+    """저장소 안팎 카드 분리 - 호출자가 고친 카드가 저장 전에 저장소 상태를 바꾸지 않도록"""
+    history = card.review_history
+    history = history.copy() if isinstance(history, ReviewHistory) else list(history)
+    return dataclasses.replace(card, review_history=history)
 
 class MemoryCardStorage(ICardStorage):
-    """메모리 기반 카드 저장소 - LSP, ISP 준수"""
+    """
+    메모리 기반 카드 저장소 - LSP, ISP 준수
+    - 저장/조회 모두 복사본을 주고받아 버전 비교(CAS)가 SQLite 저장소와 같게 동작한다
+    """
     
     def __init__(self):
         self._cards: Dict[str, MemorizationCard] = {}
+        self._change_counter = 0
+        self._last_modified = datetime.now()
+        # (일, 카드 유형, 단계) → [복습, 정답, 진급, 리셋]
+        self._rollup: Dict[Tuple[str, str, int], List[int]] = {}
+        # 백그라운드 스냅샷 스레드와 변경 작업 직렬화
+        self._lock = threading.RLock()
     
     def save_card(self, card: MemorizationCard) -> None:
-        """카드 저장"""
-        self._cards[card.card_id] = card
+        """카드 저장 (버전 확인 없음)"""
+        with self._lock:
+            stored = self._cards.get(card.card_id)
+            card.version = (stored.version if stored is not None else 0) + 1
+            self._cards[card.card_id] = _copy_card(card)
+            self._bump_change_counter()
+
+    def _compare_and_set(self, card: MemorizationCard) -> None:
+        """저장된 카드 버전이 card.version과 같을 때만 교체 (삭제됐으면 CardNotFoundError)"""
+        stored = self._cards.get(card.card_id)
+        if stored is None:
+            raise CardNotFoundError(card.card_id)
+        if stored.version != card.version:
+            raise CardConflictError(card.card_id)
+        card.version += 1
+        self._cards[card.card_id] = _copy_card(card)
+        self._bump_change_counter()
     
     def get_card(self, card_id: str) -> Optional[MemorizationCard]:
-        """카드 조회"""
-        return self._cards.get(card_id)
+        """카드 조회 (복사본)"""
+        with self._lock:
+            card = self._cards.get(card_id)
+            return _copy_card(card) if card is not None else None
     
     def get_all_cards(self) -> List[MemorizationCard]:
-        """모든 카드 조회"""
-        return list(self._cards.values())
+        """모든 카드 조회 (복사본)"""
+        with self._lock:
+            return [_copy_card(card) for card in self._cards.values()]
     
     def update_card(self, card: MemorizationCard) -> None:
-        """카드 업데이트"""
-        if card.card_id in self._cards:
-            self._cards[card.card_id] = card
+        """카드 업데이트 - 버전 충돌 시 CardConflictError, 삭제됐으면 CardNotFoundError"""
+        with self._lock:
+            self._compare_and_set(card)
     
     def delete_card(self, card_id: str) -> bool:
         """카드 삭제"""
-        if card_id in self._cards:
-            del self._cards[card_id]
-            return True
-        return False
+        with self._lock:
+            if card_id in self._cards:
+                del self._cards[card_id]
+                self._bump_change_counter()
+                return True
+            return False
     
     def get_due_cards(self) -> List[MemorizationCard]:
-        """복습 예정 카드 조회"""
-        return [card for card in self._cards.values() if card.is_due_for_review()]
+        """복습 예정 카드 조회 (복사본)"""
+        with self._lock:
+            return [_copy_card(card) for card in self._cards.values() if card.is_due_for_review()]
         
     def get_cards_count(self) -> int:
         """카드 개수 조회"""
         return len(self._cards)
+
+    def query_cards(
+        self,
+        card_type: Optional[str] = None,
+        stage: Optional[int] = None,
+        due: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor_id: Optional[str] = None,
+    ) -> List[MemorizationCard]:
+        """필터 + 커서 기반 페이지 조회 (card_id 오름차순, 복사본)"""
+        with self._lock:
+            cards = sorted(self._cards.values(), key=lambda c: c.card_id)
+        result = []
+        for card in cards:
+            if cursor_id is not None and card.card_id <= cursor_id:
+                continue
+            if card_type is not None and card.card_type != card_type:
+                continue
+            if stage is not None and card.stage != stage:
+                continue
+            if due is not None and card.is_due_for_review() != due:
+                continue
+            if prefix and not _ascii_lower(card.concept).startswith(_ascii_lower(prefix)):
+                continue
+            result.append(_copy_card(card))
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def search_cards(self, query: str, limit: int = 20, offset: int = 0) -> List[MemorizationCard]:
+        """concept/answer 부분 일치 검색 (모든 검색어 포함, 개념 접두어 > 개념 포함 > 짧은 개념 순)"""
+        needle = query.strip().lower()
+        terms = needle.split()
+        with self._lock:
+            matches = [
+                card for card in self._cards.values()
+                if all(t in card.concept.lower() or t in card.answer.lower() for t in terms)
+            ]
+        matches.sort(key=lambda c: (
+            not c.concept.lower().startswith(needle),
+            needle not in c.concept.lower(),
+            len(c.concept),
+            c.card_id,
+        ))
+        return [_copy_card(card) for card in matches[offset:offset + limit]]
+
+    def save_review(self, card: MemorizationCard, event: ReviewEvent) -> None:
+        """복습 결과 저장 + 롤업 갱신"""
+        with self._lock:
+            self._compare_and_set(card)
+            key = (event.timestamp.date().isoformat(), event.card_type, event.stage)
+            counts = self._rollup.setdefault(key, [0, 0, 0, 0])
+            counts[0] += 1
+            counts[1] += int(event.is_correct)
+            counts[2] += int(event.promoted)
+            counts[3] += int(event.reset)
+
+    def get_stats(self, days: int = 30) -> Dict[str, Any]:
+        """덱 통계"""
+        with self._lock:
+            cards = list(self._cards.values())
+            rollup = list(self._rollup.items())
+        by_stage: Dict[int, int] = {}
+        by_type: Dict[str, int] = {}
+        for card in cards:
+            by_stage[card.stage] = by_stage.get(card.stage, 0) + 1
+            by_type[card.card_type] = by_type.get(card.card_type, 0) + 1
+
+        since = (datetime.now().date() - timedelta(days=days - 1)).isoformat()
+        daily: Dict[str, List[int]] = {}
+        accuracy: Dict[Tuple[str, int], List[int]] = {}
+        for (day, card_type, stage), counts in rollup:
+            if day >= since:
+                daily_counts = daily.setdefault(day, [0, 0, 0, 0])
+                for i, value in enumerate(counts):
+                    daily_counts[i] += value
+            accuracy_counts = accuracy.setdefault((card_type, stage), [0, 0, 0, 0])
+            for i, value in enumerate(counts):
+                accuracy_counts[i] += value
+
+        return {
+            "total": len(cards),
+            "by_stage": by_stage,
+            "by_type": by_type,
+            "average_success_rate": sum(c.get_success_rate() for c in cards) / len(cards) if cards else 0,
+            "due_count": sum(1 for c in cards if c.is_due_for_review()),
+            "daily": [
+                {"day": day, "reviews": r, "correct": c, "promotions": p, "resets": x}
+                for day, (r, c, p, x) in sorted(daily.items())
+            ],
+            "accuracy": [
+                {
+                    "card_type": card_type,
+                    "stage": stage,
+                    "reviews": r,
+                    "correct": c,
+                    "accuracy": c / r if r else 0.0,
+                    "promotions": p,
+                    "resets": x,
+                }
+                for (card_type, stage), (r, c, p, x) in sorted(accuracy.items())
+            ],
+        }
+
+    def count_due_by_bucket(
+        self,
+        start: datetime,
+        end: datetime,
+        bucket: str = "day",
+        include_overdue: bool = False,
+    ) -> Dict[str, int]:
+        """구간 복습 예정 카드 수 (버킷별)"""
+        width = 13 if bucket == "hour" else 10
+        counts: Dict[str, int] = {}
+        with self._lock:
+            cards = list(self._cards.values())
+        for card in cards:
+            if card.next_review is None or card.next_review >= end:
+                continue
+            if card.next_review < start:
+                if not include_overdue:
+                    continue
+                key = "overdue"
+            else:
+                key = card.next_review.isoformat()[:width]
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def iter_review_history(self, card_id: str, include_archived: bool = True) -> Optional[Iterator[ReviewRecord]]:
+        """복습 이력 순회 - 메모리 저장소는 보관소가 없어 인라인 이력이 전부"""
+        with self._lock:
+            card = self._cards.get(card_id)
+            if card is None:
+                return None
+            records = list(card.review_history)
+        return iter(records)
+
+    def get_change_counter(self) -> int:
+        """덱 변경 카운터"""
+        return self._change_counter
+
+    def _bump_change_counter(self) -> None:
+        """변경 카운터 + 마지막 변경 시각 갱신 (잠금 보유 상태에서 호출)"""
+        self._change_counter += 1
+        self._last_modified = datetime.now()
+
+    def get_last_modified(self) -> datetime:
+        """덱 마지막 변경 시각"""
+        return self._last_modified
+
+    def encode_snapshot(self) -> Tuple[List[bytes], int]:
+        """잠금 안에서 모든 카드를 직렬화 - (카드별 바이트, 변경 카운터)"""
+        with self._lock:
+            return [encode_card(card) for card in self._cards.values()], self._change_counter
+
+    def save_snapshot(self, path: str) -> int:
+        """바이너리 스냅샷 저장 (원자적 교체) - 기록한 바이트 수 반환"""
+        records, counter = self.encode_snapshot()
+        return write_snapshot(path, records, counter)
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        스냅샷에서 카드 복원 - 복원한 카드 수 반환
+        끝까지 읽고 체크섬이 맞을 때만 교체하므로 손상된 파일이면 SnapshotError와 함께 기존 상태 유지
+        (롤업 통계는 스냅샷에 포함되지 않는다)
+        """
+        with open(path, "rb") as f:
+            change_counter, cards = read_snapshot(f)
+            loaded = {card.card_id: card for card in cards}
+        with self._lock:
+            self._cards = loaded
+            self._change_counter = max(self._change_counter, change_counter)
+            self._last_modified = datetime.now()
+        return len(loaded)
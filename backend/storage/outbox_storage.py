@@ -0,0 +1,186 @@
+# backend/storage/outbox_storage.py
+import sqlite3
+import json
+import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_DELIVERED = "delivered"
+STATUS_FAILED = "failed"
+
+@dataclass
+class OutboxMessage:
+    """웹훅 전송 대기 메시지"""
+    message_id: int
+    url: str
+    payload: dict
+    attempts: int
+
+class SQLiteWebhookOutbox:
+    """웹훅 메시지 아웃박스 - 전송 전에 먼저 DB에 기록해 유실을 막는다"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._ensure_table()
+
+    def _get_conn(self):
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_table(self):
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS webhook_outbox (
+                message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT NOT NULL,
+                last_error TEXT,
+                created_at TEXT NOT NULL,
+                delivered_at TEXT,
+                updated_at TEXT
+            )
+        """)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(webhook_outbox)")}
+        if "updated_at" not in columns:
+            # 기존 DB: 상태 변경 시각 컬럼 추가 (보관 기간 정리 기준)
+            cursor.execute("ALTER TABLE webhook_outbox ADD COLUMN updated_at TEXT")
+            cursor.execute("UPDATE webhook_outbox SET updated_at = COALESCE(delivered_at, created_at)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outbox_status_next
+            ON webhook_outbox (status, next_attempt_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outbox_status_updated
+            ON webhook_outbox (status, updated_at)
+        """)
+        conn.commit()
+        conn.close()
+
+    def enqueue(self, url: str, payload: dict) -> int:
+        """메시지 적재 후 message_id 반환"""
+        now_iso = datetime.datetime.now().isoformat()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO webhook_outbox (url, payload, status, attempts, next_attempt_at, created_at, updated_at)
+            VALUES (?, ?, ?, 0, ?, ?, ?)
+        """, (url, json.dumps(payload), STATUS_QUEUED, now_iso, now_iso, now_iso))
+        message_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return message_id
+
+    def claim_ready(self, limit: int) -> List[OutboxMessage]:
+        """전송 시각이 된 메시지를 sending 상태로 가져온다"""
+        now_iso = datetime.datetime.now().isoformat()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("""
+            SELECT message_id, url, payload, attempts FROM webhook_outbox
+            WHERE status = ? AND next_attempt_at <= ?
+            ORDER BY next_attempt_at, message_id
+            LIMIT ?
+        """, (STATUS_QUEUED, now_iso, limit))
+        rows = cursor.fetchall()
+        cursor.executemany(
+            "UPDATE webhook_outbox SET status = ? WHERE message_id = ?",
+            [(STATUS_SENDING, row[0]) for row in rows]
+        )
+        conn.commit()
+        conn.close()
+        return [
+            OutboxMessage(message_id=row[0], url=row[1], payload=json.loads(row[2]), attempts=row[3])
+            for row in rows
+        ]
+
+    def mark_delivered(self, message_id: int) -> None:
+        now_iso = datetime.datetime.now().isoformat()
+        self._execute(
+            "UPDATE webhook_outbox SET status = ?, attempts = attempts + 1, delivered_at = ?, updated_at = ?, "
+            "last_error = NULL WHERE message_id = ?",
+            (STATUS_DELIVERED, now_iso, now_iso, message_id)
+        )
+
+    def mark_retry(self, message_id: int, next_attempt_at: datetime.datetime,
+                   error: str, count_attempt: bool = True) -> None:
+        """다음 시도 시각을 지정해 다시 대기열로 돌려보낸다"""
+        self._execute(
+            "UPDATE webhook_outbox SET status = ?, attempts = attempts + ?, next_attempt_at = ?, last_error = ?, "
+            "updated_at = ? WHERE message_id = ?",
+            (STATUS_QUEUED, 1 if count_attempt else 0, next_attempt_at.isoformat(), error,
+             datetime.datetime.now().isoformat(), message_id)
+        )
+
+    def mark_failed(self, message_id: int, error: str) -> None:
+        self._execute(
+            "UPDATE webhook_outbox SET status = ?, attempts = attempts + 1, last_error = ?, updated_at = ? "
+            "WHERE message_id = ?",
+            (STATUS_FAILED, error, datetime.datetime.now().isoformat(), message_id)
+        )
+
+    def requeue_in_flight(self) -> int:
+        """비정상 종료로 sending 상태에 남은 메시지를 대기열로 복구"""
+        return self._execute(
+            "UPDATE webhook_outbox SET status = ? WHERE status = ?",
+            (STATUS_QUEUED, STATUS_SENDING)
+        )
+
+    def next_attempt_time(self) -> Optional[datetime.datetime]:
+        """대기 중인 메시지의 가장 이른 전송 시각"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT MIN(next_attempt_at) FROM webhook_outbox WHERE status = ?",
+            (STATUS_QUEUED,)
+        )
+        value = cursor.fetchone()[0]
+        conn.close()
+        return datetime.datetime.fromisoformat(value) if value else None
+
+    def pending_count(self) -> int:
+        """전송 대기 + 전송 중 메시지 수 (상태 인덱스만 사용 - 게이지용)"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM webhook_outbox WHERE status IN (?, ?)",
+            (STATUS_QUEUED, STATUS_SENDING)
+        )
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    def purge_finished(self, before: datetime.datetime) -> int:
+        """before 이전에 끝난 delivered / failed 메시지 삭제 후 삭제 수 반환"""
+        return self._execute(
+            "DELETE FROM webhook_outbox WHERE status IN (?, ?) AND updated_at < ?",
+            (STATUS_DELIVERED, STATUS_FAILED, before.isoformat())
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 메시지 수"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT status, COUNT(*) FROM webhook_outbox GROUP BY status")
+        rows = dict(cursor.fetchall())
+        conn.close()
+        return {
+            STATUS_QUEUED: rows.get(STATUS_QUEUED, 0),
+            STATUS_SENDING: rows.get(STATUS_SENDING, 0),
+            STATUS_DELIVERED: rows.get(STATUS_DELIVERED, 0),
+            STATUS_FAILED: rows.get(STATUS_FAILED, 0),
+        }
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        affected = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return affected
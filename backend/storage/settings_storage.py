@@ -0,0 +1,90 @@
+# backend/storage/settings_storage.py
+import sqlite3
+import datetime
+from typing import Dict, Optional
+
+class SQLiteSettingsStore:
+    """
+    워커 간 공유 설정 (key-value)
+    - 값이 바뀔 때마다 version이 증가 → 다른 프로세스는 version만 조회해 변경 감지
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._ensure_table()
+
+    def _get_conn(self):
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_table(self):
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS app_settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM app_settings WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else default
+
+    def get_all(self) -> Dict[str, str]:
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT key, value FROM app_settings")
+        rows = dict(cursor.fetchall())
+        conn.close()
+        return rows
+
+    def set(self, key: str, value: str) -> int:
+        """값 저장 후 새 version 반환"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM app_settings")
+        version = cursor.fetchone()[0]
+        cursor.execute("""
+            INSERT INTO app_settings (key, value, version, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value,
+                version = excluded.version,
+                updated_at = excluded.updated_at
+        """, (key, value, version, datetime.datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        return version
+
+    def set_default(self, key: str, value: str) -> bool:
+        """값이 없을 때만 저장 (기존 설정 파일 마이그레이션용)"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM app_settings")
+        version = cursor.fetchone()[0]
+        cursor.execute(
+            "INSERT OR IGNORE INTO app_settings (key, value, version, updated_at) VALUES (?, ?, ?, ?)",
+            (key, value, version, datetime.datetime.now().isoformat())
+        )
+        inserted = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return inserted
+
+    def get_version(self) -> int:
+        """설정 전체 version (변경 감지용)"""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM app_settings")
+        version = cursor.fetchone()[0]
+        conn.close()
+        return version
@@ -0,0 +1,134 @@
+"""사용자별 SQLite 샤드 라우터 - 샤드는 필요할 때 열고 열린 연결 수는 LRU로 제한"""
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from config.settings import StorageConfig
+from interfaces.storage_interface import ICardStorageProvider
+from storage.sqlite_storage import SQLiteCardStorage, DEFAULT_DECK_ID
+from utils.metrics import record_cache, OPEN_SHARDS
+
+DEFAULT_USER_ID = "default"
+
+class SQLiteShard:
+    """
+    샤드 파일 하나 - 연결은 처음 사용할 때 열고 close() 후 다시 쓰면 재연결
+    - 같은 샤드 작업은 lock으로 직렬화 (연결을 스레드 간 공유)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def connection(self) -> sqlite3.Connection:
+        """lock 보유 상태에서 호출"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def close(self) -> None:
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class SQLiteShardRouter(ICardStorageProvider):
+    """
+    (user_id, deck_id) → 카드 저장소
+    - 기본 사용자는 기존 cards.db, 그 외 사용자는 shard_dir/{user_id}.db
+    - 덱은 샤드 안의 deck_id 컬럼으로 구분
+    - 열린 샤드 연결은 max_open_shards개까지만 유지 (오래 안 쓴 것부터 닫음)
+    """
+
+    def __init__(self, storage_config: StorageConfig | None = None):
+        self.cfg = storage_config or StorageConfig()
+        self._shards: "OrderedDict[str, SQLiteShard]" = OrderedDict()
+        self._storages: "OrderedDict[Tuple[str, str], SQLiteCardStorage]" = OrderedDict()
+        self._lock = threading.Lock()
+        OPEN_SHARDS.set_function(lambda: {(): self.open_shard_count()})
+
+    def shard_path(self, user_id: str) -> str:
+        if user_id == DEFAULT_USER_ID:
+            return self.cfg.default_db_path
+        return os.path.join(self.cfg.shard_dir, f"{user_id}.db")
+
+    def _acquire_shard(self, user_id: str) -> SQLiteShard:
+        """샤드 조회 + 최근 사용 표시, 한도를 넘으면 가장 오래된 샤드 연결 종료"""
+        evicted: List[SQLiteShard] = []
+        with self._lock:
+            shard = self._shards.get(user_id)
+            if shard is None:
+                path = self.shard_path(user_id)
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                shard = SQLiteShard(path)
+                self._shards[user_id] = shard
+            self._shards.move_to_end(user_id)
+            while len(self._shards) > self.cfg.max_open_shards:
+                _, old = self._shards.popitem(last=False)
+                evicted.append(old)
+        # 사용 중인 샤드는 lock이 풀린 뒤 닫힌다 (다음 사용 시 재연결)
+        for old in evicted:
+            old.close()
+        return shard
+
+    def get_storage(self, user_id: str = DEFAULT_USER_ID, deck_id: str = DEFAULT_DECK_ID) -> SQLiteCardStorage:
+        key = (user_id, deck_id)
+        with self._lock:
+            storage = self._storages.get(key)
+            if storage is not None:
+                self._storages.move_to_end(key)
+        record_cache("deck_storage", storage is not None)
+        if storage is not None:
+            return storage
+
+        storage = SQLiteCardStorage(
+            self.shard_path(user_id),
+            deck_id=deck_id,
+            shard_provider=lambda: self._acquire_shard(user_id),
+            shared_change_counter=self.cfg.shared_change_counter
+        )
+        with self._lock:
+            # 동시에 만들어졌으면 먼저 등록된 것을 사용 (변경 카운터를 하나로 유지)
+            storage = self._storages.setdefault(key, storage)
+            self._storages.move_to_end(key)
+            while len(self._storages) > self.cfg.max_cached_decks:
+                self._storages.popitem(last=False)
+        return storage
+
+    def list_decks(self, user_id: str = DEFAULT_USER_ID) -> List[str]:
+        if user_id != DEFAULT_USER_ID and not os.path.exists(self.shard_path(user_id)):
+            return []
+        return self.get_storage(user_id, DEFAULT_DECK_ID).list_decks()
+
+    def list_users(self) -> List[str]:
+        """샤드 파일이 있는 사용자 목록 (기본 사용자 포함)"""
+        users = [DEFAULT_USER_ID] if os.path.exists(self.cfg.default_db_path) else []
+        if os.path.isdir(self.cfg.shard_dir):
+            users.extend(sorted(
+                name[:-3] for name in os.listdir(self.cfg.shard_dir)
+                if name.endswith(".db") and name[:-3] != DEFAULT_USER_ID
+            ))
+        return users
+
+    def open_shard_count(self) -> int:
+        with self._lock:
+            return sum(1 for shard in self._shards.values() if shard.is_open)
+
+    def close(self) -> None:
+        """열린 샤드 연결 모두 종료"""
+        with self._lock:
+            shards = list(self._shards.values())
+            self._shards.clear()
+        for shard in shards:
+            shard.close()
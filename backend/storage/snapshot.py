@@ -0,0 +1,240 @@
+"""
+메모리 저장소 바이너리 스냅샷 - 재시작 시 JSON 파싱 없이 빠르게 복원
+
+파일 형식 (little-endian, 버전 2)
+    헤더   : MAGIC(4) | version u16 | reserved u16 | change_counter u64 | created_at i64 | card_count u32
+    카드   : card_id, concept, answer, card_type (u32 길이 + UTF-8)
+             stage i8 | next_review i64 (epoch 마이크로초, 없으면 NO_TIME) | version u64 (버전 2부터)
+             history_len u32 | timestamps i64[n] | stages i8[n] | correct 비트셋[ceil(n/8)]
+             answers (u32 길이 + UTF-8)[n]
+             feedback_table_len u32 | feedbacks (u32 길이 + UTF-8)[k] | feedback 인덱스 u32[n]
+    푸터   : 앞 전체 바이트의 CRC32 u32
+카드 단위로 앞에서부터 순차 읽기(stream load)가 가능하다.
+버전 1 파일도 읽을 수 있다 (카드 버전은 1로 복원).
+"""
+import datetime
+import os
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from models.card import MemorizationCard
+from models.review_history import ReviewHistory, to_epoch_us, from_epoch_us
+
+MAGIC = b"MCSN"
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+NO_TIME = -(2 ** 63)
+
+_HEADER = struct.Struct("<4sHHQqI")
+_U32 = struct.Struct("<I")
+_CARD_FIXED = struct.Struct("<bq")
+_CARD_VERSION = struct.Struct("<Q")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+class SnapshotError(Exception):
+    """스냅샷 파일 손상 / 버전 불일치"""
+
+def _le_bytes(values: array) -> bytes:
+    if _LITTLE_ENDIAN:
+        return values.tobytes()
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+def _le_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+def _pack_str(out: List[bytes], value: str) -> None:
+    raw = value.encode("utf-8")
+    out.append(_U32.pack(len(raw)))
+    out.append(raw)
+
+def encode_card(card: MemorizationCard) -> bytes:
+    out: List[bytes] = []
+    for value in (card.card_id, card.concept, card.answer, card.card_type):
+        _pack_str(out, value)
+    next_review = to_epoch_us(card.next_review) if card.next_review else NO_TIME
+    out.append(_CARD_FIXED.pack(card.stage, next_review))
+    out.append(_CARD_VERSION.pack(card.version))
+
+    history = card.review_history
+    if not isinstance(history, ReviewHistory):
+        history = ReviewHistory(history)
+    timestamps, stages, correct, answers, feedbacks = history.to_columns()
+    # append는 feedbacks를 마지막에 채우므로 그 길이까지만 기록 (추가 중인 기록은 다음 스냅샷에)
+    n = len(feedbacks)
+    out.append(_U32.pack(n))
+    out.append(_le_bytes(timestamps[:n]))
+    out.append(stages[:n].tobytes())
+    out.append(bytes(correct[:(n + 7) // 8]))
+    for answer in answers[:n]:
+        _pack_str(out, answer)
+
+    table: Dict[str, int] = {}
+    indices = array("I", (table.setdefault(f, len(table)) for f in feedbacks[:n]))
+    out.append(_U32.pack(len(table)))
+    for feedback in table:
+        _pack_str(out, feedback)
+    out.append(_le_bytes(indices))
+    return b"".join(out)
+
+class _CrcReader:
+    """읽은 바이트의 CRC32를 누적하는 리더"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.crc = 0
+
+    def read(self, size: int) -> bytes:
+        data = self.stream.read(size)
+        if len(data) != size:
+            raise SnapshotError("snapshot is truncated")
+        self.crc = zlib.crc32(data, self.crc)
+        return data
+
+    def u32(self) -> int:
+        return _U32.unpack(self.read(4))[0]
+
+    def string(self) -> str:
+        return self.read(self.u32()).decode("utf-8")
+
+def _decode_card(reader: _CrcReader, format_version: int) -> MemorizationCard:
+    card_id, concept, answer, card_type = (reader.string() for _ in range(4))
+    stage, next_review = _CARD_FIXED.unpack(reader.read(_CARD_FIXED.size))
+    # 버전 1 스냅샷에는 카드 버전이 없다 - 저장된 적 있는 카드이므로 1
+    version = _CARD_VERSION.unpack(reader.read(_CARD_VERSION.size))[0] if format_version >= 2 else 1
+
+    n = reader.u32()
+    timestamps = _le_array("q", reader.read(8 * n))
+    stages = array("b")
+    stages.frombytes(reader.read(n))
+    correct = bytearray(reader.read((n + 7) // 8))
+    answers = [reader.string() for _ in range(n)]
+    table = [reader.string() for _ in range(reader.u32())]
+    indices = _le_array("I", reader.read(4 * n))
+
+    return MemorizationCard(
+        concept=concept,
+        answer=answer,
+        card_type=card_type,
+        card_id=card_id,
+        stage=stage,
+        next_review=from_epoch_us(next_review) if next_review != NO_TIME else None,
+        version=version,
+        review_history=ReviewHistory.from_columns(
+            timestamps, stages, correct, answers, [table[i] for i in indices]
+        ),
+    )
+
+def read_snapshot(stream: BinaryIO) -> Tuple[int, Iterator[MemorizationCard]]:
+    """
+    (change_counter, 카드 이터레이터) 반환 - 카드를 하나씩 읽는다
+    CRC는 마지막 카드를 읽은 뒤 검증하므로, 전부 소비한 뒤에 반영해야 안전하다
+    """
+    reader = _CrcReader(stream)
+    magic, version, _, change_counter, _, count = _HEADER.unpack(reader.read(_HEADER.size))
+    if magic != MAGIC:
+        raise SnapshotError("not a card snapshot")
+    if version not in SUPPORTED_VERSIONS:
+        raise SnapshotError(f"unsupported snapshot version {version}")
+
+    def cards() -> Iterator[MemorizationCard]:
+        for _ in range(count):
+            try:
+                card = _decode_card(reader, version)
+            except (UnicodeDecodeError, IndexError, ValueError, struct.error) as e:
+                raise SnapshotError(f"snapshot is corrupted: {e}") from e
+            yield card
+        expected = reader.crc
+        footer = stream.read(4)
+        if len(footer) != 4 or _U32.unpack(footer)[0] != expected:
+            raise SnapshotError("snapshot checksum mismatch")
+
+    return change_counter, cards()
+
+def write_snapshot(path: str, records: List[bytes], change_counter: int) -> int:
+    """
+    encode_card 결과를 임시 파일에 쓰고 fsync 후 rename (원자적 교체) - 기록한 바이트 수 반환
+    인코딩은 저장소 잠금 안에서 끝내고, 느린 디스크 I/O는 잠금 밖에서 한다
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, change_counter, to_epoch_us(datetime.datetime.now()), len(records)
+    )
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            crc = zlib.crc32(header)
+            f.write(header)
+            size += len(header)
+            for data in records:
+                crc = zlib.crc32(data, crc)
+                f.write(data)
+                size += len(data)
+            f.write(_U32.pack(crc))
+            size += 4
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return size
+
+class SnapshotScheduler:
+    """
+    interval_sec마다 변경이 있으면 백그라운드에서 스냅샷 저장, stop() 시 마지막으로 한 번 더 저장
+    storage는 encode_snapshot() / get_change_counter()를 제공해야 한다 (MemoryCardStorage)
+    """
+
+    def __init__(self, storage, path: str, interval_sec: float):
+        self.storage = storage
+        self.path = path
+        self.interval_sec = interval_sec
+        self._saved_counter: Optional[int] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._saved_counter = self.storage.get_change_counter()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.save_if_changed()
+
+    def save_if_changed(self) -> bool:
+        with self._lock:
+            if self.storage.get_change_counter() == self._saved_counter:
+                return False
+            records, counter = self.storage.encode_snapshot()
+            write_snapshot(self.path, records, counter)
+            self._saved_counter = counter
+            return True
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval_sec):
+            try:
+                self.save_if_changed()
+            except OSError:
+                # 디스크 오류는 다음 주기에 재시도
+                continue
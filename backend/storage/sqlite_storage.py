@@ -2,39 +2,327 @@
 import sqlite3
 import json
 import datetime
-from typing import List, Optional
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from interfaces.storage_interface import ICardStorage, CardConflictError, CardNotFoundError
 from models.card import MemorizationCard
-from models.review import ReviewRecord
+from models.review import ReviewRecord, ReviewEvent
+from models.review_history import ReviewHistory
+from utils.metrics import timed
 
-class SQLiteCardStorage:
-    def __init__(self, db_path: str):
+# load_card가 기대하는 컬럼 순서
+CARD_COLUMNS = (
+    "card_id, concept, answer, card_type, stage, next_review, review_history, version, "
+    "archived_count, archived_correct"
+)
+# 조인 쿼리용 (cards 별칭 c)
+CARD_COLUMNS_C = ", ".join(f"c.{column}" for column in CARD_COLUMNS.split(", "))
+
+# 검색 색인 토크나이저 - trigram은 한국어처럼 공백 단위가 아닌 부분 문자열 검색에 맞다 (SQLite 3.34+)
+FTS_TOKENIZERS = ("trigram", "unicode61")
+
+DEFAULT_DECK_ID = "default"
+
+def _escape_like(text: str) -> str:
+    """LIKE 패턴 문자 이스케이프 (ESCAPE '\\')"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class SQLiteCardStorage(ICardStorage):
+    """
+    SQLite 카드 저장소 - 하나의 덱(deck_id) 범위로 동작
+    - shard_provider가 없으면 db_path에 작업마다 연결을 새로 연다
+    - shard_provider가 있으면 샤드 라우터가 관리하는 공유 연결을 빌려 쓴다
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        deck_id: str = DEFAULT_DECK_ID,
+        shard_provider: Optional[Callable[[], "SQLiteShard"]] = None,
+        shared_change_counter: bool = False
+    ):
         self.db_path = db_path
+        self.deck_id = deck_id
+        self._shard_provider = shard_provider
+        # 다른 프로세스도 같은 DB에 쓰면 메모리 카운터를 믿을 수 없다
+        self._shared_change_counter = shared_change_counter
+        # 사용 가능한 검색 색인 토크나이저 (FTS5가 없으면 None → LIKE 검색)
+        self._fts_tokenizer: Optional[str] = None
         self._ensure_table()
+        self._change_counter, self._last_modified = self._load_change_counter()
 
-    def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+    @contextmanager
+    def _connection(self):
+        """트랜잭션 단위 연결 - 정상 종료 시 commit, 예외 시 rollback"""
+        if self._shard_provider is not None:
+            shard = self._shard_provider()
+            with shard.lock:
+                conn = shard.connection()
+                try:
+                    yield conn
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
     def _ensure_table(self):
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cards (
+                    card_id TEXT PRIMARY KEY,
+                    concept TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    card_type TEXT NOT NULL,
+                    stage INTEGER NOT NULL,
+                    next_review TEXT,
+                    review_history TEXT,
+                    notified_at TEXT,
+                    deck_id TEXT NOT NULL DEFAULT 'default',
+                    review_count INTEGER NOT NULL DEFAULT 0,
+                    correct_count INTEGER NOT NULL DEFAULT 0,
+                    version INTEGER NOT NULL DEFAULT 1,
+                    archived_count INTEGER NOT NULL DEFAULT 0,
+                    archived_correct INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            # 기존 DB 마이그레이션: 알림 상태 / 덱 / 복습 횟수 컬럼 추가
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(cards)")}
+            if "notified_at" not in columns:
+                cursor.execute("ALTER TABLE cards ADD COLUMN notified_at TEXT")
+            if "deck_id" not in columns:
+                cursor.execute(f"ALTER TABLE cards ADD COLUMN deck_id TEXT NOT NULL DEFAULT '{DEFAULT_DECK_ID}'")
+            if "review_count" not in columns:
+                cursor.execute("ALTER TABLE cards ADD COLUMN review_count INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("ALTER TABLE cards ADD COLUMN correct_count INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("""
+                    UPDATE cards SET
+                        review_count = json_array_length(review_history),
+                        correct_count = (
+                            SELECT COUNT(*) FROM json_each(cards.review_history)
+                            WHERE json_extract(value, '$.is_correct')
+                        )
+                    WHERE review_history IS NOT NULL AND review_history != ''
+                """)
+            if "version" not in columns:
+                cursor.execute("ALTER TABLE cards ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            if "archived_count" not in columns:
+                cursor.execute("ALTER TABLE cards ADD COLUMN archived_count INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("ALTER TABLE cards ADD COLUMN archived_correct INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("DROP INDEX IF EXISTS idx_cards_next_review")
+            cursor.execute("DROP INDEX IF EXISTS idx_cards_type_stage")
+            cursor.execute("DROP INDEX IF EXISTS idx_cards_concept")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cards_deck_next_review ON cards (deck_id, next_review)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cards_deck_type_stage ON cards (deck_id, card_type, stage)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cards_deck_concept ON cards (deck_id, concept)")
+            # 덱 단위 변경 카운터 (ETag / Last-Modified 용)
+            meta_columns = {row[1] for row in cursor.execute("PRAGMA table_info(deck_meta)")}
+            if meta_columns and "deck_id" not in meta_columns:
+                # 단일 덱 시절 스키마 - 캐시용 카운터라 다시 만들어도 무방
+                cursor.execute("DROP TABLE deck_meta")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS deck_meta (
+                    deck_id TEXT PRIMARY KEY,
+                    change_counter INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            cursor.execute(
+                "INSERT OR IGNORE INTO deck_meta (deck_id, change_counter, updated_at) VALUES (?, 0, ?)",
+                (self.deck_id, datetime.datetime.now().isoformat())
+            )
+            self._ensure_rollup_table(cursor)
+            self._ensure_search_index(cursor)
+            self._ensure_archive_table(cursor)
+
+    def _ensure_rollup_table(self, cursor) -> None:
+        """일별 x 카드 유형 x 단계 복습 롤업 (복습 저장과 같은 트랜잭션에서 증가)"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_rollup'")
+        exists = cursor.fetchone() is not None
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cards (
-                card_id TEXT PRIMARY KEY,
-                concept TEXT NOT NULL,
-                answer TEXT NOT NULL,
+            CREATE TABLE IF NOT EXISTS review_rollup (
+                deck_id TEXT NOT NULL,
+                day TEXT NOT NULL,
                 card_type TEXT NOT NULL,
                 stage INTEGER NOT NULL,
-                next_review TEXT,
-                review_history TEXT
+                reviews INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                promotions INTEGER NOT NULL DEFAULT 0,
+                resets INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (deck_id, day, card_type, stage)
+            )
+        """)
+        if not exists:
+            # 기존 복습 기록으로 한 번 채운다 (진급/리셋은 기록에 없어 0부터 집계)
+            cursor.execute("""
+                INSERT INTO review_rollup (deck_id, day, card_type, stage, reviews, correct)
+                SELECT cards.deck_id,
+                       substr(json_extract(h.value, '$.timestamp'), 1, 10),
+                       cards.card_type,
+                       json_extract(h.value, '$.stage'),
+                       COUNT(*),
+                       SUM(CASE WHEN json_extract(h.value, '$.is_correct') THEN 1 ELSE 0 END)
+                FROM cards, json_each(cards.review_history) AS h
+                WHERE cards.review_history IS NOT NULL AND cards.review_history != ''
+                GROUP BY 1, 2, 3, 4
+            """)
+
+    def _ensure_search_index(self, cursor) -> None:
+        """
+        concept/answer 전문 검색 색인 (cards를 content로 쓰는 FTS5 테이블)
+        - 카드 저장/삭제와 같은 트랜잭션에서 트리거로 동기화, 처음 만들 때 기존 카드 색인
+        - cards의 rowid로 연결되므로 VACUUM 후에는 'rebuild'가 필요하다
+        """
+        row = cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'cards_fts'").fetchone()
+        if row is not None:
+            self._fts_tokenizer = next((t for t in FTS_TOKENIZERS if t in row[0]), FTS_TOKENIZERS[-1])
+            return
+        for tokenizer in FTS_TOKENIZERS:
+            try:
+                cursor.execute(f"""
+                    CREATE VIRTUAL TABLE cards_fts USING fts5(
+                        concept, answer, content='cards', content_rowid='rowid', tokenize='{tokenizer}'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                # 구버전 SQLite (trigram 미지원 / FTS5 미포함)
+                continue
+            self._fts_tokenizer = tokenizer
+            break
+        else:
+            return
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN
+                INSERT INTO cards_fts (rowid, concept, answer) VALUES (new.rowid, new.concept, new.answer);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards BEGIN
+                INSERT INTO cards_fts (cards_fts, rowid, concept, answer)
+                VALUES ('delete', old.rowid, old.concept, old.answer);
+            END
+        """)
+        # 복습 저장도 upsert로 전체 컬럼을 쓰므로 텍스트가 실제로 바뀐 경우만 재색인
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF concept, answer ON cards
+            WHEN old.concept IS NOT new.concept OR old.answer IS NOT new.answer BEGIN
+                INSERT INTO cards_fts (cards_fts, rowid, concept, answer)
+                VALUES ('delete', old.rowid, old.concept, old.answer);
+                INSERT INTO cards_fts (rowid, concept, answer) VALUES (new.rowid, new.concept, new.answer);
+            END
+        """)
+        cursor.execute("INSERT INTO cards_fts (cards_fts) VALUES ('rebuild')")
+
+    @staticmethod
+    def _ensure_archive_table(cursor) -> None:
+        """
+        보관 복습 이력 - 인라인 review_history에서 밀려난 오래된 기록을 zlib 압축 JSON 묶음으로 보관
+        - 카드별 합계는 cards.archived_count / archived_correct (성공률 계산용)
+        - 공간 회수를 위해 VACUUM하지 않는다 (cards_fts가 rowid로 연결됨, 빈 페이지는 SQLite가 재사용)
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS review_archive (
+                deck_id TEXT NOT NULL,
+                card_id TEXT NOT NULL,
+                chunk_seq INTEGER NOT NULL,
+                first_at TEXT NOT NULL,
+                last_at TEXT NOT NULL,
+                record_count INTEGER NOT NULL,
+                correct_count INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                archived_at TEXT NOT NULL,
+                PRIMARY KEY (deck_id, card_id, chunk_seq)
             )
         """)
-        conn.commit()
-        conn.close()
 
+    def _load_change_counter(self):
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT change_counter, updated_at FROM deck_meta WHERE deck_id = ?", (self.deck_id,)
+            )
+            counter, updated_at = cursor.fetchone()
+        return counter, datetime.datetime.fromisoformat(updated_at)
+
+    def _bump_change_counter(self, cursor) -> None:
+        """카드 변경과 같은 트랜잭션에서 덱 변경 카운터 증가"""
+        now = datetime.datetime.now()
+        cursor.execute(
+            "UPDATE deck_meta SET change_counter = change_counter + 1, updated_at = ? WHERE deck_id = ?",
+            (now.isoformat(), self.deck_id)
+        )
+        cursor.execute("SELECT change_counter FROM deck_meta WHERE deck_id = ?", (self.deck_id,))
+        self._change_counter = cursor.fetchone()[0]
+        self._last_modified = now
+
+    def refresh_change_counter(self) -> int:
+        """다른 프로세스의 변경을 반영하도록 DB에서 카운터를 다시 읽는다"""
+        self._change_counter, self._last_modified = self._load_change_counter()
+        return self._change_counter
+
+    def get_change_counter(self) -> int:
+        """덱 변경 카운터 (단일 프로세스면 DB 조회 없이 메모리 값 반환)"""
+        if self._shared_change_counter:
+            return self.refresh_change_counter()
+        return self._change_counter
+
+    def get_last_modified(self) -> datetime.datetime:
+        """덱 마지막 변경 시각 (get_change_counter 이후 호출 시 같은 시점 값)"""
+        return self._last_modified
+
+    @timed("storage_write")
     def save_card(self, card: MemorizationCard):
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        """버전 확인 없이 저장 (생성/가져오기용) - card_id가 다른 덱에 이미 있으면 CardConflictError"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            self._upsert_card(cursor, card)
+            self._bump_change_counter(cursor)
+            cursor.execute(
+                "SELECT version FROM cards WHERE card_id = ? AND deck_id = ?", (card.card_id, self.deck_id)
+            )
+            row = cursor.fetchone()
+        if row is not None:
+            card.version = row[0]
+
+    @timed("storage_write")
+    def save_review(self, card: MemorizationCard, event: ReviewEvent) -> None:
+        """복습 결과 저장 - 카드와 통계 롤업을 한 트랜잭션에서 갱신"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            self._compare_and_set(cursor, card)
+            cursor.execute("""
+                INSERT INTO review_rollup (deck_id, day, card_type, stage, reviews, correct, promotions, resets)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT(deck_id, day, card_type, stage) DO UPDATE SET
+                    reviews = reviews + 1,
+                    correct = correct + excluded.correct,
+                    promotions = promotions + excluded.promotions,
+                    resets = resets + excluded.resets
+            """, (
+                self.deck_id,
+                event.timestamp.date().isoformat(),
+                event.card_type,
+                event.stage,
+                int(event.is_correct),
+                int(event.promoted),
+                int(event.reset)
+            ))
+            self._bump_change_counter(cursor)
+        card.version += 1
 
+    @staticmethod
+    def _records_json(records: Sequence[ReviewRecord]) -> str:
         history_list = [
             {
                 "stage": rec.stage,
@@ -43,16 +331,84 @@ class SQLiteCardStorage:
                 "feedback": rec.feedback,
                 "timestamp": rec.timestamp.isoformat()
             }
-            for rec in card.review_history
+            for rec in records
         ]
-        history_json = json.dumps(history_list)
+        return json.dumps(history_list)
+
+    @classmethod
+    def _history_json(cls, card: MemorizationCard) -> str:
+        return cls._records_json(card.review_history)
+
+    @staticmethod
+    def _parse_records(raw: Optional[str]) -> List[ReviewRecord]:
+        return [
+            ReviewRecord(
+                stage=entry["stage"],
+                user_answer=entry["user_answer"],
+                is_correct=entry["is_correct"],
+                feedback=entry["feedback"],
+                timestamp=datetime.datetime.fromisoformat(entry["timestamp"])
+            )
+            for entry in (json.loads(raw) if raw else [])
+        ]
+
+    def _compare_and_set(self, cursor, card: MemorizationCard) -> None:
+        """
+        읽었을 때의 버전(card.version)과 같을 때만 갱신하고 버전 +1 (CAS)
+        - 다른 요청이 먼저 썼으면 CardConflictError, 삭제됐으면 CardNotFoundError
+          (트랜잭션은 호출자 쪽에서 롤백)
+        """
+        cursor.execute("""
+            UPDATE cards SET
+                concept = ?, answer = ?, card_type = ?, stage = ?, next_review = ?,
+                review_history = ?, review_count = archived_count + ?, correct_count = archived_correct + ?,
+                version = version + 1
+            WHERE card_id = ? AND deck_id = ? AND version = ?
+        """, (
+            card.concept,
+            card.answer,
+            card.card_type,
+            card.stage,
+            card.next_review.isoformat() if card.next_review else None,
+            self._history_json(card),
+            len(card.review_history),
+            sum(1 for rec in card.review_history if rec.is_correct),
+            card.card_id,
+            self.deck_id,
+            card.version
+        ))
+        if cursor.rowcount == 0:
+            cursor.execute("SELECT 1 FROM cards WHERE card_id = ? AND deck_id = ?", (card.card_id, self.deck_id))
+            if cursor.fetchone() is None:
+                raise CardNotFoundError(card.card_id)
+            raise CardConflictError(card.card_id)
+
+    def _upsert_card(self, cursor, card: MemorizationCard) -> None:
+        history_json = self._history_json(card)
 
         next_review_iso = card.next_review.isoformat() if card.next_review else None
+        correct_count = sum(1 for rec in card.review_history if rec.is_correct)
 
+        # notified_at은 알림 쪽에서 관리하므로 덮어쓰지 않는다
+        # 다른 덱의 같은 card_id는 덮어쓰지 않는다
         cursor.execute("""
-            INSERT OR REPLACE INTO cards
-            (card_id, concept, answer, card_type, stage, next_review, review_history)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO cards
+            (card_id, concept, answer, card_type, stage, next_review, review_history, deck_id,
+             review_count, correct_count, archived_count, archived_correct)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(card_id) DO UPDATE SET
+                concept = excluded.concept,
+                answer = excluded.answer,
+                card_type = excluded.card_type,
+                stage = excluded.stage,
+                next_review = excluded.next_review,
+                review_history = excluded.review_history,
+                review_count = excluded.review_count,
+                correct_count = excluded.correct_count,
+                archived_count = excluded.archived_count,
+                archived_correct = excluded.archived_correct,
+                version = cards.version + 1
+            WHERE cards.deck_id = excluded.deck_id
         """, (
             card.card_id,
             card.concept,
@@ -60,21 +416,37 @@ class SQLiteCardStorage:
             card.card_type,
             card.stage,
             next_review_iso,
-            history_json
+            history_json,
+            self.deck_id,
+            card.archived_reviews + len(card.review_history),
+            card.archived_correct + correct_count,
+            card.archived_reviews,
+            card.archived_correct
         ))
-        conn.commit()
-        conn.close()
+        if cursor.rowcount == 0:
+            # 같은 card_id가 다른 덱에 있음 - 조용히 버리지 않고 호출자에게 충돌로 알린다 (트랜잭션은 롤백)
+            raise CardConflictError(card.card_id)
 
+    @timed("storage_write")
     def update_card(self, card: MemorizationCard):
-        self.save_card(card)
+        """버전 비교 후 갱신 - 충돌 시 CardConflictError, 삭제됐으면 CardNotFoundError"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            self._compare_and_set(cursor, card)
+            self._bump_change_counter(cursor)
+        card.version += 1
 
+    @timed("storage_write")
     def delete_card(self, card_id: str) -> bool:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM cards WHERE card_id = ?", (card_id,))
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM cards WHERE card_id = ? AND deck_id = ?", (card_id, self.deck_id))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                cursor.execute(
+                    "DELETE FROM review_archive WHERE card_id = ? AND deck_id = ?", (card_id, self.deck_id)
+                )
+                self._bump_change_counter(cursor)
         return deleted
 
     def load_card(self, row) -> MemorizationCard:
@@ -86,46 +458,422 @@ class SQLiteCardStorage:
         card.card_id = row[0]
         card.stage = int(row[4])
         card.next_review = datetime.datetime.fromisoformat(row[5]) if row[5] else None
+        card.version = row[7]
+        card.archived_reviews = row[8]
+        card.archived_correct = row[9]
 
-        history_list = json.loads(row[6]) if row[6] else []
-        card.review_history = [
-            ReviewRecord(
-                stage=entry["stage"],
-                user_answer=entry["user_answer"],
-                is_correct=entry["is_correct"],
-                feedback=entry["feedback"],
-                timestamp=datetime.datetime.fromisoformat(entry["timestamp"])
-            )
-            for entry in history_list
-        ]
+        card.review_history = ReviewHistory(self._parse_records(row[6]))
         return card
 
-    def get_all_cards(self) -> List[MemorizationCard]:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM cards")
-        rows = cursor.fetchall()
-        conn.close()
+    def _fetch_cards(self, sql: str, params: tuple | list = ()) -> List[MemorizationCard]:
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
         return [self.load_card(row) for row in rows]
 
+    @timed("storage_read")
+    def get_all_cards(self) -> List[MemorizationCard]:
+        return self._fetch_cards(f"SELECT {CARD_COLUMNS} FROM cards WHERE deck_id = ?", (self.deck_id,))
+
+    @timed("storage_read")
     def get_due_cards(self) -> List[MemorizationCard]:
         now_iso = datetime.datetime.now().isoformat()
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM cards WHERE next_review <= ?",
-            (now_iso,)
+        return self._fetch_cards(
+            f"SELECT {CARD_COLUMNS} FROM cards WHERE deck_id = ? AND next_review <= ?",
+            (self.deck_id, now_iso)
         )
-        rows = cursor.fetchall()
-        conn.close()
-        return [self.load_card(row) for row in rows]
 
+    @timed("storage_read")
+    def query_cards(
+        self,
+        card_type: Optional[str] = None,
+        stage: Optional[int] = None,
+        due: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor_id: Optional[str] = None,
+    ) -> List[MemorizationCard]:
+        """
+        필터 + 커서 기반 페이지 조회 (card_id 오름차순)
+        - cursor_id: 이전 페이지의 마지막 card_id
+        """
+        where, params = ["deck_id = ?"], [self.deck_id]
+        if card_type is not None:
+            where.append("card_type = ?")
+            params.append(card_type)
+        if stage is not None:
+            where.append("stage = ?")
+            params.append(stage)
+        if due is not None:
+            now_iso = datetime.datetime.now().isoformat()
+            where.append("next_review <= ?" if due else "(next_review IS NULL OR next_review > ?)")
+            params.append(now_iso)
+        if prefix:
+            where.append("concept LIKE ? ESCAPE '\\'")
+            params.append(_escape_like(prefix) + "%")
+        if cursor_id is not None:
+            where.append("card_id > ?")
+            params.append(cursor_id)
+
+        sql = f"SELECT {CARD_COLUMNS} FROM cards WHERE " + " AND ".join(where) + " ORDER BY card_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._fetch_cards(sql, params)
+
+    @timed("storage_read")
+    def search_cards(self, query: str, limit: int = 20, offset: int = 0) -> List[MemorizationCard]:
+        """
+        concept/answer 전문 검색 - 개념이 검색어로 시작하는 카드 우선, 다음은 BM25 (개념 가중치 높음)
+        - trigram: 3글자 이상 검색어는 색인 부분 일치, 더 짧은 검색어는 LIKE로 보조 필터
+        - unicode61: 단어 접두어 일치
+        """
+        terms = query.split()
+        if self._fts_tokenizer == "trigram":
+            match_terms = [t for t in terms if len(t) >= 3]
+        elif self._fts_tokenizer == "unicode61":
+            match_terms = terms
+        else:
+            match_terms = []
+        like_terms = [t for t in terms if t not in match_terms]
+
+        params: list = []
+        if match_terms:
+            quoted = ['"' + t.replace('"', '""') + '"' for t in match_terms]
+            if self._fts_tokenizer == "unicode61":
+                quoted = [q + "*" for q in quoted]
+            sql = f"""
+                SELECT {CARD_COLUMNS_C} FROM cards_fts f JOIN cards c ON c.rowid = f.rowid
+                WHERE cards_fts MATCH ? AND c.deck_id = ?
+            """
+            params += [" AND ".join(quoted), self.deck_id]
+        else:
+            sql = f"SELECT {CARD_COLUMNS_C} FROM cards c WHERE c.deck_id = ?"
+            params.append(self.deck_id)
+        for term in like_terms:
+            pattern = "%" + _escape_like(term) + "%"
+            sql += " AND (c.concept LIKE ? ESCAPE '\\' OR c.answer LIKE ? ESCAPE '\\')"
+            params += [pattern, pattern]
+
+        sql += " ORDER BY (c.concept LIKE ? ESCAPE '\\') DESC, "
+        params.append(_escape_like(query.strip()) + "%")
+        if match_terms:
+            sql += "bm25(cards_fts, 10.0, 1.0), "
+        else:
+            sql += "(c.concept LIKE ? ESCAPE '\\') DESC, length(c.concept), "
+            params.append("%" + _escape_like(query.strip()) + "%")
+        sql += "c.card_id LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        return self._fetch_cards(sql, params)
+
+    @timed("storage_read")
+    def count_due_by_bucket(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        bucket: str = "day",
+        include_overdue: bool = False,
+    ) -> Dict[str, int]:
+        """
+        구간 복습 예정 카드 수 - (deck_id, next_review) 인덱스 범위 스캔 + GROUP BY 한 번
+        ISO 문자열 앞부분(day: 10자, hour: 13자)을 버킷 키로 사용
+        """
+        width = 13 if bucket == "hour" else 10
+        lower = "" if include_overdue else start.isoformat()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT CASE WHEN next_review < ? THEN 'overdue' ELSE substr(next_review, 1, {width}) END AS bucket,
+                       COUNT(*)
+                FROM cards
+                WHERE deck_id = ? AND next_review >= ? AND next_review < ?
+                GROUP BY bucket
+            """, (start.isoformat(), self.deck_id, lower, end.isoformat()))
+            return dict(cursor.fetchall())
+
+    @timed("storage_read")
     def get_card(self, card_id: str) -> Optional[MemorizationCard]:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM cards WHERE card_id = ?", (card_id,))
-        row = cursor.fetchone()
-        conn.close()
-        if row:
-            return self.load_card(row)
-        return None
+        cards = self._fetch_cards(
+            f"SELECT {CARD_COLUMNS} FROM cards WHERE card_id = ? AND deck_id = ?",
+            (card_id, self.deck_id)
+        )
+        return cards[0] if cards else None
+
+    @timed("storage_read")
+    def get_stats(self, days: int = 30) -> Dict[str, Any]:
+        """
+        덱 통계 - 카드 이력을 읽지 않고 인덱스 집계 + 롤업 테이블만 조회
+        - 카드 수/단계별/유형별/평균 성공률/복습 예정 수
+        - 최근 days일 일별 복습 수, 단계 x 유형별 정답률, 진급/리셋 횟수
+        """
+        now = datetime.datetime.now()
+        since = (now.date() - datetime.timedelta(days=days - 1)).isoformat()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT card_type, stage, COUNT(*),
+                       SUM(CASE WHEN review_count > 0 THEN 100.0 * correct_count / review_count ELSE 0 END)
+                FROM cards WHERE deck_id = ?
+                GROUP BY card_type, stage
+            """, (self.deck_id,))
+            card_groups = cursor.fetchall()
+            cursor.execute(
+                "SELECT COUNT(*) FROM cards WHERE deck_id = ? AND next_review <= ?",
+                (self.deck_id, now.isoformat())
+            )
+            due_count = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT day, SUM(reviews), SUM(correct), SUM(promotions), SUM(resets)
+                FROM review_rollup WHERE deck_id = ? AND day >= ?
+                GROUP BY day ORDER BY day
+            """, (self.deck_id, since))
+            daily_rows = cursor.fetchall()
+            cursor.execute("""
+                SELECT card_type, stage, SUM(reviews), SUM(correct), SUM(promotions), SUM(resets)
+                FROM review_rollup WHERE deck_id = ?
+                GROUP BY card_type, stage ORDER BY card_type, stage
+            """, (self.deck_id,))
+            accuracy_rows = cursor.fetchall()
+
+        total = sum(row[2] for row in card_groups)
+        by_stage: Dict[int, int] = {}
+        by_type: Dict[str, int] = {}
+        for card_type, stage, count, _ in card_groups:
+            by_stage[stage] = by_stage.get(stage, 0) + count
+            by_type[card_type] = by_type.get(card_type, 0) + count
+        return {
+            "total": total,
+            "by_stage": by_stage,
+            "by_type": by_type,
+            "average_success_rate": sum(row[3] for row in card_groups) / total if total else 0,
+            "due_count": due_count,
+            "daily": [
+                {"day": day, "reviews": reviews, "correct": correct, "promotions": promotions, "resets": resets}
+                for day, reviews, correct, promotions, resets in daily_rows
+            ],
+            "accuracy": [
+                {
+                    "card_type": card_type,
+                    "stage": stage,
+                    "reviews": reviews,
+                    "correct": correct,
+                    "accuracy": correct / reviews if reviews else 0.0,
+                    "promotions": promotions,
+                    "resets": resets,
+                }
+                for card_type, stage, reviews, correct, promotions, resets in accuracy_rows
+            ],
+        }
+
+    @staticmethod
+    def _archivable_prefix(
+        records: Sequence[ReviewRecord],
+        keep_last: Optional[int],
+        keep_before: Optional[datetime.datetime]
+    ) -> int:
+        """
+        보관할 앞쪽 기록 수 - 최근 keep_last개 안에 있거나 keep_before 이후인 기록은 남긴다
+        (둘 다 지정하면 두 조건 모두 벗어난 기록만 보관)
+        """
+        if keep_last is None and keep_before is None:
+            return 0
+        count = len(records)
+        if keep_last is not None:
+            count = max(count - keep_last, 0)
+        if keep_before is not None:
+            old = 0
+            while old < count and records[old].timestamp < keep_before:
+                old += 1
+            count = old
+        return count
+
+    @timed("storage_write")
+    def compact_history(
+        self,
+        keep_last: Optional[int] = None,
+        keep_before: Optional[datetime.datetime] = None,
+        min_records: int = 1,
+        batch_size: int = 200
+    ) -> int:
+        """
+        오래된 복습 기록을 review_archive로 옮기고 인라인 이력은 최근 기록만 남긴다 - 옮긴 기록 수 반환
+        - 카드마다 (보관 묶음 추가 + 이력/보관 합계 CAS 갱신)을 한 트랜잭션에서 처리
+        - 그사이 복습이 저장돼 버전이 바뀐 카드는 건너뛴다 (다음 실행 때 다시 시도)
+        - 보관할 기록이 min_records개 미만인 카드는 건너뛰어 작은 묶음이 쌓이지 않게 한다
+        - 읽기/쓰기 모두 batch_size 카드 단위의 짧은 트랜잭션이라 서비스 중에 실행해도 된다
+        """
+        conditions = ["deck_id = ?", "card_id > ?", "review_count - archived_count >= ?"]
+        threshold = max(min_records, 1) + (keep_last or 0)
+        extra: List[Any] = []
+        if keep_before is not None:
+            conditions.append("json_extract(review_history, '$[0].timestamp') < ?")
+            extra.append(keep_before.isoformat())
+        sql = (
+            f"SELECT {CARD_COLUMNS} FROM cards WHERE {' AND '.join(conditions)} "
+            "ORDER BY card_id LIMIT ?"
+        )
+        archived = 0
+        after = ""
+        while True:
+            cards = self._fetch_cards(sql, [self.deck_id, after, threshold, *extra, batch_size])
+            for card in cards:
+                archived += self._archive_card(card, keep_last, keep_before, min_records)
+            if len(cards) < batch_size:
+                return archived
+            after = cards[-1].card_id
+
+    def _archive_card(
+        self,
+        card: MemorizationCard,
+        keep_last: Optional[int],
+        keep_before: Optional[datetime.datetime],
+        min_records: int
+    ) -> int:
+        records = list(card.review_history)
+        count = self._archivable_prefix(records, keep_last, keep_before)
+        if count < max(min_records, 1):
+            return 0
+        moved, kept = records[:count], records[count:]
+        correct = sum(1 for rec in moved if rec.is_correct)
+        payload = zlib.compress(self._records_json(moved).encode("utf-8"))
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO review_archive
+                    (deck_id, card_id, chunk_seq, first_at, last_at, record_count, correct_count, payload,
+                     archived_at)
+                    SELECT ?, ?, COALESCE(MAX(chunk_seq), 0) + 1, ?, ?, ?, ?, ?, ?
+                    FROM review_archive WHERE deck_id = ? AND card_id = ?
+                """, (
+                    self.deck_id, card.card_id,
+                    moved[0].timestamp.isoformat(), moved[-1].timestamp.isoformat(),
+                    count, correct, payload, datetime.datetime.now().isoformat(),
+                    self.deck_id, card.card_id
+                ))
+                # 합계(review_count/correct_count)는 그대로, 인라인에서 보관 쪽으로만 옮긴다
+                cursor.execute("""
+                    UPDATE cards SET
+                        review_history = ?, archived_count = archived_count + ?,
+                        archived_correct = archived_correct + ?, version = version + 1
+                    WHERE card_id = ? AND deck_id = ? AND version = ?
+                """, (self._records_json(kept), count, correct, card.card_id, self.deck_id, card.version))
+                if cursor.rowcount == 0:
+                    raise CardConflictError(card.card_id)
+                self._bump_change_counter(cursor)
+        except CardConflictError:
+            return 0
+        return count
+
+    def iter_review_history(self, card_id: str, include_archived: bool = True) -> Optional[Iterator[ReviewRecord]]:
+        """
+        복습 이력 순회 (오래된 순) - 카드가 없으면 None
+        - 카드 행(인라인 이력 + 보관 수)은 한 번에 읽고, 보관 묶음은 하나씩 별도 연결로 읽어 압축을 푼다
+        - 보관 묶음은 뒤에만 추가되므로 카드 행을 읽을 때의 archived_count만큼만 흘려보내면
+          순회 중에 압축이 실행돼도 기록이 빠지거나 겹치지 않는다
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT review_history, archived_count FROM cards WHERE card_id = ? AND deck_id = ?",
+                (card_id, self.deck_id)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        inline = self._parse_records(row[0])
+        archived_count = row[1] if include_archived else 0
+        return self._iter_history(card_id, archived_count, inline)
+
+    def _iter_history(self, card_id: str, archived_count: int, inline: List[ReviewRecord]) -> Iterator[ReviewRecord]:
+        remaining = archived_count
+        seq = 0
+        while remaining > 0:
+            chunk = self._load_archive_chunk(card_id, seq)
+            if chunk is None:
+                # 순회 중 카드가 삭제됨
+                return
+            seq, records = chunk
+            for record in records[:remaining]:
+                yield record
+            remaining -= len(records)
+        yield from inline
+
+    def _load_archive_chunk(self, card_id: str, after_seq: int) -> Optional[Tuple[int, List[ReviewRecord]]]:
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT chunk_seq, payload FROM review_archive
+                WHERE deck_id = ? AND card_id = ? AND chunk_seq > ?
+                ORDER BY chunk_seq LIMIT 1
+            """, (self.deck_id, card_id, after_seq))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return row[0], self._parse_records(zlib.decompress(row[1]).decode("utf-8"))
+
+    def list_decks(self) -> List[str]:
+        """같은 DB(샤드)에 있는 덱 목록"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT deck_id FROM cards
+                UNION
+                SELECT deck_id FROM deck_meta WHERE change_counter > 0
+                ORDER BY deck_id
+            """)
+            return [row[0] for row in cursor.fetchall()]
+
+    def get_cards_to_notify(self, quiet_period: datetime.timedelta) -> List[MemorizationCard]:
+        """
+        알림 대상 카드 조회
+        - 복습 시점이 된 뒤 아직 알림을 보내지 않은 카드
+        - 또는 마지막 알림 후 quiet_period가 지난 카드
+        """
+        now = datetime.datetime.now()
+        return self._fetch_cards(
+            f"""
+            SELECT {CARD_COLUMNS} FROM cards
+            WHERE deck_id = ? AND next_review <= ?
+              AND (notified_at IS NULL OR notified_at < next_review OR notified_at <= ?)
+            ORDER BY next_review
+            """,
+            (self.deck_id, now.isoformat(), (now - quiet_period).isoformat())
+        )
+
+    def mark_notified(self, card_ids: List[str], notified_at: datetime.datetime) -> None:
+        """알림 전송 시각 기록"""
+        if not card_ids:
+            return
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE cards SET notified_at = ? WHERE card_id = ? AND deck_id = ?",
+                [(notified_at.isoformat(), card_id, self.deck_id) for card_id in card_ids]
+            )
+
+    def get_next_notify_time(self, quiet_period: datetime.timedelta) -> Optional[datetime.datetime]:
+        """다음 알림이 필요한 가장 이른 시각 (없으면 None)"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            # 아직 알리지 않은 카드: next_review 시점
+            cursor.execute("""
+                SELECT MIN(next_review) FROM cards
+                WHERE deck_id = ? AND next_review IS NOT NULL
+                  AND (notified_at IS NULL OR notified_at < next_review)
+            """, (self.deck_id,))
+            pending = cursor.fetchone()[0]
+            # 이미 알린 카드: 마지막 알림 + quiet_period
+            cursor.execute("""
+                SELECT MIN(notified_at) FROM cards
+                WHERE deck_id = ? AND next_review IS NOT NULL AND notified_at >= next_review
+            """, (self.deck_id,))
+            notified = cursor.fetchone()[0]
+
+        candidates = []
+        if pending:
+            candidates.append(datetime.datetime.fromisoformat(pending))
+        if notified:
+            candidates.append(datetime.datetime.fromisoformat(notified) + quiet_period)
+        return min(candidates) if candidates else None
@@ -0,0 +1,29 @@
+"""pytest 공통 설정 - backend/를 import 경로에 추가 (앱 코드는 backend 기준 절대 import)"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.stub_embedder import StubEmbedder
+
+class StubLLM:
+    """채점에 필요한 유사도만 해시 임베더로 계산 (Ollama / 모델 없음)"""
+
+    def __init__(self, on_grade=None):
+        self.embedder = StubEmbedder()
+        self.on_grade = on_grade
+        self.grades = 0
+
+    def _calculate_similarity(self, text1: str, text2: str) -> float:
+        self.grades += 1
+        if self.on_grade is not None:
+            self.on_grade(self.grades)
+        a, b = self.embedder.encode([text1, text2], normalize_embeddings=True)
+        return float(np.dot(a, b))
+
+@pytest.fixture
+def stub_llm():
+    return StubLLM()
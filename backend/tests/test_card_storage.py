@@ -0,0 +1,108 @@
+import datetime
+
+import pytest
+
+from interfaces.storage_interface import CardConflictError, CardNotFoundError
+from models.card import MemorizationCard
+from models.review import ReviewEvent, ReviewRecord
+from models.review_history import ReviewHistory
+from storage.memory_storage import MemoryCardStorage
+from storage.sqlite_storage import SQLiteCardStorage
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCardStorage()
+    return SQLiteCardStorage(str(tmp_path / "cards.db"))
+
+def _saved_card(storage) -> MemorizationCard:
+    card = MemorizationCard(concept="사과", answer="apple")
+    storage.save_card(card)
+    return card
+
+def test_stale_version_conflicts(storage):
+    card = _saved_card(storage)
+    first = storage.get_card(card.card_id)
+    second = storage.get_card(card.card_id)
+
+    first.stage = 2
+    storage.update_card(first)
+    second.stage = 3
+    with pytest.raises(CardConflictError):
+        storage.update_card(second)
+    assert storage.get_card(card.card_id).stage == 2
+
+def test_update_after_delete_is_not_found(storage):
+    card = _saved_card(storage)
+    read = storage.get_card(card.card_id)
+    storage.delete_card(card.card_id)
+
+    read.stage = 2
+    with pytest.raises(CardNotFoundError):
+        storage.update_card(read)
+
+def test_stale_review_save_rolls_back_rollup(storage):
+    card = _saved_card(storage)
+    first = storage.get_card(card.card_id)
+    second = storage.get_card(card.card_id)
+
+    storage.save_review(first, ReviewEvent(card_type="word", stage=1, is_correct=True, promoted=True))
+    assert first.version == card.version + 1
+    with pytest.raises(CardConflictError):
+        storage.save_review(second, ReviewEvent(card_type="word", stage=1, is_correct=False))
+
+    # 충돌한 저장은 롤업에도 반영되지 않는다
+    daily = storage.get_stats()["daily"]
+    assert [(d["reviews"], d["correct"]) for d in daily] == [(1, 1)]
+
+def _history_card(sqlite_storage: SQLiteCardStorage, count: int) -> MemorizationCard:
+    """한 시간 간격 기록 count개를 가진 카드 저장"""
+    start = datetime.datetime(2026, 1, 1)
+    records = [
+        ReviewRecord(stage=1, user_answer=f"a{i}", is_correct=i % 2 == 0, timestamp=start + datetime.timedelta(hours=i))
+        for i in range(count)
+    ]
+    card = MemorizationCard(concept="사과", answer="apple", review_history=ReviewHistory(records))
+    sqlite_storage.save_card(card)
+    return card
+
+@pytest.mark.parametrize("keep_last, keep_hours, min_records, archived", [
+    (3, None, 1, 7),        # 최근 3개만 남김
+    (10, None, 1, 0),       # 기록 수 == keep_last → 옮길 것 없음
+    (None, 5, 1, 5),        # 정확히 keep_before 시각인 기록은 남김
+    (7, 5, 1, 3),           # 두 조건을 모두 벗어난 기록만
+    (3, None, 8, 0),        # 옮길 기록이 min_records 미만이면 건너뜀
+    (3, None, 7, 7),        # min_records와 같으면 옮김
+])
+def test_compact_history_boundaries(tmp_path, keep_last, keep_hours, min_records, archived):
+    sqlite_storage = SQLiteCardStorage(str(tmp_path / "cards.db"))
+    card = _history_card(sqlite_storage, 10)
+    before = sqlite_storage.get_card(card.card_id)
+    keep_before = None if keep_hours is None else datetime.datetime(2026, 1, 1) + datetime.timedelta(hours=keep_hours)
+
+    moved = sqlite_storage.compact_history(keep_last=keep_last, keep_before=keep_before, min_records=min_records)
+
+    assert moved == archived
+    after = sqlite_storage.get_card(card.card_id)
+    assert len(after.review_history) == 10 - archived
+    assert after.archived_reviews == archived
+    assert after.get_success_rate() == before.get_success_rate()
+    # 보관 포함 전체 이력은 순서 그대로
+    full = list(sqlite_storage.iter_review_history(card.card_id))
+    assert [rec.user_answer for rec in full] == [f"a{i}" for i in range(10)]
+    if archived:
+        assert after.version == before.version + 1
+
+def test_card_id_taken_by_another_deck_conflicts(tmp_path):
+    path = str(tmp_path / "cards.db")
+    deck_a = SQLiteCardStorage(path, deck_id="a")
+    deck_b = SQLiteCardStorage(path, deck_id="b")
+    card = MemorizationCard(concept="사과", answer="apple")
+    deck_a.save_card(card)
+
+    intruder = MemorizationCard(concept="배", answer="pear", card_id=card.card_id)
+    with pytest.raises(CardConflictError):
+        deck_b.save_card(intruder)
+    assert deck_b.get_card(card.card_id) is None
+    assert deck_a.get_card(card.card_id).concept == "사과"
+    assert deck_b.get_change_counter() == 0
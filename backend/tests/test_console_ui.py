@@ -0,0 +1,37 @@
+import pytest
+
+from config.settings import ScheduleConfig
+from services.card_service import CardService
+from services.review_service import ReviewService
+from services.schedule_service import ScheduleService
+from storage.memory_storage import MemoryCardStorage
+from ui.console_ui import ConsoleUI
+
+@pytest.fixture
+def console(stub_llm):
+    card_service = CardService(MemoryCardStorage())
+    review_service = ReviewService(stub_llm, card_service, ScheduleService(ScheduleConfig.default()))
+    return ConsoleUI(card_service, review_service, stub_llm)
+
+def _answer(monkeypatch, *answers):
+    replies = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+
+def test_review_promotes_correct_answer(console, monkeypatch, capsys):
+    card = console.card_service.create_card("사과", "apple")
+    _answer(monkeypatch, "apple")
+    console.handle_review()
+
+    assert "정답입니다!" in capsys.readouterr().out
+    assert console.card_service.get_card(card.card_id).stage == 2
+
+def test_wrong_answer_gets_one_retry_then_resets(console, monkeypatch, capsys):
+    card = console.card_service.create_card("사과", "apple")
+    _answer(monkeypatch, "banana", "grape")
+    console.handle_review()
+
+    out = capsys.readouterr().out
+    assert out.count("오답입니다.") == 2
+    stored = console.card_service.get_card(card.card_id)
+    assert stored.stage == 1 and len(stored.review_history) == 2
+    assert not stored.is_due_for_review()
@@ -0,0 +1,30 @@
+import importlib
+
+import pytest
+
+from models.card import MemorizationCard
+
+@pytest.fixture
+def notifier(tmp_path, monkeypatch):
+    # 모듈 import 시 설정 / 아웃박스 DB를 현재 폴더에 만든다
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("hook.discord_notifier")
+
+def test_split_digest_counts_once_and_numbers_continuations(notifier):
+    cards = [MemorizationCard(concept=f"개념 {i}" * 5, answer="a") for i in range(60)]
+    messages = notifier.build_digest_messages(cards, max_length=1000)
+
+    assert len(messages) >= 3
+    assert all(len(content) <= 1000 for content, _ in messages)
+    assert messages[0][0].startswith("🕒 **복습 알림** 🕒 (60개 카드)\n")
+    for index, (content, _) in enumerate(messages[1:], start=2):
+        assert content.startswith(f"🕒 **복습 알림** 🕒 ({index}/{len(messages)})\n")
+        assert "60개" not in content
+    # 모든 카드가 한 번씩만 포함
+    assert [card_id for _, ids in messages for card_id in ids] == [card.card_id for card in cards]
+
+def test_single_digest_has_only_count_header(notifier):
+    cards = [MemorizationCard(concept="사과", answer="apple")]
+    (content, ids), = notifier.build_digest_messages(cards)
+    assert content.startswith("🕒 **복습 알림** 🕒 (1개 카드)\n")
+    assert ids == [cards[0].card_id]
@@ -0,0 +1,29 @@
+import os
+import threading
+
+import pytest
+
+from config.settings import LLMConfig
+from loadtest.stub_embedder import StubEmbedder
+from services.embedding_sidecar import EmbeddingSidecar
+from services.llm_service import LLMService
+
+@pytest.fixture
+def sidecar(tmp_path):
+    path = str(tmp_path / "embed.sock")
+    server = EmbeddingSidecar(StubEmbedder(), path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="POSIX shared memory is not exposed under /dev/shm")
+def test_close_releases_shared_memory_buffers(sidecar):
+    service = LLMService(LLMConfig(embedder_socket=sidecar))
+    assert service.embed("사과").shape == (384,)
+    buffers = [conn.shm.name for conn in list(service.embedder._idle.queue)]
+    assert buffers and all(os.path.exists(f"/dev/shm/{name}") for name in buffers)
+
+    service.close()
+    assert not any(os.path.exists(f"/dev/shm/{name}") for name in buffers)
@@ -0,0 +1,28 @@
+import time
+
+from config.settings import RetentionConfig
+from services.history_compactor import HistoryCompactor
+from utils.metrics import BACKGROUND_JOB_ERRORS
+
+class BrokenRouter:
+    def list_users(self):
+        raise RuntimeError("database is locked")
+
+def test_retention_is_opt_in(monkeypatch):
+    monkeypatch.delenv("MEMORIZATION_HISTORY_RETENTION", raising=False)
+    assert not RetentionConfig().enabled
+    monkeypatch.setenv("MEMORIZATION_HISTORY_RETENTION", "1")
+    assert RetentionConfig().enabled
+
+def test_failed_run_is_counted_and_retried():
+    before = BACKGROUND_JOB_ERRORS.value("history_compaction")
+    compactor = HistoryCompactor(BrokenRouter(), RetentionConfig(enabled=True, interval_sec=0.01))
+    compactor.start()
+    try:
+        deadline = time.monotonic() + 2
+        while BACKGROUND_JOB_ERRORS.value("history_compaction") < before + 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        compactor.stop()
+    # 실패해도 스레드는 살아서 다음 주기에 다시 시도
+    assert BACKGROUND_JOB_ERRORS.value("history_compaction") >= before + 2
@@ -0,0 +1,61 @@
+import pytest
+
+from storage import idempotency_storage
+from storage.idempotency_storage import (
+    SQLiteIdempotencyStore, CLAIMED, COMPLETED, PENDING, MISMATCH
+)
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(idempotency_storage.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return SQLiteIdempotencyStore(str(tmp_path / "keys.db"), ttl_sec=3600, stale_after_sec=60)
+
+def test_completed_key_replays_response(store):
+    assert store.claim("u/d/c", "k", "fp").status == CLAIMED
+    assert store.claim("u/d/c", "k", "fp").status == PENDING
+    store.complete("u/d/c", "k", '{"ok": true}')
+
+    replay = store.claim("u/d/c", "k", "fp")
+    assert (replay.status, replay.response) == (COMPLETED, '{"ok": true}')
+    # 같은 키라도 scope가 다르면 별개 요청
+    assert store.claim("u/d/other", "k", "fp").status == CLAIMED
+
+def test_key_reused_for_different_request_is_mismatch(store):
+    store.claim("s", "k", "fp-1")
+    assert store.claim("s", "k", "fp-2").status == MISMATCH
+    store.complete("s", "k", "{}")
+    assert store.claim("s", "k", "fp-2").status == MISMATCH
+
+def test_stale_claim_can_be_taken_over(store, clock):
+    store.claim("s", "k", "fp")
+    clock.now += 59
+    assert store.claim("s", "k", "fp").status == PENDING
+    clock.now += 1
+    # 처리 중 표시가 stale_after_sec 동안 방치됨 → 같은 요청은 다시 선점
+    assert store.claim("s", "k", "fp").status == CLAIMED
+    assert store.claim("s", "k", "fp").status == PENDING
+    # 다른 요청 내용은 방치된 키라도 가져가지 못한다
+    clock.now += 60
+    assert store.claim("s", "k", "fp-2").status == MISMATCH
+
+def test_released_and_expired_keys_are_claimable_again(store, clock):
+    store.claim("s", "released", "fp")
+    store.release("s", "released")
+    assert store.claim("s", "released", "fp").status == CLAIMED
+
+    store.claim("s", "expired", "fp")
+    store.complete("s", "expired", "{}")
+    clock.now += 3600
+    assert store.claim("s", "expired", "fp-2").status == CLAIMED
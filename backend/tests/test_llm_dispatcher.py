@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from services import llm_dispatcher
+from services.llm_dispatcher import LLMDispatcher, LLMOverloadedError, GRADING, HINT, ENRICHMENT
+
+LIMITS = {GRADING: 8, HINT: 4, ENRICHMENT: 2}
+
+def test_timeout_cancels_waiter_and_keeps_slot_count():
+    dispatcher = LLMDispatcher(1, LIMITS, wait_timeout_sec=0.05)
+    dispatcher.acquire(GRADING)
+
+    with pytest.raises(LLMOverloadedError) as exc:
+        dispatcher.acquire(HINT)
+    assert exc.value.reason == "queue timeout"
+    assert dispatcher.queued() == {"grading": 0, "hint": 0, "enrichment": 0}
+
+    # 취소된 대기자는 건너뛰고 슬롯을 실제로 반납
+    dispatcher.release()
+    assert dispatcher._active == 0
+    dispatcher.acquire(GRADING)
+    assert dispatcher._active == 1
+
+def test_handoff_right_after_timeout_is_kept(monkeypatch):
+    dispatcher = LLMDispatcher(1, LIMITS, wait_timeout_sec=0.05)
+    dispatcher.acquire(GRADING)
+
+    class RacingEvent(threading.Event):
+        def wait(self, timeout=None):
+            # 대기 시간이 끝난 바로 그 순간 다른 스레드가 release로 슬롯을 넘겨줌
+            dispatcher.release()
+            return False
+
+    original_init = llm_dispatcher._Waiter.__init__
+
+    def racing_init(self, priority):
+        original_init(self, priority)
+        self.event = RacingEvent()
+
+    monkeypatch.setattr(llm_dispatcher._Waiter, "__init__", racing_init)
+    # 넘겨받은 슬롯을 버리고 예외를 내면 슬롯이 새어 나간다 → 성공으로 처리해야 함
+    dispatcher.acquire(HINT)
+    assert dispatcher._active == 1
+    dispatcher.release()
+    assert dispatcher._active == 0
+
+def test_full_queue_rejects_low_priority_first():
+    dispatcher = LLMDispatcher(1, {GRADING: 2, HINT: 1, ENRICHMENT: 0}, wait_timeout_sec=5)
+    dispatcher.acquire(GRADING)
+
+    with pytest.raises(LLMOverloadedError) as exc:
+        dispatcher.acquire(ENRICHMENT)
+    assert exc.value.reason == "queue full"
+
+    waiter = threading.Thread(target=dispatcher.acquire, args=(HINT,))
+    waiter.start()
+    while dispatcher.queued()["hint"] == 0:
+        time.sleep(0.01)
+    with pytest.raises(LLMOverloadedError):
+        dispatcher.acquire(HINT)
+    dispatcher.release()
+    waiter.join(1)
+    assert not waiter.is_alive()
+    dispatcher.release()
+    assert dispatcher._active == 0
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from utils.profiler import SamplingProfiler
+
+def _wait_in_app_code(event: threading.Event) -> None:
+    event.wait()
+
+def _busy(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+def test_idle_threads_are_skipped_but_app_waits_are_kept():
+    stop = threading.Event()
+    idle = threading.Thread(target=stop.wait, daemon=True)
+    blocked = threading.Thread(target=_wait_in_app_code, args=(stop,), daemon=True)
+    idle.start()
+    blocked.start()
+
+    profiler = SamplingProfiler()
+    profiler.arm(1, interval_ms=1)
+    assert profiler.request_started()
+    _busy(0.1)
+    profiler.request_finished()
+    stop.set()
+
+    stacks = profiler.result().splitlines()
+    assert any("_busy (test_profiler.py" in line for line in stacks)
+    # 앱 코드에서 기다리는 스레드(요청 중 락 / 대기열 대기)는 남는다
+    assert any("_wait_in_app_code" in line for line in stacks)
+    # 일감을 기다리기만 하는 스레드는 빠진다
+    idle_waits = [
+        line for line in stacks
+        if "(threading.py" in line.rsplit(";", 1)[-1] and "test_profiler.py" not in line
+    ]
+    assert idle_waits == []
+    assert profiler.status()["idle_samples"] > 0
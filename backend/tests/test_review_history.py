@@ -0,0 +1,15 @@
+import dataclasses
+
+import pytest
+
+from models.review import ReviewRecord
+from models.review_history import ReviewHistory
+
+def test_review_history_records_are_read_only():
+    history = ReviewHistory([ReviewRecord(stage=1, user_answer="aple", is_correct=False)])
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        history[0].is_correct = True
+
+    # 고칠 때는 새 기록을 대입
+    history[0] = dataclasses.replace(history[0], is_correct=True)
+    assert history[0].is_correct and history.correct_count() == 1
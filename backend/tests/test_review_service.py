@@ -0,0 +1,75 @@
+import pytest
+
+from config.settings import ReviewConfig, ScheduleConfig
+from interfaces.storage_interface import CardConflictError, CardNotFoundError
+from services.card_service import CardService
+from services.review_service import ReviewService
+from services.schedule_service import ScheduleService
+from storage.sqlite_storage import SQLiteCardStorage
+
+@pytest.fixture
+def card_service(tmp_path):
+    return CardService(SQLiteCardStorage(str(tmp_path / "cards.db")))
+
+def _review_service(card_service, llm, retries=3):
+    return ReviewService(
+        llm, card_service, ScheduleService(ScheduleConfig.default()), ReviewConfig(conflict_retries=retries)
+    )
+
+def test_concurrent_write_during_grading_is_retried(card_service, stub_llm):
+    card = card_service.create_card("사과", "apple")
+
+    def concurrent_edit(grades):
+        if grades == 1:
+            # 채점 중 다른 요청이 같은 카드를 수정 (정답은 그대로)
+            other = card_service.get_card(card.card_id)
+            other.concept = "사과 (과일)"
+            card_service.update_card(other)
+
+    stub_llm.on_grade = concurrent_edit
+    result = _review_service(card_service, stub_llm).process_review(card.card_id, "apple")
+
+    assert result["is_correct"] and result["stage"] == 2
+    stored = card_service.get_card(card.card_id)
+    # 다른 요청의 수정 위에 복습이 한 번만 재적용됨
+    assert stored.concept == "사과 (과일)"
+    assert stored.stage == 2 and len(stored.review_history) == 1
+    assert stored.version == card.version + 2
+    # 정답이 바뀌지 않았으니 다시 채점하지 않는다
+    assert stub_llm.grades == 1
+
+def test_answer_change_during_grading_regrades(card_service, stub_llm):
+    card = card_service.create_card("사과", "apple")
+
+    def change_answer(grades):
+        if grades == 1:
+            other = card_service.get_card(card.card_id)
+            other.answer = "banana"
+            card_service.update_card(other)
+
+    stub_llm.on_grade = change_answer
+    result = _review_service(card_service, stub_llm).process_review(card.card_id, "apple")
+
+    assert stub_llm.grades == 2
+    assert not result["is_correct"]
+    assert card_service.get_card(card.card_id).stage == 1
+
+def test_conflicts_beyond_retry_limit_propagate(card_service, stub_llm):
+    card = card_service.create_card("사과", "apple")
+    saves = []
+
+    def always_conflict(stale, event):
+        saves.append(stale.version)
+        raise CardConflictError(stale.card_id)
+
+    card_service.storage.save_review = always_conflict
+    with pytest.raises(CardConflictError):
+        _review_service(card_service, stub_llm, retries=2).process_review(card.card_id, "apple")
+    assert len(saves) == 3
+
+def test_card_deleted_during_grading_is_not_found(card_service, stub_llm):
+    card = card_service.create_card("사과", "apple")
+    stub_llm.on_grade = lambda grades: card_service.delete_card(card.card_id)
+
+    with pytest.raises(CardNotFoundError):
+        _review_service(card_service, stub_llm).process_review(card.card_id, "apple")
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from config.settings import ScheduleConfig
+from services.schedule_service import ScheduleService, bucket_key
+
+def _card_with_jitter(service: ScheduleService, stage: int, negative: bool) -> str:
+    """지터 부호가 원하는 쪽인 card_id 찾기"""
+    for i in range(1000):
+        card_id = f"card-{i}"
+        if (service._jitter(card_id, stage) < 0) == negative:
+            return card_id
+    raise AssertionError("no card id with the requested jitter sign")
+
+@pytest.mark.parametrize("negative", [True, False])
+def test_full_day_defers_stage2_card_regardless_of_jitter(negative):
+    cfg = ScheduleConfig.default()
+    cfg.daily_capacity = 10
+    service = ScheduleService(cfg)
+    card_id = _card_with_jitter(service, 2, negative)
+
+    before = datetime.datetime.now()
+    unsmoothed = service.get_next_review_time(2, "word", card_id)
+    if negative:
+        # 24시간 카드인데 지터로 하루 미만 간격
+        assert unsmoothed - before < datetime.timedelta(days=1)
+    full_day = bucket_key(unsmoothed, "day")
+
+    def due_counter(start, end, bucket):
+        return {full_day: cfg.daily_capacity}
+
+    deferred = service.get_next_review_time(2, "word", card_id, due_counter)
+    assert bucket_key(deferred, "day") == bucket_key(unsmoothed + datetime.timedelta(days=1), "day")
+
+def test_short_stage_is_not_smoothed():
+    cfg = ScheduleConfig.default()
+    cfg.daily_capacity = 1
+    service = ScheduleService(cfg)
+
+    def due_counter(start, end, bucket):
+        raise AssertionError("stage 1 (10 minutes) must not consult daily capacity")
+
+    next_time = service.get_next_review_time(1, "word", "card-1", due_counter)
+    assert next_time - datetime.datetime.now() < datetime.timedelta(hours=1)
@@ -0,0 +1,77 @@
+import datetime
+import io
+import struct
+import zlib
+
+import pytest
+
+from models.card import MemorizationCard
+from models.review import ReviewRecord
+from models.review_history import ReviewHistory, to_epoch_us
+from storage.memory_storage import MemoryCardStorage
+from storage.snapshot import MAGIC, SnapshotError, encode_card, read_snapshot, write_snapshot
+
+def _card(concept: str) -> MemorizationCard:
+    records = [
+        ReviewRecord(stage=1, user_answer="오답", is_correct=False, feedback="다시 생각해 보세요"),
+        ReviewRecord(stage=1, user_answer="apple", is_correct=True),
+    ]
+    return MemorizationCard(concept=concept, answer="apple", stage=2, review_history=ReviewHistory(records))
+
+def _v1_record(card: MemorizationCard) -> bytes:
+    """버전 2 인코딩에서 카드 버전(u64)을 빼 버전 1 레코드로"""
+    data = encode_card(card)
+    offset = sum(4 + len(value.encode("utf-8")) for value in (card.card_id, card.concept, card.answer, card.card_type))
+    offset += struct.calcsize("<bq")
+    return data[:offset] + data[offset + 8:]
+
+def test_v2_round_trip_keeps_versions_and_history(tmp_path):
+    storage = MemoryCardStorage()
+    card = _card("사과")
+    storage.save_card(card)
+    storage.update_card(card)
+    path = str(tmp_path / "cards.snap")
+    storage.save_snapshot(path)
+
+    restored = MemoryCardStorage()
+    assert restored.load_snapshot(path) == 1
+    loaded = restored.get_card(card.card_id)
+    assert loaded.version == 2
+    assert (loaded.concept, loaded.stage) == ("사과", 2)
+    assert [(r.user_answer, r.is_correct, r.feedback) for r in loaded.review_history] == [
+        ("오답", False, "다시 생각해 보세요"), ("apple", True, "")
+    ]
+    assert loaded.next_review == card.next_review
+    assert restored.get_change_counter() >= storage.get_change_counter()
+
+def test_v1_snapshot_restores_version_one():
+    card = _card("사과")
+    card.version = 7
+    header = struct.pack("<4sHHQqI", MAGIC, 1, 0, 5, to_epoch_us(datetime.datetime.now()), 1)
+    body = header + _v1_record(card)
+    stream = io.BytesIO(body + struct.pack("<I", zlib.crc32(body)))
+
+    counter, cards = read_snapshot(stream)
+    loaded = list(cards)
+    assert counter == 5
+    assert len(loaded) == 1 and loaded[0].version == 1
+    assert loaded[0].concept == "사과" and len(loaded[0].review_history) == 2
+
+def test_checksum_mismatch_keeps_existing_state(tmp_path):
+    path = tmp_path / "cards.snap"
+    write_snapshot(str(path), [encode_card(_card("사과"))], 1)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    storage = MemoryCardStorage()
+    existing = _card("기존")
+    storage.save_card(existing)
+    with pytest.raises(SnapshotError, match="checksum"):
+        storage.load_snapshot(str(path))
+    assert [c.card_id for c in storage.get_all_cards()] == [existing.card_id]
+
+def test_unknown_version_is_rejected():
+    header = struct.pack("<4sHHQqI", MAGIC, 99, 0, 0, 0, 0)
+    with pytest.raises(SnapshotError, match="version"):
+        read_snapshot(io.BytesIO(header + struct.pack("<I", zlib.crc32(header))))
@@ -0,0 +1,71 @@
+import datetime
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config.settings import WebhookConfig
+from hook.webhook_worker import WebhookDeliveryWorker
+from storage.outbox_storage import SQLiteWebhookOutbox
+
+@pytest.fixture
+def flaky_server():
+    """첫 요청은 500, 이후 200을 돌려주는 로컬 웹훅 서버 (임시 포트)"""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            hits.append(time.monotonic())
+            self.send_response(500 if len(hits) == 1 else 200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/webhook", hits
+    server.shutdown()
+    server.server_close()
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+def test_500_is_retried_with_backoff_then_delivered(tmp_path, flaky_server):
+    url, hits = flaky_server
+    outbox = SQLiteWebhookOutbox(str(tmp_path / "outbox.db"))
+    worker = WebhookDeliveryWorker(outbox, WebhookConfig(backoff_base_sec=0.2, idle_poll_sec=0.5))
+    worker.start()
+    try:
+        worker.enqueue(url, {"content": "hello"})
+        assert _wait_for(lambda: worker.stats()["delivered"] == 1)
+    finally:
+        worker.stop()
+
+    assert len(hits) == 2
+    assert hits[1] - hits[0] >= 0.2
+    assert worker.stats() == {"delivered": 1, "failed": 0, "queued": 0}
+    assert outbox.pending_count() == 0
+
+def test_purge_finished_keeps_recent_and_pending(tmp_path):
+    outbox = SQLiteWebhookOutbox(str(tmp_path / "outbox.db"))
+    delivered = outbox.enqueue("http://example.invalid", {})
+    failed = outbox.enqueue("http://example.invalid", {})
+    outbox.enqueue("http://example.invalid", {})
+    outbox.mark_delivered(delivered)
+    outbox.mark_failed(failed, "HTTP 400")
+
+    # 보관 기간 안의 메시지는 남긴다
+    assert outbox.purge_finished(datetime.datetime.now() - datetime.timedelta(days=1)) == 0
+    # 끝난 메시지만 지우고 대기 중인 메시지는 남긴다
+    assert outbox.purge_finished(datetime.datetime.now() + datetime.timedelta(seconds=1)) == 2
+    assert outbox.counts() == {"queued": 1, "sending": 0, "delivered": 0, "failed": 0}
@@ -39,10 +39,24 @@ class ConsoleUI(IUIService):
         for card in due_cards:
             print(f"\n개념: {card.concept}")
             user_answer = input("답안을 입력하세요: ").strip()
-            result = self.review_service.conduct_review(card.card_id, user_answer)
+            result = self.review_service.process_review(card.card_id, user_answer)
+            if result.get("retry_allowed"):
+                # 첫 오답은 바로 한 번 더 (재시도도 틀리면 1단계로)
+                self._show_review_result(result)
+                user_answer = input("다시 입력하세요: ").strip()
+                result = self.review_service.process_review(card.card_id, user_answer, retry=True)
+            self._show_review_result(result)
+
+    def _show_review_result(self, result: dict) -> None:
+        if "error" in result:
+            print(result["error"])
+            return
+        print("정답입니다!" if result["is_correct"] else "오답입니다.")
+        if result["feedback"]:
             print(f"피드백: {result['feedback']}")
-            if result.get("advanced"):
-                print("단계가 진급되었습니다.")
+        if result.get("advanced"):
+            print("단계가 진급되었습니다.")
+        if result.get("next_review"):
             print(f"다음 복습 예정 시간: {result['next_review']}")
 
     def handle_view_stats(self) -> None:
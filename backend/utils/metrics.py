@@ -0,0 +1,224 @@
+"""경량 메트릭 수집기 - Prometheus 텍스트 포맷 출력"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# 현재 처리 중인 카드 유형 (card_type 라벨 기본값)
+current_card_type: ContextVar[str] = ContextVar("current_card_type", default="")
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()):
+        self.name, self.doc, self.labelnames = name, doc, labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class Histogram:
+    """누적 버킷 히스토그램 (관측 시 bisect 한 번 + lock)"""
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name, self.doc, self.labelnames = name, doc, labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [버킷별 count..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._values.items()]
+        for labels, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+class Gauge:
+    """수집 시점에 콜백으로 값을 읽는 게이지"""
+
+    def __init__(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()):
+        self.name, self.doc, self.labelnames = name, doc, labelnames
+        # 값 출처(source)별 콜백 - 같은 출처로 다시 등록하면 교체 (객체를 다시 만들어도 라벨이 중복되지 않음)
+        self._callbacks: Dict[str, Callable[[], Dict[Tuple[str, ...], float]]] = {}
+
+    def set_function(self, callback: Callable[[], Dict[Tuple[str, ...], float]], source: str = "") -> None:
+        """callback은 {라벨 튜플: 값} 딕셔너리를 반환"""
+        self._callbacks[source] = callback
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} gauge"]
+        for callback in list(self._callbacks.values()):
+            try:
+                values = callback()
+            except Exception:
+                continue
+            for labels, value in values.items():
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class MetricsRegistry:
+    """메트릭 등록/출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, doc, labelnames))
+
+    def histogram(self, name: str, doc: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, doc, labelnames, buckets))
+
+    def gauge(self, name: str, doc: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, doc, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+OPERATION_LATENCY = registry.histogram(
+    "memorization_operation_duration_seconds",
+    "Latency of storage, embedding and LLM operations",
+    ("operation", "card_type", "outcome"),
+)
+CACHE_REQUESTS = registry.counter(
+    "memorization_cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ("cache", "result"),
+)
+REVIEW_RESULTS = registry.counter(
+    "memorization_review_results_total",
+    "Graded reviews by card type and result",
+    ("card_type", "result"),
+)
+REVIEW_CONFLICTS = registry.counter(
+    "memorization_review_conflicts_total",
+    "Review saves that lost a version compare-and-swap and were retried",
+    ("card_type",),
+)
+HISTORY_ARCHIVED = registry.counter(
+    "memorization_history_archived_total",
+    "Review records moved from cards into the compressed history archive",
+)
+HTTP_LATENCY = registry.histogram(
+    "memorization_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+)
+WEBHOOK_DELIVERIES = registry.counter(
+    "memorization_webhook_deliveries_total",
+    "Webhook delivery attempts by outcome",
+    ("outcome",),
+)
+QUEUE_DEPTH = registry.gauge(
+    "memorization_queue_depth",
+    "Pending items per background queue",
+    ("queue",),
+)
+COALESCED_CALLS = registry.counter(
+    "memorization_coalesced_calls_total",
+    "Calls answered by an identical in-flight call or a stored idempotent result",
+    ("operation",),
+)
+LLM_REJECTED = registry.counter(
+    "memorization_llm_rejected_total",
+    "LLM calls rejected by the dispatch queue's admission control",
+    ("priority", "reason"),
+)
+BACKGROUND_JOB_ERRORS = registry.counter(
+    "memorization_background_job_errors_total",
+    "Background job runs that failed and will be retried on the next cycle",
+    ("job",),
+)
+OPEN_SHARDS = registry.gauge(
+    "memorization_open_shards",
+    "SQLite card shards with an open connection",
+)
+
+@contextmanager
+def track(operation: str, card_type: str | None = None) -> Iterator[None]:
+    """작업 소요 시간을 operation/card_type/outcome 라벨로 기록"""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        OPERATION_LATENCY.observe(
+            time.perf_counter() - start,
+            operation,
+            card_type if card_type is not None else current_card_type.get(),
+            outcome,
+        )
+
+def timed(operation: str):
+    """track()의 데코레이터 버전"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(operation):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
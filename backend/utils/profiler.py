@@ -0,0 +1,131 @@
+"""요청 구간 샘플링 프로파일러 - folded stack(flamegraph 입력) 형식 출력"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+# 쉬고 있는 스레드의 맨 위 프레임 (스레드풀 / 이벤트 루프 / 백그라운드 대기)
+_IDLE_WAITS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+}
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+def _is_app_code(filename: str) -> bool:
+    return filename.startswith(_APP_ROOT) and "site-packages" not in filename
+
+def _is_idle(frame) -> bool:
+    """
+    맨 위 프레임이 threading / selectors 대기이고 스택에 앱 코드가 없으면 유휴 스레드
+    - 요청 처리 중의 대기(LLM 대기열, 락 경합 등)는 앱 코드를 거치므로 남긴다
+    """
+    code = frame.f_code
+    if (code.co_filename.rsplit(os.sep, 1)[-1], code.co_name) not in _IDLE_WAITS:
+        return False
+    frame = frame.f_back
+    while frame is not None:
+        if _is_app_code(frame.f_code.co_filename):
+            return False
+        frame = frame.f_back
+    return True
+
+class SamplingProfiler:
+    """
+    다음 N개 요청이 처리되는 동안 모든 스레드의 스택을 주기적으로 샘플링
+    - 결과는 'frame;frame;frame count' 형식 (flamegraph.pl, speedscope 호환)
+    - 요청이 처리 중일 때만 샘플링하므로 대기 중 오버헤드 없음
+    - 일감을 기다리는 스레드풀 / 이벤트 루프 스레드의 스택은 건너뛴다 (idle_samples로만 집계)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._active_requests = 0
+        self._interval_sec = 0.005
+        self._samples: Counter = Counter()
+        self._sample_count = 0
+        self._idle_samples = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+        self._result: Optional[str] = None
+        self._status = "idle"
+
+    def arm(self, requests: int, interval_ms: float = 5.0) -> bool:
+        """다음 requests개 요청 프로파일링 예약 (이미 진행 중이면 False)"""
+        with self._lock:
+            if self._status == "running":
+                return False
+            self._remaining = requests
+            self._interval_sec = max(interval_ms, 1.0) / 1000
+            self._samples = Counter()
+            self._sample_count = 0
+            self._idle_samples = 0
+            self._result = None
+            self._status = "running"
+            return True
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "status": self._status,
+                "remaining_requests": self._remaining,
+                "samples": self._sample_count,
+                "idle_samples": self._idle_samples,
+            }
+
+    def result(self) -> Optional[str]:
+        with self._lock:
+            return self._result
+
+    def request_started(self) -> bool:
+        """요청 시작 시 호출 - 이번 요청이 프로파일 대상이면 True"""
+        with self._lock:
+            if self._status != "running" or self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            self._active_requests += 1
+            if self._thread is None:
+                self._running.set()
+                self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+                self._thread.start()
+            return True
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._active_requests -= 1
+            if self._remaining > 0 or self._active_requests > 0:
+                return
+            self._running.clear()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._result = "\n".join(
+                f"{stack} {count}" for stack, count in self._samples.most_common()
+            ) + "\n"
+            self._status = "done"
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while self._running.is_set():
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    if _is_idle(frame):
+                        self._idle_samples += 1
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                        frame = frame.f_back
+                    self._samples[";".join(reversed(stack))] += 1
+                self._sample_count += 1
+            time.sleep(self._interval_sec)
+
+profiler = SamplingProfiler()
@@ -0,0 +1,50 @@
+"""동일 작업 합치기(single-flight) - 같은 키로 동시에 들어온 호출은 한 번만 실행하고 결과를 공유"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+class SingleFlight:
+    """
+    진행 중인 호출만 합친다 (결과를 캐시하지 않음 - 끝난 뒤 같은 키로 오면 다시 실행)
+    - 첫 호출자가 fn을 실행, 나머지는 완료를 기다렸다가 같은 결과/예외를 받는다
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(결과, 공유 여부) 반환 - 공유 여부는 다른 호출의 결과를 받았으면 True"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,130 @@
+"""요청 단위 트레이싱 - 샘플링 또는 헤더로 켜는 span 기록"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+@dataclass
+class Span:
+    """트레이스 구간"""
+    name: str
+    start_ms: float
+    duration_ms: float = 0.0
+    depth: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+@dataclass
+class Trace:
+    """요청 하나의 span 목록"""
+    trace_id: str
+    name: str
+    started_at: float = field(default_factory=time.time)
+    spans: List[Span] = field(default_factory=list)
+    _origin: float = field(default_factory=time.perf_counter)
+    _depth: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "spans": [
+                {
+                    "name": s.name,
+                    "start_ms": round(s.start_ms, 3),
+                    "duration_ms": round(s.duration_ms, 3),
+                    "depth": s.depth,
+                    "attributes": s.attributes,
+                }
+                for s in self.spans
+            ],
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (최상위 span만)"""
+        return ", ".join(
+            f"{s.name};dur={s.duration_ms:.1f}" for s in self.spans if s.depth == 0
+        )
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+class _NoopSpan:
+    """트레이스가 꺼져 있을 때 쓰는 빈 span"""
+    def set(self, **attributes: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class TraceRecorder:
+    """완료된 트레이스 보관 (최근 max_traces개)"""
+
+    def __init__(self, max_traces: int = 200):
+        self._traces: Deque[Trace] = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = list(self._traces)[-limit:]
+        return [t.to_dict() for t in reversed(traces)]
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for trace in self._traces:
+                if trace.trace_id == trace_id:
+                    return trace.to_dict()
+        return None
+
+recorder = TraceRecorder()
+
+def configure(max_traces: int) -> None:
+    """보관 개수 변경 (기존 트레이스는 버린다)"""
+    global recorder
+    recorder = TraceRecorder(max_traces)
+
+def should_sample(sample_rate: float, forced: bool = False) -> bool:
+    return forced or (sample_rate > 0 and random.random() < sample_rate)
+
+def start_trace(name: str) -> Trace:
+    """현재 컨텍스트에 트레이스 시작"""
+    trace = Trace(trace_id=uuid4().hex, name=name)
+    _current_trace.set(trace)
+    return trace
+
+def finish_trace(trace: Trace) -> None:
+    recorder.add(trace)
+    _current_trace.set(None)
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """트레이스가 켜져 있을 때만 구간 기록 (꺼져 있으면 거의 비용 없음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+    start = time.perf_counter()
+    record = Span(name=name, start_ms=(start - trace._origin) * 1000, depth=trace._depth, attributes=attributes)
+    trace.spans.append(record)
+    trace._depth += 1
+    try:
+        yield record
+    except BaseException as e:
+        record.set(error=type(e).__name__)
+        raise
+    finally:
+        trace._depth -= 1
+        record.duration_ms = (time.perf_counter() - start) * 1000
@@ -1,6 +1,8 @@
 """입력 검증기 모듈"""
 import re
 
+SCOPE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
 class CardValidator:
     """카드 입력 검증"""
     
@@ -19,3 +21,8 @@ class CardValidator:
     def validate_card_type(self, card_type: str) -> None:
         if card_type not in ["word", "concept"]:
             raise ValueError("카드 유형은 'word' 또는 'concept'이어야 합니다.")
+
+    def validate_scope_id(self, value: str, name: str = "ID") -> None:
+        """사용자/덱 ID 검증 (샤드 파일명으로 쓰이므로 영문/숫자/_/- 만 허용)"""
+        if not value or not SCOPE_ID_PATTERN.match(value):
+            raise ValueError(f"{name}는 영문, 숫자, '_', '-' 조합 64자 이내여야 합니다.")
@@ -17,6 +17,7 @@ export default function CardManagementPage() {
   const [formData, setFormData] = useState({ concept: "", answer: "", card_type: "word" });
   const [editingId, setEditingId] = useState(null);
   const [editData, setEditData] = useState({ concept: "", answer: "", card_type: "" });
+  const [editVersion, setEditVersion] = useState(null);
   const [showSaveConfirm, setShowSaveConfirm] = useState(false);
   const [revealAnswerMap, setRevealAnswerMap] = useState({}); // 카드별 정답 보이기 상태
 
@@ -61,6 +62,7 @@ export default function CardManagementPage() {
 
   const startEdit = (card) => {
     setEditingId(card.card_id);
+    setEditVersion(card.version ?? null);
     setEditData({ concept: card.concept, answer: card.answer, card_type: card.card_type });
   };
 
@@ -71,12 +73,19 @@ export default function CardManagementPage() {
 
   const handleUpdate = async (id) => {
     try {
-      await updateCard(id, editData);
+      await updateCard(id, editData, editVersion);
       setEditingId(null);
       setShowSaveConfirm(true);
       setTimeout(() => setShowSaveConfirm(false), 2000);
       loadCards();
-    } catch {
+    } catch (err) {
+      if (err.response?.status === 409) {
+        // 편집 중에 다른 곳에서 카드가 바뀜 → 최신 내용으로 다시 편집
+        alert("다른 곳에서 카드가 수정되었습니다. 최신 내용을 불러옵니다.");
+        setEditingId(null);
+        loadCards();
+        return;
+      }
       console.error("카드 수정 실패");
     }
   };
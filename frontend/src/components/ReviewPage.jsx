@@ -1,7 +1,8 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import {
-  fetchDueCards,
-  fetchHint,
+  startSession,
+  fetchSessionHint,
+  closeSession,
   reviewCard,
   createCard,
   getWebhook,
@@ -10,6 +11,9 @@ import {
 import { motion, AnimatePresence } from "framer-motion";
 import RelatedConceptModal from "./RelatedConceptModal";
 
+// 힌트가 아직 생성 중(ready: false)이면 다시 요청하기 전 대기 시간
+const HINT_RETRY_MS = 1000;
+
 export default function ReviewPage() {
   const [dueCards, setDueCards] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -28,61 +32,109 @@ export default function ReviewPage() {
   const [webhookUrl, setWebhookUrl] = useState("");
   const [showSaveConfirm, setShowSaveConfirm] = useState(false);
 
-  // 카드 로드
+  // 복습 대상 전체 카드 수 (세션 한 번에 최대 max_cards개씩 받아 페이지로 이어 붙인다)
+  const [totalDue, setTotalDue] = useState(0);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // 이 화면이 연 세션 - 다시 불러오거나 화면을 떠날 때 닫아 서버의 힌트 생성을 멈춘다
+  const sessionsRef = useRef([]);
+
+  const closeSessions = () => {
+    const ids = sessionsRef.current;
+    sessionsRef.current = [];
+    ids.forEach((id) => closeSession(id).catch(() => {}));
+  };
+
+  // 카드별 입력/피드백 상태 초기화 (append면 기존 카드 상태는 유지)
+  const initCardState = (cards, append) => {
+    const init = (value) =>
+      Object.fromEntries(cards.map((c) => [c.card_id, value]));
+    const apply = (setter, value) =>
+      setter((prev) => (append ? { ...prev, ...init(value) } : init(value)));
+    apply(setCurrentAnswer, "");
+    apply(setFeedbacks, "");
+    apply(setSubmitted, false);
+    apply(setRetryMode, false);
+    apply(setCountdown, 0);
+    apply(setLoadingCard, false);
+  };
+
+  // 세션 힌트를 한 번에 하나씩 받아온다 (동시 요청으로 서버 스레드를 붙잡지 않도록)
+  // - 아직 생성 중이면 잠시 뒤 다시 요청, 세션이 닫히면 중단
+  const loadSessionHints = async (session_id, cards) => {
+    const queue = cards.filter((c) => c.hint_pending).map((c) => c.card_id);
+    while (queue.length > 0 && sessionsRef.current.includes(session_id)) {
+      const card_id = queue.shift();
+      try {
+        const { hint, ready } = await fetchSessionHint(session_id, card_id);
+        if (!ready) {
+          queue.push(card_id);
+          await new Promise((resolve) => setTimeout(resolve, HINT_RETRY_MS));
+          continue;
+        }
+        setDueCards((prev) =>
+          prev.map((item) =>
+            item.card_id === card_id ? { ...item, hint } : item
+          )
+        );
+      } catch (error) {
+        // 세션이 만료/종료됐으면 중단, 그 외 실패는 해당 카드 힌트만 건너뜀
+        if (error.response?.status === 404) return;
+      }
+    }
+  };
+
+  // 카드 로드 (첫 페이지 세션부터 다시)
   const loadDueCards = async () => {
     setLoading(true);
+    closeSessions();
     try {
-      const data = await fetchDueCards(testMode);
+      // 세션 생성 시 서버가 LLM 힌트를 미리 생성하기 시작
+      const { session_id, total, cards } = await startSession(testMode);
+      sessionsRef.current.push(session_id);
+      const data = cards.map((c) => ({ ...c, hint: c.hint || "" }));
       setDueCards(data);
-
-      const initText = {},
-        initFeedback = {},
-        initSubmitted = {},
-        initRetry = {},
-        initCountdown = {},
-        initLoading = {};
-
-      data.forEach((c) => {
-        initText[c.card_id] = "";
-        initFeedback[c.card_id] = "";
-        initSubmitted[c.card_id] = false;
-        initRetry[c.card_id] = false;
-        initCountdown[c.card_id] = 0;
-        initLoading[c.card_id] = false;
-        c.hint = c.hint || "";
-      });
-
-      setCurrentAnswer(initText);
-      setFeedbacks(initFeedback);
-      setSubmitted(initSubmitted);
-      setRetryMode(initRetry);
-      setCountdown(initCountdown);
-      setLoadingCard(initLoading);
-
-      data.forEach(async (card) => {
-        const { card_id, card_type, stage } = card;
-        const needHint =
-          (card_type === "word" && [3, 4].includes(stage)) ||
-          (card_type === "concept" && [2, 3, 4].includes(stage));
-        if (needHint) {
-          try {
-            const hintText = await fetchHint(card_id);
-            setDueCards((prev) =>
-              prev.map((item) =>
-                item.card_id === card_id ? { ...item, hint: hintText } : item
-              )
-            );
-          } catch {
-            // 힌트 로딩 실패 시 무시
-          }
-        }
-      });
+      setTotalDue(total);
+      initCardState(data, false);
+      loadSessionHints(session_id, data);
     } catch {
       console.error("복습 카드 로드 실패");
     }
     setLoading(false);
   };
 
+  // 다음 페이지 카드를 새 세션으로 받아 목록 뒤에 붙인다
+  const loadMoreCards = async () => {
+    setLoadingMore(true);
+    try {
+      const { session_id, total, cards } = await startSession(
+        testMode,
+        null,
+        dueCards.length
+      );
+      sessionsRef.current.push(session_id);
+      const known = new Set(dueCards.map((c) => c.card_id));
+      const data = cards
+        .filter((c) => !known.has(c.card_id))
+        .map((c) => ({ ...c, hint: c.hint || "" }));
+      setDueCards((prev) => [...prev, ...data]);
+      setTotalDue(total);
+      initCardState(data, true);
+      loadSessionHints(session_id, data);
+    } catch {
+      console.error("복습 카드 추가 로드 실패");
+    }
+    setLoadingMore(false);
+  };
+
+  // 화면을 떠나거나 페이지를 닫을 때 열린 세션 종료
+  useEffect(() => {
+    window.addEventListener("pagehide", closeSessions);
+    return () => {
+      window.removeEventListener("pagehide", closeSessions);
+      closeSessions();
+    };
+  }, []);
+
   // 최초 로드: 카드 + Webhook
   useEffect(() => {
     loadDueCards();
@@ -398,6 +450,18 @@ export default function ReviewPage() {
         })
       )}
 
+      {dueCards.length > 0 && dueCards.length < totalDue && (
+        <button
+          onClick={loadMoreCards}
+          disabled={loadingMore}
+          className="button-primary w-full mb-6"
+        >
+          {loadingMore
+            ? "불러오는 중..."
+            : `다음 카드 더 보기 (남은 ${totalDue - dueCards.length}개)`}
+        </button>
+      )}
+
       <RelatedConceptModal
         isOpen={isModalOpen}
         relatedList={relatedList}
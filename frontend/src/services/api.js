@@ -7,13 +7,24 @@ export const fetchCards = async () => {
   return response.data;
 };
 
+// 개념/정답 검색 - 다음 페이지가 있으면 nextOffset 반환
+export const searchCards = async (q, limit = 20, offset = 0) => {
+  const response = await axios.get(`${API_URL}/cards/search`, {
+    params: { q, limit, offset },
+  });
+  const next = response.headers["x-next-offset"];
+  return { cards: response.data, nextOffset: next ? Number(next) : null };
+};
+
 export const createCard = async (card) => {
   const response = await axios.post(`${API_URL}/cards`, card);
   return response.data;
 };
 
-export const updateCard = async (card_id, card) => {
-  const response = await axios.put(`${API_URL}/cards/${card_id}`, card);
+// version: 편집을 시작할 때 읽은 카드 버전 - 그 사이 복습/수정이 있었으면 409
+export const updateCard = async (card_id, card, version = null) => {
+  const headers = version == null ? {} : { "If-Match": String(version) };
+  const response = await axios.put(`${API_URL}/cards/${card_id}`, card, { headers });
   return response.data;
 };
 
@@ -33,15 +44,66 @@ export const fetchHint = async (card_id) => {
   return response.data.hint;
 };
 
-export const reviewCard = async (card_id, user_answer, testMode = false, retry = false) => {
-  const response = await axios.post(
-    `${API_URL}/cards/${card_id}/review`,
-    { user_answer },
-    { params: { test: testMode, retry } }
+// offset: 복습 대상 목록에서 건너뛸 카드 수 - 응답의 total로 다음 페이지 여부 판단
+export const startSession = async (testMode = false, limit = null, offset = 0) => {
+  const response = await axios.post(`${API_URL}/sessions`, {
+    test: testMode,
+    limit,
+    offset,
+  });
+  return response.data;
+};
+
+// { hint, ready } - ready가 false면 아직 생성 중 (서버가 hint_wait_sec까지 기다린 뒤 응답)
+export const fetchSessionHint = async (session_id, card_id) => {
+  const response = await axios.get(
+    `${API_URL}/sessions/${session_id}/hints/${card_id}`
   );
   return response.data;
 };
 
+// keepalive: 페이지를 닫거나 새로고침할 때도 요청이 끝까지 전송되도록
+export const closeSession = async (session_id) => {
+  await fetch(`${API_URL}/sessions/${session_id}`, {
+    method: "DELETE",
+    keepalive: true,
+  });
+};
+
+// 제출마다 멱등성 키를 붙여, 응답을 못 받아 다시 보내도 한 번만 채점·기록되게 한다
+export const reviewCard = async (
+  card_id,
+  user_answer,
+  testMode = false,
+  retry = false,
+  idempotencyKey = crypto.randomUUID()
+) => {
+  const send = () =>
+    axios.post(
+      `${API_URL}/cards/${card_id}/review`,
+      { user_answer },
+      {
+        params: { test: testMode, retry },
+        headers: { "Idempotency-Key": idempotencyKey },
+      }
+    );
+  try {
+    return (await send()).data;
+  } catch (error) {
+    // 네트워크 오류(응답 없음)만 같은 키로 한 번 재전송
+    if (error.response) throw error;
+    return (await send()).data;
+  }
+};
+
+// 개념 지도 - 저장된 연관 개념 그래프의 hops 단계 이웃
+export const getConceptGraph = async (concept, hops = 1) => {
+  const response = await axios.get(`${API_URL}/concepts/graph`, {
+    params: { concept, hops },
+  });
+  return response.data;
+};
+
 export const getWebhook = async () => {
   const response = await axios.get(`${API_URL}/settings/webhook`);
   return response.data.url;